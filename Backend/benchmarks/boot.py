@@ -0,0 +1,71 @@
+"""
+Measure worker boot: the time to import the app module in a fresh
+interpreter, its peak RSS, and whether pandas / reportlab were loaded.
+
+Runs against a copy of --database-url's SQLite file (or the URL itself for
+PostgreSQL). To compare with another revision, check it out elsewhere and
+point --backend at its Backend directory:
+
+    python benchmarks/boot.py --runs 10
+    git worktree add /tmp/before <rev> && python benchmarks/boot.py --backend /tmp/before/Backend
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, resource, sys, time
+started = time.perf_counter()
+import app
+elapsed = time.perf_counter() - started
+print(json.dumps({
+    'seconds': elapsed,
+    'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'pandas': 'pandas' in sys.modules,
+    'reportlab': 'reportlab' in sys.modules
+}))
+"""
+
+
+def boot_once(backend, database_url):
+    env = dict(os.environ, DATABASE_URL=database_url, PYTHONPATH=backend)
+    output = subprocess.run([sys.executable, '-c', PROBE], cwd=backend, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backend', default=BACKEND)
+    parser.add_argument('--database-url', default=f"sqlite:///{os.path.join(BACKEND, 'instance', 'sacco_members.db')}")
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        database_url = args.database_url
+        if database_url.startswith('sqlite:///'):
+            # Importing an old revision may migrate the database; never touch the original
+            copy = os.path.join(scratch, 'boot.db')
+            shutil.copy(database_url[len('sqlite:///'):], copy)
+            database_url = f"sqlite:///{copy}"
+
+        boot_once(args.backend, database_url)  # warm the page cache and any first-run migrations
+        runs = [boot_once(args.backend, database_url) for _ in range(args.runs)]
+
+    seconds = [run['seconds'] for run in runs]
+    rss = [run['rss_mb'] for run in runs]
+    print(f"backend:   {args.backend}")
+    print(f"import:    median {statistics.median(seconds):.3f}s  min {min(seconds):.3f}s  max {max(seconds):.3f}s")
+    print(f"peak RSS:  median {statistics.median(rss):.1f} MB")
+    print(f"pandas loaded: {runs[-1]['pandas']}  reportlab loaded: {runs[-1]['reportlab']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,186 @@
+"""
+Compare the old eight-column ILIKE correction search with the search index.
+
+Point --database-url at a scratch database: the zones, members and
+correction_requests tables are created, filled with synthetic rows and
+dropped again.
+
+    python benchmarks/correction_search.py --rows 1000000
+    python benchmarks/correction_search.py --database-url postgresql://localhost/sacco_bench
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from sqlalchemy import insert, or_, text
+
+from models import db, Member, Zone, CorrectionRequest
+import search_index
+import zones
+
+FIRST_NAMES = ['Wanjiru', 'Otieno', 'Kamau', 'Achieng', 'Mutua', 'Njeri', 'Kiptoo', 'Atieno', 'Mwangi', 'Chebet']
+LAST_NAMES = ['Kariuki', 'Odhiambo', 'Wafula', 'Mohamed', 'Nyambura', 'Korir', 'Omondi', 'Wambui', 'Kimani', 'Ruto']
+MEMBERS = 1000
+
+
+def old_query(search, status):
+    query = CorrectionRequest.query
+    if status != 'all':
+        query = query.filter_by(status=status)
+    search_pattern = f"%{search}%"
+    return query.filter(or_(
+        CorrectionRequest.member_number.ilike(search_pattern),
+        CorrectionRequest.id_number.ilike(search_pattern),
+        CorrectionRequest.current_name.ilike(search_pattern),
+        CorrectionRequest.correct_name.ilike(search_pattern),
+        CorrectionRequest.current_zone.ilike(search_pattern),
+        CorrectionRequest.correct_zone.ilike(search_pattern),
+        CorrectionRequest.email.ilike(search_pattern),
+        CorrectionRequest.phone.ilike(search_pattern)
+    )), []
+
+
+def new_query(search, status):
+    query = CorrectionRequest.query
+    if status != 'all':
+        query = query.filter_by(status=status)
+    return search_index.apply_search(query, CorrectionRequest, search)
+
+
+def explain(query):
+    compiled = query.statement.compile(db.engine, compile_kwargs={'literal_binds': True})
+    if db.engine.dialect.name == 'sqlite':
+        prefix = 'EXPLAIN QUERY PLAN '
+    else:
+        prefix = 'EXPLAIN (ANALYZE, BUFFERS) '
+    rows = db.session.execute(text(prefix + str(compiled))).fetchall()
+    return '\n'.join('    ' + ' | '.join(str(col) for col in row) for row in rows)
+
+
+def seed(rows, rng):
+    zone_ids = zones.ensure_zones([f'Zone {i}' for i in range(40)])
+    db.session.execute(insert(Member), [{
+        'name': f'Member {i}',
+        'member_number': str(i),
+        'id_number': str(10000000 + i),
+        'zone': f'Zone {i % 40}',
+        'zone_id': zone_ids[f'Zone {i % 40}'],
+        'status': 'active',
+        'member_number_norm': str(i),
+        'id_number_norm': str(10000000 + i)
+    } for i in range(1, MEMBERS + 1)])
+
+    started = datetime(2025, 1, 1)
+    batch = []
+    for i in range(1, rows + 1):
+        member_id = rng.randint(1, MEMBERS)
+        name = f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}'
+        batch.append({
+            'member_id': member_id,
+            'member_number': str(member_id),
+            'id_number': str(10000000 + member_id),
+            'current_name': name,
+            'current_zone': f'Zone {member_id % 40}',
+            'current_status': 'active',
+            'correct_name': f'{name} {rng.choice(LAST_NAMES)}',
+            'correct_zone': f'Zone {rng.randint(0, 39)}',
+            'email': f'user{i}@example.com' if i % 2 else None,
+            'phone': f'07{rng.randint(10000000, 99999999)}' if i % 2 == 0 else None,
+            'status': 'pending' if i % 10 == 0 else 'resolved',
+            'submitted_at': started + timedelta(seconds=i * 30)
+        })
+        if len(batch) == 10000:
+            db.session.execute(insert(CorrectionRequest), batch)
+            batch = []
+    if batch:
+        db.session.execute(insert(CorrectionRequest), batch)
+    db.session.commit()
+
+
+def time_searches(build_query, samples, per_page):
+    timings = {}
+    for kind, search, status in samples:
+        started = time.perf_counter()
+        query, ranking = build_query(search, status)
+        query.order_by(*ranking, CorrectionRequest.submitted_at.desc(), CorrectionRequest.id.desc()) \
+            .limit(per_page).all()
+        timings.setdefault(kind, []).append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--database-url')
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--searches', type=int, default=10, help='searches per kind of term')
+    parser.add_argument('--per-page', type=int, default=20)
+    args = parser.parse_args()
+
+    database_url = args.database_url or 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db')
+
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_url
+    db.init_app(app)
+
+    with app.app_context():
+        Zone.__table__.create(db.engine)
+        Member.__table__.create(db.engine)
+        CorrectionRequest.__table__.create(db.engine)
+        try:
+            rng = random.Random(42)
+            print(f"Seeding {args.rows} correction requests into {db.engine.dialect.name}...")
+            seed(args.rows, rng)
+
+            started = time.perf_counter()
+            for statement in search_index.index_ddl('correction_requests', db.engine.dialect.name):
+                db.session.execute(text(statement))
+            db.session.execute(text('ANALYZE'))
+            db.session.commit()
+            print(f"Built search index in {time.perf_counter() - started:.1f} s "
+                  f"(backend: {search_index.search_backend('correction_requests')})")
+
+            # Rare terms used to scan the whole table; very common ones matched within the first page
+            kinds = {
+                'email': lambda: f'user{rng.randint(1, args.rows)}@',
+                'phone': lambda: f'07{rng.randint(100, 999)}',
+                'no match': lambda: f'zq{rng.randint(1000, 9999)}x',
+                'full name': lambda: f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+                'surname': lambda: rng.choice(LAST_NAMES).lower()
+            }
+            samples = [
+                (kind, make(), rng.choice(['all', 'pending']))
+                for kind, make in kinds.items() for _ in range(args.searches)
+            ]
+
+            print("\nOld ILIKE query plan:")
+            print(explain(old_query(*samples[0][1:])[0]))
+            print("\nSearch index query plan:")
+            print(explain(new_query(*samples[0][1:])[0]))
+
+            results = {label: time_searches(build_query, samples, args.per_page)
+                       for label, build_query in (('ilike', old_query), ('indexed', new_query))}
+            print(f"\n{'median ms':>12} {'ilike':>10} {'indexed':>10}   (max ilike / indexed)")
+            for kind in kinds:
+                old_times, new_times = results['ilike'][kind], results['indexed'][kind]
+                print(f"{kind:>12} {statistics.median(old_times):10.2f} {statistics.median(new_times):10.2f}"
+                      f"   ({max(old_times):.2f} / {max(new_times):.2f})")
+        finally:
+            db.session.remove()
+            CorrectionRequest.__table__.drop(db.engine)
+            Member.__table__.drop(db.engine)
+            Zone.__table__.drop(db.engine)
+            if db.engine.dialect.name == 'sqlite':
+                with db.engine.begin() as conn:
+                    conn.execute(text('DROP TABLE IF EXISTS correction_requests_fts'))
+
+
+if __name__ == '__main__':
+    main()
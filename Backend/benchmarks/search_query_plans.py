@@ -0,0 +1,140 @@
+"""
+Compare the old variant-list /search query with the normalized equality probe.
+
+Point --database-url at a scratch database: the zones and members tables
+are created, filled with synthetic rows and dropped again.
+
+    python benchmarks/search_query_plans.py --rows 200000
+    python benchmarks/search_query_plans.py --database-url postgresql://localhost/sacco_bench
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from sqlalchemy import insert, text
+
+from models import db, Member, Zone, normalize_number
+import zones
+
+
+def old_variants(member_number, id_number):
+    # The pre-normalization search built these IN lists from the raw input
+    member_variations = {member_number, member_number.zfill(4) if member_number.isdigit() else member_number}
+    id_variations = {id_number, id_number.zfill(8) if id_number.isdigit() else id_number}
+    if member_number.startswith('0') and member_number.lstrip('0'):
+        member_variations.add(member_number.lstrip('0'))
+    if id_number.startswith('0') and id_number.lstrip('0'):
+        id_variations.add(id_number.lstrip('0'))
+    return list(member_variations), list(id_variations)
+
+
+def old_query(member_number, id_number):
+    member_variations, id_variations = old_variants(member_number, id_number)
+    return Member.query.filter(
+        Member.member_number.in_(member_variations),
+        Member.id_number.in_(id_variations)
+    )
+
+
+def new_query(member_number, id_number):
+    return Member.query.filter_by(
+        member_number_norm=normalize_number(member_number),
+        id_number_norm=normalize_number(id_number)
+    )
+
+
+def explain(query):
+    compiled = query.statement.compile(db.engine, compile_kwargs={'literal_binds': True})
+    if db.engine.dialect.name == 'sqlite':
+        prefix = 'EXPLAIN QUERY PLAN '
+    else:
+        prefix = 'EXPLAIN (ANALYZE, BUFFERS) '
+    rows = db.session.execute(text(prefix + str(compiled))).fetchall()
+    return '\n'.join('    ' + ' | '.join(str(col) for col in row) for row in rows)
+
+
+def seed(rows):
+    zone_ids = zones.ensure_zones([f'Zone {i}' for i in range(40)])
+    batch = []
+    for i in range(1, rows + 1):
+        member_number = str(i).zfill(5)
+        id_number = str(10000000 + i)
+        batch.append({
+            'name': f'Member {i}',
+            'member_number': member_number,
+            'id_number': id_number,
+            'zone': f'Zone {i % 40}',
+            'zone_id': zone_ids[f'Zone {i % 40}'],
+            'status': 'active',
+            'member_number_norm': normalize_number(member_number),
+            'id_number_norm': normalize_number(id_number)
+        })
+        if len(batch) == 10000:
+            db.session.execute(insert(Member), batch)
+            batch = []
+    if batch:
+        db.session.execute(insert(Member), batch)
+    db.session.commit()
+
+
+def time_lookups(build_query, samples):
+    timings = []
+    for member_number, id_number in samples:
+        started = time.perf_counter()
+        build_query(member_number, id_number).first()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), max(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--database-url')
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--lookups', type=int, default=2000)
+    args = parser.parse_args()
+
+    database_url = args.database_url or 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db')
+
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_url
+    db.init_app(app)
+
+    with app.app_context():
+        Zone.__table__.create(db.engine)
+        Member.__table__.create(db.engine)
+        try:
+            print(f"Seeding {args.rows} members into {db.engine.dialect.name}...")
+            seed(args.rows)
+            db.session.execute(text('ANALYZE'))
+            db.session.commit()
+
+            rng = random.Random(42)
+            samples = []
+            for _ in range(args.lookups):
+                i = rng.randint(1, args.rows)
+                # Mix of padded, unpadded and missing inputs
+                samples.append((rng.choice([str(i), str(i).zfill(5), str(i).zfill(7)]), str(10000000 + i)))
+
+            print("\nOld IN x IN query plan:")
+            print(explain(old_query(*samples[0])))
+            print("\nNormalized equality query plan:")
+            print(explain(new_query(*samples[0])))
+
+            for label, build_query in (('old', old_query), ('normalized', new_query)):
+                median, worst = time_lookups(build_query, samples)
+                print(f"\n{label:>10}: median {median:.3f} ms, max {worst:.3f} ms over {len(samples)} lookups")
+        finally:
+            db.session.remove()
+            Member.__table__.drop(db.engine)
+            Zone.__table__.drop(db.engine)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+"""
+/search throughput on SQLite with N worker processes, each also writing
+its own search logs, under the old connection settings (rollback journal,
+synchronous=FULL) and the tuned ones (WAL, synchronous=NORMAL, mmap).
+
+Every process builds the real app against a scratch copy of
+instance/sacco_members.db (brought to the latest migration and filled with
+synthetic members) with the member cache off and search logs flushed one row per commit, so each
+search is one read plus one write transaction.
+
+    python benchmarks/sqlite_concurrency.py --workers 1 2 4 8 --seconds 10
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import closing
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+MEMBERS = 20000
+
+MODES = {
+    'default': {'SQLITE_JOURNAL_MODE': 'DELETE', 'SQLITE_SYNCHRONOUS': 'FULL', 'SQLITE_MMAP_SIZE_MB': '0',
+                # pysqlite's own default lock wait
+                'SQLITE_BUSY_TIMEOUT_MS': '5000'},
+    'tuned': {'SQLITE_JOURNAL_MODE': 'WAL', 'SQLITE_SYNCHRONOUS': 'NORMAL', 'SQLITE_MMAP_SIZE_MB': '256',
+              'SQLITE_BUSY_TIMEOUT_MS': '5000'}
+}
+
+WORKER_ENV = {
+    'MEMBER_CACHE_SIZE': '0',
+    'SEARCH_RATE_LIMIT_PER_MINUTE': '0',
+    'SEARCH_LOG_BATCH_SIZE': '1',
+    'SEARCH_LOG_FLUSH_INTERVAL': '0.001',
+    'SEARCH_LOG_OVERFLOW': 'block',
+    'SEARCH_LOG_BLOCK_TIMEOUT': '5'
+}
+
+
+def seed(path):
+    # The migrations start from the original schema, so build on a copy of the shipped database
+    shutil.copy(os.path.join(BACKEND, 'instance', 'sacco_members.db'), path)
+    os.environ.update(DATABASE_URL=f'sqlite:///{path}', RUN_MIGRATIONS='true')
+    from sqlalchemy import insert
+    from app import create_app, setup_database
+    from models import db, Member
+    import zones
+
+    app = create_app()
+    with app.app_context():
+        setup_database()
+        zone_ids = zones.ensure_zones([f'Zone {i}' for i in range(40)])
+        db.session.execute(insert(Member), [{
+            'name': f'Member {i}',
+            'member_number': f'B{i}',
+            'id_number': str(10000000 + i),
+            'zone': f'Zone {i % 40}',
+            'zone_id': zone_ids[f'Zone {i % 40}'],
+            'status': 'active',
+            'member_number_norm': f'B{i}',
+            'id_number_norm': str(10000000 + i)
+        } for i in range(1, MEMBERS + 1)])
+        db.session.commit()
+        db.engine.dispose()  # checkpoints the WAL so the file can be copied
+
+
+def worker(path, mode, seconds, start_at, results):
+    os.environ.update(WORKER_ENV, DATABASE_URL=f'sqlite:///{path}', **MODES[mode])
+    from app import create_app
+
+    app = create_app()
+    client = app.test_client()
+    rng = random.Random(os.getpid())
+    latencies = []
+    errors = 0
+
+    time.sleep(max(start_at - time.time(), 0))
+    deadline = time.time() + seconds
+    while time.time() < deadline:
+        i = rng.randint(1, MEMBERS)
+        started = time.perf_counter()
+        response = client.post('/search', json={'member_number': f'B{i}', 'id_number': str(10000000 + i)})
+        latencies.append(time.perf_counter() - started)
+        if response.status_code != 200:
+            errors += 1
+
+    writer = app.extensions['search_log_writer']
+    writer.stop()
+    stats = writer.stats()
+    results.put({'searches': len(latencies), 'latencies': latencies, 'errors': errors,
+                 'written': stats['written'], 'failed': stats['failed']})
+
+
+def run(path, mode, workers, seconds):
+    results = multiprocessing.Queue()
+    start_at = time.time() + 1 + workers  # let every process finish importing first
+    processes = [multiprocessing.Process(target=worker, args=(path, mode, seconds, start_at, results))
+                 for _ in range(workers)]
+    for process in processes:
+        process.start()
+    collected = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    latencies = sorted(l for r in collected for l in r['latencies'])
+    searches = sum(r['searches'] for r in collected)
+    return {
+        'per_second': searches / seconds,
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p95_ms': latencies[int(len(latencies) * 0.95)] * 1000,
+        'errors': sum(r['errors'] for r in collected),
+        'written': sum(r['written'] for r in collected),
+        'failed': sum(r['failed'] for r in collected)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--seconds', type=float, default=10)
+    args = parser.parse_args()
+
+    scratch = tempfile.mkdtemp()
+    try:
+        template = os.path.join(scratch, 'template.db')
+        print(f"Seeding {MEMBERS} members...")
+        seed(template)
+
+        print(f"\n{'mode':>8} {'workers':>8} {'search/s':>10} {'p50 ms':>8} {'p95 ms':>8} "
+              f"{'errors':>7} {'logged':>8} {'log fail':>9}")
+        for workers in args.workers:
+            for mode in MODES:
+                path = os.path.join(scratch, f'{mode}-{workers}.db')
+                shutil.copy(template, path)
+                with closing(sqlite3.connect(path)) as connection:
+                    connection.execute(f"PRAGMA journal_mode = {MODES[mode]['SQLITE_JOURNAL_MODE']}")
+                result = run(path, mode, workers, args.seconds)
+                print(f"{mode:>8} {workers:>8} {result['per_second']:10.1f} {result['p50_ms']:8.2f} "
+                      f"{result['p95_ms']:8.2f} {result['errors']:7} {result['written']:8} {result['failed']:9}")
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
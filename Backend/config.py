@@ -0,0 +1,151 @@
+"""
+Application settings, read from the environment by create_app().
+"""
+import os
+from datetime import timedelta
+
+
+def database_url(url):
+    """Heroku-style postgres:// URLs are spelled postgresql:// for SQLAlchemy"""
+    if url.startswith('postgres://'):
+        return url.replace('postgres://', 'postgresql://', 1)
+    return url
+
+
+def load_config(app):
+    app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-only-secret-key-change-me')
+    app.config['SESSION_COOKIE_SAMESITE'] = 'None'
+    app.config['SESSION_COOKIE_SECURE'] = True
+    app.config['SESSION_COOKIE_HTTPONLY'] = True
+    app.config['SESSION_COOKIE_NAME'] = 'session'
+    app.config['SESSION_COOKIE_DOMAIN'] = None
+    app.config['SESSION_COOKIE_PATH'] = '/'
+    app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(hours=24)
+
+    # Email Configuration
+    app.config['MAIL_SERVER'] = os.environ.get('MAIL_SERVER', 'smtp.gmail.com')
+    app.config['MAIL_PORT'] = int(os.environ.get('MAIL_PORT', 587))
+    app.config['MAIL_USE_TLS'] = os.environ.get('MAIL_USE_TLS', 'True') == 'True'
+    app.config['MAIL_USERNAME'] = os.environ.get('MAIL_USERNAME', '')
+    app.config['MAIL_PASSWORD'] = os.environ.get('MAIL_PASSWORD', '')
+    app.config['MAIL_DEFAULT_SENDER'] = os.environ.get('MAIL_DEFAULT_SENDER', 'noreply@chunasacco.com')
+    app.config['ADMIN_EMAIL'] = os.environ.get('ADMIN_EMAIL', 'admin@chunasacco.com')
+    app.config['MAIL_ENABLED'] = os.environ.get('MAIL_ENABLED', str(bool(app.config['MAIL_USERNAME']))) == 'True'
+    app.config['MAIL_TIMEOUT'] = int(os.environ.get('MAIL_TIMEOUT', 10))
+
+    # Notifications are queued in email_outbox with the change they describe and
+    # sent in the background over one SMTP connection per batch; failed sends are
+    # retried with exponential backoff from MAIL_RETRY_BASE_SECONDS
+    app.config['MAIL_OUTBOX_INTERVAL'] = int(os.environ.get('MAIL_OUTBOX_INTERVAL', 5))
+    app.config['MAIL_OUTBOX_BATCH_SIZE'] = int(os.environ.get('MAIL_OUTBOX_BATCH_SIZE', 50))
+    app.config['MAIL_MAX_ATTEMPTS'] = int(os.environ.get('MAIL_MAX_ATTEMPTS', 8))
+    app.config['MAIL_RETRY_BASE_SECONDS'] = int(os.environ.get('MAIL_RETRY_BASE_SECONDS', 30))
+    app.config['MAIL_OUTBOX_RETENTION_DAYS'] = int(os.environ.get('MAIL_OUTBOX_RETENTION_DAYS', 14))
+
+    # Digest mode: correction notifications are held and sent as one summary
+    # email once the oldest has waited MAIL_DIGEST_SECONDS (0 sends each one)
+    app.config['MAIL_DIGEST_SECONDS'] = int(os.environ.get('MAIL_DIGEST_SECONDS', 0))
+    app.config['MAIL_DIGEST_MAX_ITEMS'] = int(os.environ.get('MAIL_DIGEST_MAX_ITEMS', 500))
+    app.config['MAIL_DIGEST_ATTACH_PDF'] = os.environ.get('MAIL_DIGEST_ATTACH_PDF', 'False') == 'True'
+
+
+    # Database Configuration
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_url(os.environ.get('DATABASE_URL', 'sqlite:///sacco_members.db'))
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+
+    # Connection pool for PostgreSQL (see db_engine.engine_options)
+    app.config['DB_POOL_SIZE'] = int(os.environ.get('DB_POOL_SIZE', 5))
+    app.config['DB_MAX_OVERFLOW'] = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+    app.config['DB_POOL_TIMEOUT'] = int(os.environ.get('DB_POOL_TIMEOUT', 30))
+    app.config['DB_POOL_RECYCLE'] = int(os.environ.get('DB_POOL_RECYCLE', 1800))  # seconds
+    app.config['DB_POOL_PRE_PING'] = os.environ.get('DB_POOL_PRE_PING', 'True') == 'True'
+
+    # Read replicas for the @read_only routes (comma-separated, empty reads from the
+    # primary). Each worker health-checks them every REPLICA_HEALTH_SECONDS and skips
+    # those that fail or, on PostgreSQL, lag more than REPLICA_MAX_LAG_SECONDS. After
+    # a signed-in user writes, their reads stay on the primary for REPLICA_STICKY_SECONDS.
+    app.config['DATABASE_REPLICA_URLS'] = [database_url(url.strip())
+                                           for url in os.environ.get('DATABASE_REPLICA_URLS', '').split(',')
+                                           if url.strip()]
+    app.config['REPLICA_HEALTH_SECONDS'] = int(os.environ.get('REPLICA_HEALTH_SECONDS', 10))
+    app.config['REPLICA_MAX_LAG_SECONDS'] = int(os.environ.get('REPLICA_MAX_LAG_SECONDS', 30))
+    app.config['REPLICA_STICKY_SECONDS'] = int(os.environ.get('REPLICA_STICKY_SECONDS', 15))
+
+    # SQLite pragmas applied to every connection (see db_engine.configure_engine)
+    app.config['SQLITE_JOURNAL_MODE'] = os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')
+    app.config['SQLITE_SYNCHRONOUS'] = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')
+    app.config['SQLITE_BUSY_TIMEOUT_MS'] = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+    app.config['SQLITE_MMAP_SIZE_MB'] = int(os.environ.get('SQLITE_MMAP_SIZE_MB', 256))
+
+    app.config['UPLOAD_FOLDER'] = 'uploads'
+    # Member files are streamed in batches, so the upload cap is about disk and
+    # request time rather than worker memory
+    app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get('MAX_UPLOAD_MB', 200)) * 1024 * 1024
+
+    # Public search lookup cache (entries are dropped on every admin member write;
+    # the TTL bounds staleness for other gunicorn workers)
+    app.config['MEMBER_CACHE_SIZE'] = int(os.environ.get('MEMBER_CACHE_SIZE', 50000))
+    app.config['MEMBER_CACHE_TTL'] = int(os.environ.get('MEMBER_CACHE_TTL', 300))
+
+    # Resolved permission sets per user id; the TTL bounds how long other workers
+    # keep a stale entry after a role change
+    app.config['PERMISSION_CACHE_SIZE'] = int(os.environ.get('PERMISSION_CACHE_SIZE', 1000))
+    app.config['PERMISSION_CACHE_TTL'] = int(os.environ.get('PERMISSION_CACHE_TTL', 60))
+
+    # Search logs are queued and inserted in batches by a background thread
+    app.config['SEARCH_LOG_QUEUE_SIZE'] = int(os.environ.get('SEARCH_LOG_QUEUE_SIZE', 10000))
+    app.config['SEARCH_LOG_BATCH_SIZE'] = int(os.environ.get('SEARCH_LOG_BATCH_SIZE', 500))
+    app.config['SEARCH_LOG_FLUSH_INTERVAL'] = float(os.environ.get('SEARCH_LOG_FLUSH_INTERVAL', 1.0))
+    app.config['SEARCH_LOG_OVERFLOW'] = os.environ.get('SEARCH_LOG_OVERFLOW', 'drop')
+    app.config['SEARCH_LOG_BLOCK_TIMEOUT'] = float(os.environ.get('SEARCH_LOG_BLOCK_TIMEOUT', 0.05))
+
+    # Rows read, validated and written per batch when importing member files
+    app.config['UPLOAD_BATCH_SIZE'] = int(os.environ.get('UPLOAD_BATCH_SIZE', 5000))
+
+    # Background jobs (bulk uploads, PDF reports). A job that is running without
+    # progress, or queued on a worker that stopped heartbeating, fails after
+    # JOB_STALE_SECONDS; each worker heartbeats its queued jobs every quarter of that
+    app.config['JOB_WORKERS'] = int(os.environ.get('JOB_WORKERS', 2))
+    app.config['JOB_STALE_SECONDS'] = int(os.environ.get('JOB_STALE_SECONDS', 600))
+    app.config['JOB_OUTPUT_FOLDER'] = os.path.join(app.instance_path, 'jobs')
+    app.config['JOB_OUTPUT_RETENTION_HOURS'] = int(os.environ.get('JOB_OUTPUT_RETENTION_HOURS', 24))
+
+    # Dashboard counters are updated by the write paths; this recounts them from scratch
+    app.config['STATS_RECONCILE_SECONDS'] = int(os.environ.get('STATS_RECONCILE_SECONDS', 3600))
+
+    # /admin/zones list (with per-zone counts) is cached this long per worker
+    app.config['ZONE_CACHE_TTL'] = int(os.environ.get('ZONE_CACHE_TTL', 30))
+
+    # Repeat verify clicks by the same member within this window add no new row (0 records every click)
+    app.config['VERIFICATION_DEDUP_SECONDS'] = int(os.environ.get('VERIFICATION_DEDUP_SECONDS', 86400))
+
+    # Search logs are stored per month (PostgreSQL partitions, SQLite archive tables).
+    # Months older than the retention are dropped whole (0 keeps everything); hourly
+    # and daily rollups per zone are kept for the dashboards.
+    app.config['SEARCH_LOG_RETENTION_MONTHS'] = int(os.environ.get('SEARCH_LOG_RETENTION_MONTHS', 12))
+    app.config['SEARCH_LOG_HOT_MONTHS'] = int(os.environ.get('SEARCH_LOG_HOT_MONTHS', 3))  # SQLite only
+    app.config['SEARCH_LOG_PARTITIONS_AHEAD'] = int(os.environ.get('SEARCH_LOG_PARTITIONS_AHEAD', 2))  # PostgreSQL only
+    app.config['SEARCH_ROLLUP_HOURLY_RETENTION_DAYS'] = int(os.environ.get('SEARCH_ROLLUP_HOURLY_RETENTION_DAYS', 90))
+    app.config['SEARCH_LOG_MAINTENANCE_SECONDS'] = int(os.environ.get('SEARCH_LOG_MAINTENANCE_SECONDS', 900))
+
+    # /admin/analytics/searches: per-day top-list counts kept this long, responses
+    # cached per worker for ANALYTICS_CACHE_TTL and the default views re-warmed
+    # in the background before they expire
+    app.config['SEARCH_ANALYTICS_RETENTION_DAYS'] = int(os.environ.get('SEARCH_ANALYTICS_RETENTION_DAYS', 400))
+    app.config['ANALYTICS_CACHE_TTL'] = int(os.environ.get('ANALYTICS_CACHE_TTL', 120))
+
+    # Public /search rate limit per client IP: a burst of SEARCH_RATE_LIMIT_BURST,
+    # refilled at SEARCH_RATE_LIMIT_PER_MINUTE (0 disables). The redis backend
+    # shares buckets between workers.
+    app.config['SEARCH_RATE_LIMIT_PER_MINUTE'] = float(os.environ.get('SEARCH_RATE_LIMIT_PER_MINUTE', 30))
+    app.config['SEARCH_RATE_LIMIT_BURST'] = int(os.environ.get('SEARCH_RATE_LIMIT_BURST', 10))
+    app.config['RATE_LIMIT_BACKEND'] = os.environ.get('RATE_LIMIT_BACKEND', 'memory')  # memory or redis
+    app.config['RATE_LIMIT_REDIS_URL'] = os.environ.get('RATE_LIMIT_REDIS_URL', 'redis://localhost:6379/0')
+    # Reverse proxies in front of the app; the client address is taken that many
+    # X-Forwarded-For entries from the right, so clients cannot pick their own
+    # (0 ignores the header and uses the socket address)
+    app.config['TRUSTED_PROXY_COUNT'] = int(os.environ.get('TRUSTED_PROXY_COUNT', 1))
+
+    # Rendered per-correction PDFs, evicted least-recently-used beyond the size cap
+    app.config['PDF_CACHE_FOLDER'] = os.path.join(app.instance_path, 'pdf_cache')
+    app.config['PDF_CACHE_MAX_MB'] = int(os.environ.get('PDF_CACHE_MAX_MB', 200))
@@ -0,0 +1,40 @@
+"""
+Digest email for correction requests.
+
+With MAIL_DIGEST_SECONDS set, submit_correction holds its admin notification
+in the outbox and OutboxSender folds everything held over the window into
+one message built here: a plain-text summary table and, optionally, the
+corrections report PDF for just those requests.
+"""
+import io
+from datetime import datetime
+
+import pdf_reports
+
+
+def text_table(header, rows):
+    widths = [max(len(str(value)) for value in column) for column in zip(header, *rows)]
+    lines = ['  '.join(str(value).ljust(width) for value, width in zip(row, widths)).rstrip()
+             for row in [header] + rows]
+    lines.insert(1, '  '.join('-' * width for width in widths))
+    return '\n'.join(lines)
+
+
+def build(correction_ids, attach_pdf=False):
+    """(subject, body, attachment) for the given correction requests, None if none still exist"""
+    timer = pdf_reports.StageTimer()
+    rows = [pdf_reports.summary_row(c) for c in pdf_reports.iter_corrections('all', timer, ids=correction_ids)]
+    if not rows:
+        return None
+
+    subject = f'Member Correction Requests - {len(rows)} new'
+    body = (f"{len(rows)} correction request(s) received:\n\n"
+            f"{text_table(pdf_reports.SUMMARY_HEADER, rows)}\n\n"
+            "Open the admin dashboard for contact details and to review each request.")
+
+    attachment = None
+    if attach_pdf:
+        output = io.BytesIO()
+        pdf_reports.build_corrections_report(output, total=len(rows), ids=correction_ids)
+        attachment = (f"corrections_digest_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf", output.getvalue())
+    return subject, body, attachment
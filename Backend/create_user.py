@@ -1,6 +1,8 @@
 """
 Script to create admin users for the SACCO system
 Run this script from the backend directory: python create_user.py
+On a fresh database run `flask --app app init-db` first; importing the app
+no longer applies migrations.
 """
 
 from app import app, db
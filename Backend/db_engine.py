@@ -0,0 +1,65 @@
+"""
+Engine configuration read from the app config.
+
+Server databases (PostgreSQL) get a sized, pre-pinged, recycled connection
+pool. SQLite gets per-connection pragmas instead: WAL so readers never wait
+for the search log writer, synchronous=NORMAL (durable at checkpoints,
+safe with WAL), a busy timeout so concurrent writers queue for the lock
+rather than fail, and memory-mapped reads.
+"""
+import sqlite3
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+
+def engine_options(config, url=None):
+    """SQLALCHEMY_ENGINE_OPTIONS for `url` (default SQLALCHEMY_DATABASE_URI)"""
+    url = make_url(url or config['SQLALCHEMY_DATABASE_URI'])
+    if url.get_backend_name() == 'sqlite':
+        return {}
+    return {
+        'pool_size': config['DB_POOL_SIZE'],
+        'max_overflow': config['DB_MAX_OVERFLOW'],
+        'pool_timeout': config['DB_POOL_TIMEOUT'],
+        'pool_recycle': config['DB_POOL_RECYCLE'],
+        'pool_pre_ping': config['DB_POOL_PRE_PING']
+    }
+
+
+def sqlite_pragmas(config):
+    """Per-connection pragmas; journal_mode is persistent and handled separately"""
+    return [
+        f"PRAGMA busy_timeout = {int(config['SQLITE_BUSY_TIMEOUT_MS'])}",
+        f"PRAGMA synchronous = {config['SQLITE_SYNCHRONOUS']}",
+        f"PRAGMA mmap_size = {int(config['SQLITE_MMAP_SIZE_MB']) * 1024 * 1024}"
+    ]
+
+
+def configure_engine(engine, config, read_only=False):
+    """
+    Install the SQLite pragmas on every new connection of `engine`; no-op for
+    other databases. read_only=True (replicas) also refuses writes.
+    """
+    if engine.dialect.name != 'sqlite':
+        return
+    pragmas = sqlite_pragmas(config)
+    journal_mode = config['SQLITE_JOURNAL_MODE'].lower()
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+            # Switching modes needs every other connection closed, so only ask when the file is not there
+            # yet and carry on in the current mode if another worker holds it open
+            if cursor.execute("PRAGMA journal_mode").fetchone()[0].lower() != journal_mode:
+                try:
+                    cursor.execute(f"PRAGMA journal_mode = {journal_mode}")
+                except sqlite3.OperationalError as e:
+                    print(f"⚠️ SQLite journal_mode not changed to {journal_mode}: {str(e)}")
+            if read_only:
+                cursor.execute("PRAGMA query_only = ON")
+        finally:
+            cursor.close()
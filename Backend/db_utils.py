@@ -0,0 +1,40 @@
+"""
+Small database helpers shared across modules
+"""
+from datetime import datetime
+
+from sqlalchemy import func
+
+from models import db
+
+
+def dialect_insert(table):
+    """
+    INSERT construct for the bound database that supports
+    on_conflict_do_update / on_conflict_do_nothing (SQLite and PostgreSQL)
+    """
+    dialect = db.engine.dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f'Upserts are not supported on {dialect}')
+    return insert(table)
+
+
+def time_bucket(column, unit):
+    """
+    Truncate a DateTime column to the start of its 'hour' or 'day'. SQLite
+    returns the bucket as text; pass results through parse_bucket().
+    """
+    dialect = db.engine.dialect.name
+    if dialect == 'postgresql':
+        return func.date_trunc(unit, column)
+    if dialect == 'sqlite':
+        return func.strftime('%Y-%m-%d %H:00:00' if unit == 'hour' else '%Y-%m-%d 00:00:00', column)
+    raise NotImplementedError(f'Time buckets are not supported on {dialect}')
+
+
+def parse_bucket(value):
+    return value if isinstance(value, datetime) else datetime.fromisoformat(value)
@@ -0,0 +1,32 @@
+"""
+Flask extensions and per-app service objects.
+
+create_app() builds the caches, writers and task runners for each app and
+keeps them in app.extensions; the proxies below resolve to the current
+app's instance, so blueprints and helpers can import them without needing
+an app at import time.
+"""
+from flask import current_app
+from flask_mail import Mail
+from flask_migrate import Migrate
+from werkzeug.local import LocalProxy
+
+mail = Mail()
+migrate = Migrate()
+
+
+def _service(name):
+    return LocalProxy(lambda: current_app.extensions[name])
+
+
+member_cache = _service('member_cache')
+permission_cache = _service('permission_cache')
+analytics_cache = _service('analytics_cache')
+zone_cache = _service('zone_cache')
+pdf_cache = _service('pdf_cache')
+search_limiter = _service('search_limiter')
+member_lookups = _service('member_lookups')
+search_log_writer = _service('search_log_writer')
+job_runner = _service('job_runner')
+outbox_sender = _service('outbox_sender')
+replica_router = _service('replica_router')
@@ -0,0 +1,140 @@
+"""
+Background job runner for long admin operations (bulk uploads, PDF reports)
+"""
+import json
+import os
+import socket
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from models import db, Job
+
+
+class JobProgress:
+    """Handed to job functions so they can report rows processed and errors so far"""
+
+    def __init__(self, job_id):
+        self.job_id = job_id
+
+    def update(self, processed_rows=None, error_count=None, total_rows=None):
+        values = {'updated_at': datetime.utcnow()}
+        if processed_rows is not None:
+            values['processed_rows'] = processed_rows
+        if error_count is not None:
+            values['error_count'] = error_count
+        if total_rows is not None:
+            values['total_rows'] = total_rows
+
+        db.session.execute(update(Job).where(Job.id == self.job_id).values(**values))
+        db.session.commit()
+
+
+class JobRunner:
+    """
+    Runs job functions on a thread pool and records their state in the jobs
+    table, so any gunicorn worker can answer progress polls. No broker needed.
+
+    A job function is called as fn(progress, **kwargs) inside an app context
+    and returns a JSON-serialisable result, or (result, output_path) when it
+    produces a file for download.
+
+    A queued job lives only in the executor of the worker that took the
+    request, recorded as Job.owner. heartbeat() keeps that worker's queued
+    jobs fresh, so one left behind by a restarted worker goes stale and
+    get() fails it.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._executor = None
+        self._pid = None
+        self.owner = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.max_workers = app.config['JOB_WORKERS']
+        self.stale_after = timedelta(seconds=app.config['JOB_STALE_SECONDS'])
+        app.extensions['job_runner'] = self
+
+    def submit(self, kind, fn, created_by=None, total_rows=None, **kwargs):
+        executor = self._get_executor()
+        job = Job(id=uuid.uuid4().hex, kind=kind, status='queued', created_by=created_by, total_rows=total_rows,
+                  owner=self.owner)
+        db.session.add(job)
+        db.session.commit()
+
+        executor.submit(self._run, job.id, fn, kwargs)
+        return job
+
+    def _get_executor(self):
+        with self._lock:
+            # A forked worker cannot use the parent's threads
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='job')
+                self._pid = os.getpid()
+                # The start time tells a recycled pid apart from the worker that had it before
+                self.owner = f"{socket.gethostname()}:{self._pid}:{datetime.utcnow():%Y%m%d%H%M%S%f}"[:120]
+            return self._executor
+
+    def heartbeat(self):
+        """Mark this worker's queued jobs as still waiting; run well inside JOB_STALE_SECONDS"""
+        if self.owner is None or self._pid != os.getpid():
+            return
+        db.session.execute(
+            update(Job).where(Job.owner == self.owner, Job.status == 'queued').values(updated_at=datetime.utcnow())
+        )
+        db.session.commit()
+
+    def _run(self, job_id, fn, kwargs):
+        with self.app.app_context():
+            now = datetime.utcnow()
+            db.session.execute(
+                update(Job).where(Job.id == job_id).values(status='running', started_at=now, updated_at=now)
+            )
+            db.session.commit()
+
+            values = {}
+            try:
+                result = fn(JobProgress(job_id), **kwargs)
+                if isinstance(result, tuple):
+                    result, values['output_path'] = result
+                values.update(status='succeeded', result=json.dumps(result))
+            except Exception as e:
+                db.session.rollback()
+                print(f"❌ Job {job_id} failed: {str(e)}")
+                values.update(status='failed', error=str(e))
+
+            now = datetime.utcnow()
+            try:
+                db.session.execute(
+                    update(Job).where(Job.id == job_id).values(finished_at=now, updated_at=now, **values)
+                )
+                db.session.commit()
+            finally:
+                db.session.remove()
+
+    def get(self, job_id):
+        """
+        Load a job, failing it if its worker has gone quiet: a running job that
+        stopped reporting progress, or a queued one its owner no longer
+        heartbeats (a queued job waiting behind JOB_WORKERS long jobs is kept
+        fresh by heartbeat()).
+        """
+        job = db.session.get(Job, job_id)
+        if job and job.status in ('queued', 'running') and job.updated_at \
+                and datetime.utcnow() - job.updated_at > self.stale_after:
+            if job.status == 'queued':
+                job.error = f'Job was never started; worker {job.owner} is gone (restarted?)'
+            else:
+                job.error = 'Job stopped reporting progress (worker restarted?)'
+            job.status = 'failed'
+            job.finished_at = datetime.utcnow()
+            db.session.commit()
+        return job
@@ -0,0 +1,317 @@
+"""
+Bulk member import and update helpers used by the upload endpoints
+"""
+from datetime import datetime
+
+import pandas as pd
+from sqlalchemy import bindparam, insert, select, update
+
+from models import db, Member, normalize_number
+import stats
+import zones
+
+UPLOAD_COLUMNS = ['name', 'member_number', 'id_number', 'zone', 'status']
+REQUIRED_VALUES = ['name', 'member_number', 'id_number', 'zone']
+KEY_SEPARATOR = '\x1f'
+
+
+def read_member_batches(path, batch_size):
+    """
+    Yield (first_row, DataFrame) batches of at most batch_size rows so peak
+    memory does not grow with the file. .xlsx is streamed with openpyxl in
+    read-only mode and .csv in pandas chunks; legacy .xls has no streaming
+    reader and is loaded in one go. first_row is the spreadsheet row number
+    (header is row 1) of the batch's first record.
+    """
+    extension = path.rsplit('.', 1)[1].lower()
+
+    if extension == 'csv':
+        first_row = 2
+        for chunk in pd.read_csv(path, chunksize=batch_size, dtype=str):
+            yield first_row, chunk
+            first_row += len(chunk)
+
+    elif extension == 'xlsx':
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = next(rows, None) or ()
+            columns = ['' if col is None else str(col) for col in header]
+
+            first_row = 2
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) == batch_size:
+                    yield first_row, pd.DataFrame(batch, columns=columns)
+                    first_row += len(batch)
+                    batch = []
+
+            if batch or first_row == 2:
+                yield first_row, pd.DataFrame(batch, columns=columns)
+        finally:
+            workbook.close()
+
+    else:
+        df = pd.read_excel(path)
+        for start in range(0, max(len(df), 1), batch_size):
+            yield start + 2, df.iloc[start:start + batch_size]
+
+
+def count_member_rows(path):
+    """Best-effort data row count for progress reporting (None when unknown)"""
+    extension = path.rsplit('.', 1)[1].lower()
+
+    if extension == 'csv':
+        with open(path, 'rb') as f:
+            lines = sum(block.count(b'\n') for block in iter(lambda: f.read(1024 * 1024), b''))
+        return max(lines - 1, 0)
+
+    if extension == 'xlsx':
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(path, read_only=True)
+        try:
+            max_row = workbook.active.max_row
+        finally:
+            workbook.close()
+        return max(max_row - 1, 0) if max_row else None
+
+    return None
+
+
+def load_existing_member_keys():
+    """
+    Return (member_numbers, normalized_keys) for every stored member.
+    normalized_keys maps 'member_number_norm<US>id_number_norm' strings to the
+    member number stored under them, so they can be matched column-wise with
+    Series.map.
+    """
+    member_numbers = set()
+    normalized_keys = {}
+    rows = db.session.query(Member.member_number, Member.member_number_norm, Member.id_number_norm)
+    for row in rows:
+        member_numbers.add(row.member_number)
+        normalized_keys[row.member_number_norm + KEY_SEPARATOR + row.id_number_norm] = row.member_number
+    return member_numbers, normalized_keys
+
+
+def prepare_new_members(df, member_numbers, normalized_keys, first_row=2):
+    """
+    Validate an upload frame column-wise and return (new_members, errors).
+    new_members is a DataFrame of insertable rows; errors are 'Row N: ...'
+    messages in row order. Accepted numbers and keys are added to the
+    collections passed in so later batches see them as existing.
+    """
+    row_numbers = pd.Series(range(first_row, first_row + len(df)), index=df.index).astype(str)
+    missing = df[REQUIRED_VALUES].isna().any(axis=1)
+
+    clean = pd.DataFrame(index=df.index)
+    for col in UPLOAD_COLUMNS:
+        clean[col] = df[col].astype(str).str.strip()
+    clean['status'] = clean['status'].where(df['status'].notna(), 'active')
+    clean['member_number_norm'] = clean['member_number'].map(normalize_number)
+    clean['id_number_norm'] = clean['id_number'].map(normalize_number)
+    keys = clean['member_number_norm'] + KEY_SEPARATOR + clean['id_number_norm']
+
+    # Already stored, or repeated earlier in the same file: the same member number,
+    # or a different spelling of it with an ID number that normalizes the same
+    stored_match = keys.map(normalized_keys)
+    exists = clean['member_number'].isin(member_numbers)
+    candidates = ~missing & ~exists & stored_match.isna()
+    exists |= candidates & clean['member_number'].where(candidates).duplicated(keep='first')
+    repeated_key = candidates & ~exists & keys.where(candidates).duplicated(keep='first')
+    first_seen = clean[candidates].assign(key=keys).drop_duplicates('key')
+    match = stored_match.fillna(keys.map(dict(zip(first_seen['key'], first_seen['member_number']))))
+    normalized = ~missing & ~exists & (stored_match.notna() | repeated_key)
+    exists &= ~missing
+    accepted = ~missing & ~exists & ~normalized
+
+    errors = pd.concat([
+        'Row ' + row_numbers[missing] + ': Missing required data',
+        'Row ' + row_numbers[exists] + ': Member number ' + clean.loc[exists, 'member_number'] + ' already exists',
+        'Row ' + row_numbers[normalized] + ': Member number ' + clean.loc[normalized, 'member_number'] +
+        ' matches member ' + match[normalized] + ' after normalization'
+    ]).sort_index()
+
+    new_members = clean[accepted]
+    member_numbers.update(new_members['member_number'])
+    normalized_keys.update(zip(keys[accepted], new_members['member_number']))
+    return new_members, errors.tolist()
+
+
+def insert_members(new_members, chunk_size):
+    """Insert prepared rows with one executemany INSERT and commit per chunk"""
+    inserted = 0
+    for start in range(0, len(new_members), chunk_size):
+        chunk = new_members.iloc[start:start + chunk_size]
+        zone_ids = zones.ensure_zones(chunk['zone'].unique())
+        chunk = chunk.assign(zone_id=chunk['zone'].map(zone_ids))
+        db.session.execute(insert(Member.__table__), chunk.to_dict('records'))
+        stats.bump(total_members=len(chunk))
+        stats.bump_zones(chunk['zone'].value_counts().to_dict())
+        db.session.commit()
+        inserted += len(chunk)
+    return inserted
+
+
+UPDATE_FIELDS = ['name', 'id_number', 'zone', 'status']
+LOOKUP_CHUNK_SIZE = 500
+MAX_ERROR_DETAILS = 20
+
+
+def updates_from_frame(df, first_row=2):
+    """Yield (label, member_number, fields) for each row of a bulk update sheet"""
+    present = [col for col in UPDATE_FIELDS if col in df.columns]
+    clean = pd.DataFrame(index=df.index)
+    for col in ['member_number'] + present:
+        clean[col] = df[col].astype(str).str.strip().where(df[col].notna())
+
+    for offset, row in enumerate(clean.to_dict('records')):
+        fields = {col: row[col] for col in present if isinstance(row[col], str)}
+        member_number = row['member_number'] if isinstance(row['member_number'], str) else None
+        yield f"Row {first_row + offset}", member_number, fields
+
+
+def updates_from_json(updates):
+    """Yield (label, member_number, fields) for each entry of a JSON bulk update"""
+    for idx, update_data in enumerate(updates):
+        label = f"Update {idx + 1}"
+        if not isinstance(update_data, dict):
+            yield label, None, {}
+            continue
+
+        fields = {col: str(update_data[col]).strip() for col in UPDATE_FIELDS if update_data.get(col)}
+        member_number = update_data.get('member_number')
+        yield label, str(member_number) if member_number else None, fields
+
+
+def new_update_result():
+    return {'updated': 0, 'not_found': 0, 'unchanged': 0, 'errors': 0, 'error_details': []}
+
+
+def _add_error_detail(result, message):
+    if len(result['error_details']) < MAX_ERROR_DETAILS:
+        result['error_details'].append(message)
+
+
+def _load_pair_owners(updates, members):
+    """(member_number_norm, id_number_norm) -> (id, member_number) of stored members the updates could collide with"""
+    pairs = {
+        (members[member_number]['member_number_norm'], normalize_number(fields['id_number']))
+        for _, member_number, fields in updates
+        if member_number in members and fields.get('id_number')
+    }
+    id_norms = list({id_norm for _, id_norm in pairs})
+    owners = {}
+    for start in range(0, len(id_norms), LOOKUP_CHUNK_SIZE):
+        rows = db.session.execute(
+            select(Member.id, Member.member_number, Member.member_number_norm, Member.id_number_norm)
+            .where(Member.id_number_norm.in_(id_norms[start:start + LOOKUP_CHUNK_SIZE]))
+        )
+        for row in rows:
+            pair = (row.member_number_norm, row.id_number_norm)
+            if pair in pairs:
+                owners[pair] = (row.id, row.member_number)
+    return owners
+
+
+def apply_member_updates(updates, result=None):
+    """
+    Apply (label, member_number, fields) updates set-wise: targeted members are
+    loaded with chunked IN queries, rows whose values already match are skipped,
+    and the changed members are written with a single executemany UPDATE.
+    A new ID number whose normalized member/ID pair belongs to another member
+    (stored, or claimed earlier in the batch) is reported and left out, since
+    it would break the unique lookup index for the whole statement.
+    Counters and the first error messages are accumulated into `result` so
+    the endpoints can call this once per batch.
+    """
+    updates = list(updates)
+    if result is None:
+        result = new_update_result()
+
+    numbers = list({member_number for _, member_number, _ in updates if member_number})
+    members = {}
+    columns = [Member.id, Member.member_number, Member.member_number_norm] + \
+        [getattr(Member, col) for col in UPDATE_FIELDS]
+    for start in range(0, len(numbers), LOOKUP_CHUNK_SIZE):
+        rows = db.session.execute(
+            select(*columns).where(Member.member_number.in_(numbers[start:start + LOOKUP_CHUNK_SIZE]))
+        )
+        for row in rows:
+            members[row.member_number] = dict(row._mapping)
+
+    pair_owners = _load_pair_owners(updates, members)
+    changed = {}
+    zone_deltas = {}
+    for label, member_number, fields in updates:
+        if not member_number:
+            result['errors'] += 1
+            _add_error_detail(result, f"{label}: Missing member_number")
+            continue
+
+        member = members.get(member_number)
+        if member is None:
+            result['not_found'] += 1
+            _add_error_detail(result, f"{label}: Member {member_number} not found")
+            continue
+
+        diff = {col: value for col, value in fields.items() if member[col] != value}
+        if not diff:
+            result['unchanged'] += 1
+            continue
+
+        if 'id_number' in diff:
+            pair = (member['member_number_norm'], normalize_number(diff['id_number']))
+            owner_id, owner_number = pair_owners.get(pair, (member['id'], None))
+            if owner_id != member['id']:
+                result['errors'] += 1
+                _add_error_detail(result, f"{label}: ID number {diff['id_number']} would make member "
+                                          f"{member_number} match member {owner_number} after normalization")
+                continue
+            pair_owners[pair] = (member['id'], member_number)
+
+        if 'zone' in diff:
+            zone_deltas[member['zone']] = zone_deltas.get(member['zone'], 0) - 1
+            zone_deltas[diff['zone']] = zone_deltas.get(diff['zone'], 0) + 1
+
+        member.update(diff)
+        changed[member['id']] = member
+        result['updated'] += 1
+
+    if changed:
+        now = datetime.utcnow()
+        zone_ids = zones.ensure_zones({member['zone'] for member in changed.values()})
+        members_table = Member.__table__
+        stmt = (
+            update(members_table)
+            .where(members_table.c.id == bindparam('member_id'))
+            .values(
+                name=bindparam('new_name'),
+                id_number=bindparam('new_id_number'),
+                id_number_norm=bindparam('new_id_number_norm'),
+                zone=bindparam('new_zone'),
+                zone_id=bindparam('new_zone_id'),
+                status=bindparam('new_status'),
+                updated_at=now
+            )
+        )
+        db.session.execute(stmt, [
+            {
+                'member_id': member['id'],
+                'new_name': member['name'],
+                'new_id_number': member['id_number'],
+                'new_id_number_norm': normalize_number(member['id_number']),
+                'new_zone': member['zone'],
+                'new_zone_id': zone_ids[member['zone']],
+                'new_status': member['status']
+            }
+            for member in changed.values()
+        ])
+        stats.bump_zones(zone_deltas)
+        db.session.commit()
+
+    return result
@@ -0,0 +1,25 @@
+"""add job owner
+
+Revision ID: 1c6f4e9a2b57
+Revises: f3a8c6d1e947
+Create Date: 2026-10-17 21:04:12.518306
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1c6f4e9a2b57'
+down_revision = 'f3a8c6d1e947'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('jobs', sa.Column('owner', sa.String(length=120), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('jobs') as batch_op:
+        batch_op.drop_column('owner')
@@ -0,0 +1,181 @@
+"""partition search logs by month, add rollups and task leases
+
+Revision ID: 3b8f2d6a9c15
+Revises: e61b9c2f4d87
+Create Date: 2026-10-17 15:21:09.318204
+
+On PostgreSQL search_logs is rebuilt as a table partitioned by month on
+searched_at (the primary key becomes (id, searched_at), as partitioning
+requires). SQLite keeps its table; older months are moved into archive
+tables later by the maintenance task, so only the new tables are created.
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b8f2d6a9c15'
+down_revision = 'e61b9c2f4d87'
+branch_labels = None
+depends_on = None
+
+# Frozen copy of the search_logs indexes
+SEARCH_LOG_INDEXES = """
+    CREATE INDEX ix_search_logs_member_number ON search_logs (member_number);
+    CREATE INDEX ix_search_logs_searched_at ON search_logs (searched_at);
+    CREATE INDEX ix_search_logs_searched_at_id ON search_logs (searched_at, id);
+    CREATE INDEX ix_search_logs_successful_searched_at_id ON search_logs (search_successful, searched_at, id);
+"""
+
+
+def _add_months(month, months):
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def upgrade():
+    op.create_table(
+        'task_leases',
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('holder', sa.String(length=100), nullable=True),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+    op.create_table(
+        'search_log_partitions',
+        sa.Column('name', sa.String(length=63), nullable=False),
+        sa.Column('range_start', sa.DateTime(), nullable=False),
+        sa.Column('range_end', sa.DateTime(), nullable=False),
+        sa.Column('row_count', sa.Integer(), nullable=True),
+        sa.Column('successful_count', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('name')
+    )
+    op.create_index('ix_search_log_partitions_range_start', 'search_log_partitions', ['range_start'], unique=False)
+    for table_name in ('search_log_hourly', 'search_log_daily'):
+        op.create_table(
+            table_name,
+            sa.Column('bucket_start', sa.DateTime(), nullable=False),
+            sa.Column('zone', sa.String(length=100), nullable=False),
+            sa.Column('searches', sa.Integer(), nullable=False),
+            sa.Column('successes', sa.Integer(), nullable=False),
+            sa.Column('unique_ips', sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint('bucket_start', 'zone')
+        )
+    op.create_table(
+        'rollup_watermarks',
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('rolled_up_to', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+    if op.get_bind().dialect.name == 'postgresql':
+        partition_search_logs()
+
+
+def partition_search_logs():
+    bind = op.get_bind()
+    op.execute("ALTER TABLE search_logs RENAME TO search_logs_unpartitioned")
+    op.execute("ALTER SEQUENCE search_logs_id_seq OWNED BY NONE")
+    op.execute("""
+        CREATE TABLE search_logs (
+            id INTEGER NOT NULL DEFAULT nextval('search_logs_id_seq'),
+            member_id INTEGER REFERENCES members (id),
+            member_number VARCHAR(50) NOT NULL,
+            id_number VARCHAR(50) NOT NULL,
+            search_successful BOOLEAN,
+            ip_address VARCHAR(45),
+            user_agent VARCHAR(500),
+            searched_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            PRIMARY KEY (id, searched_at)
+        ) PARTITION BY RANGE (searched_at)
+    """)
+    op.execute("ALTER SEQUENCE search_logs_id_seq OWNED BY search_logs.id")
+    op.execute("CREATE TABLE search_logs_default PARTITION OF search_logs DEFAULT")
+
+    # One partition per month from the oldest row to two months ahead
+    now = datetime.utcnow()
+    oldest = bind.execute(sa.text("SELECT MIN(searched_at) FROM search_logs_unpartitioned")).scalar() or now
+    month = datetime(oldest.year, oldest.month, 1)
+    last = _add_months(datetime(now.year, now.month, 1), 2)
+    while month <= last:
+        end = _add_months(month, 1)
+        name = f"search_logs_{month.year:04d}_{month.month:02d}"
+        op.execute(f"CREATE TABLE {name} PARTITION OF search_logs "
+                   f"FOR VALUES FROM ('{month.isoformat()}') TO ('{end.isoformat()}')")
+        bind.execute(sa.text(
+            "INSERT INTO search_log_partitions (name, range_start, range_end, created_at) "
+            "VALUES (:name, :start, :end, :now)"
+        ), {'name': name, 'start': month, 'end': end, 'now': now})
+        month = end
+
+    op.execute("""
+        INSERT INTO search_logs (id, member_id, member_number, id_number, search_successful,
+                                 ip_address, user_agent, searched_at)
+        SELECT id, member_id, member_number, id_number, search_successful,
+               ip_address, user_agent, searched_at
+        FROM search_logs_unpartitioned
+    """)
+    op.execute("DROP TABLE search_logs_unpartitioned")
+    for statement in SEARCH_LOG_INDEXES.strip().splitlines():
+        op.execute(statement.strip().rstrip(';'))
+
+
+def unpartition_search_logs():
+    op.execute("ALTER TABLE search_logs RENAME TO search_logs_partitioned")
+    op.execute("ALTER SEQUENCE search_logs_id_seq OWNED BY NONE")
+    op.execute("""
+        CREATE TABLE search_logs (
+            id INTEGER NOT NULL DEFAULT nextval('search_logs_id_seq') PRIMARY KEY,
+            member_id INTEGER REFERENCES members (id),
+            member_number VARCHAR(50) NOT NULL,
+            id_number VARCHAR(50) NOT NULL,
+            search_successful BOOLEAN,
+            ip_address VARCHAR(45),
+            user_agent VARCHAR(500),
+            searched_at TIMESTAMP WITHOUT TIME ZONE NOT NULL
+        )
+    """)
+    op.execute("ALTER SEQUENCE search_logs_id_seq OWNED BY search_logs.id")
+    op.execute("""
+        INSERT INTO search_logs (id, member_id, member_number, id_number, search_successful,
+                                 ip_address, user_agent, searched_at)
+        SELECT id, member_id, member_number, id_number, search_successful,
+               ip_address, user_agent, searched_at
+        FROM search_logs_partitioned
+    """)
+    # Dropping the parent drops every partition with it
+    op.execute("DROP TABLE search_logs_partitioned")
+    for statement in SEARCH_LOG_INDEXES.strip().splitlines():
+        op.execute(statement.strip().rstrip(';'))
+
+
+def unarchive_search_logs():
+    """SQLite: move archived months back into search_logs"""
+    bind = op.get_bind()
+    names = bind.execute(sa.text("SELECT name FROM search_log_partitions")).scalars().all()
+    for name in names:
+        op.execute(f"""
+            INSERT INTO search_logs (id, member_id, member_number, id_number, search_successful,
+                                     ip_address, user_agent, searched_at)
+            SELECT id, member_id, member_number, id_number, search_successful,
+                   ip_address, user_agent, searched_at
+            FROM {name}
+        """)
+        op.execute(f"DROP TABLE {name}")
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        unpartition_search_logs()
+    else:
+        unarchive_search_logs()
+
+    op.drop_table('rollup_watermarks')
+    op.drop_table('search_log_daily')
+    op.drop_table('search_log_hourly')
+    op.drop_index('ix_search_log_partitions_range_start', table_name='search_log_partitions')
+    op.drop_table('search_log_partitions')
+    op.drop_table('task_leases')
@@ -0,0 +1,136 @@
+"""add normalized member lookup columns
+
+Revision ID: 4b7e2c91d0a3
+Revises: 950ed626b989
+Create Date: 2026-10-17 09:12:44.118203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import math
+
+
+# revision identifiers, used by Alembic.
+revision = '4b7e2c91d0a3'
+down_revision = '950ed626b989'
+branch_labels = None
+depends_on = None
+
+BACKFILL_CHUNK_SIZE = 5000
+DUPLICATES_SHOWN = 20
+
+
+def normalize_number(value):
+    # Frozen copy of models.normalize_number so this revision keeps
+    # producing the same keys if the model helper changes later
+    if value is None:
+        return ''
+    if isinstance(value, float):
+        if math.isnan(value):
+            return ''
+        if value.is_integer():
+            value = int(value)
+    str_value = str(value).strip().replace(' ', '').upper()
+    if str_value.endswith('.0') and str_value[:-2].isdigit():
+        str_value = str_value[:-2]
+    if str_value.isdigit():
+        return str_value.lstrip('0') or '0'
+    return str_value
+
+
+def check_duplicates(conn):
+    """
+    Stop before changing the schema if two members normalize to the same
+    lookup key, which the unique index would reject with a bare
+    IntegrityError; name them so they can be merged or corrected first.
+    """
+    members = sa.table('members', sa.column('id', sa.Integer), sa.column('member_number', sa.String),
+                       sa.column('id_number', sa.String))
+    seen = {}
+    duplicates = {}
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(members.c.id, members.c.member_number, members.c.id_number)
+            .where(members.c.id > last_id)
+            .order_by(members.c.id)
+            .limit(BACKFILL_CHUNK_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        for row in rows:
+            key = (normalize_number(row.member_number), normalize_number(row.id_number))
+            member = f"id {row.id} ({row.member_number!r}, {row.id_number!r})"
+            if key in seen:
+                duplicates.setdefault(key, [seen[key]]).append(member)
+            else:
+                seen[key] = member
+        last_id = rows[-1].id
+
+    if duplicates:
+        lines = [f"  {mn} / {idn}: {', '.join(found)}"
+                 for (mn, idn), found in list(duplicates.items())[:DUPLICATES_SHOWN]]
+        if len(duplicates) > DUPLICATES_SHOWN:
+            lines.append(f"  ... and {len(duplicates) - DUPLICATES_SHOWN} more")
+        raise RuntimeError(
+            f"{len(duplicates)} member number / ID number pair(s) are the same after normalization "
+            "(leading zeros, spaces, case). Merge or correct these members, then rerun the upgrade:\n"
+            + '\n'.join(lines)
+        )
+
+
+def upgrade():
+    conn = op.get_bind()
+    check_duplicates(conn)
+
+    with op.batch_alter_table('members', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('member_number_norm', sa.String(length=50), nullable=True))
+        batch_op.add_column(sa.Column('id_number_norm', sa.String(length=50), nullable=True))
+
+    # Backfill in primary-key order, one chunk at a time
+    members = sa.table(
+        'members',
+        sa.column('id', sa.Integer),
+        sa.column('member_number', sa.String),
+        sa.column('id_number', sa.String),
+        sa.column('member_number_norm', sa.String),
+        sa.column('id_number_norm', sa.String)
+    )
+    update_stmt = (
+        members.update()
+        .where(members.c.id == sa.bindparam('member_id'))
+        .values(member_number_norm=sa.bindparam('mn_norm'), id_number_norm=sa.bindparam('id_norm'))
+    )
+
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(members.c.id, members.c.member_number, members.c.id_number)
+            .where(members.c.id > last_id)
+            .order_by(members.c.id)
+            .limit(BACKFILL_CHUNK_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+
+        conn.execute(update_stmt, [
+            {
+                'member_id': row.id,
+                'mn_norm': normalize_number(row.member_number),
+                'id_norm': normalize_number(row.id_number)
+            }
+            for row in rows
+        ])
+        last_id = rows[-1].id
+
+    with op.batch_alter_table('members', schema=None) as batch_op:
+        batch_op.alter_column('member_number_norm', existing_type=sa.String(length=50), nullable=False)
+        batch_op.alter_column('id_number_norm', existing_type=sa.String(length=50), nullable=False)
+        batch_op.create_index('ix_members_norm_lookup', ['member_number_norm', 'id_number_norm'], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table('members', schema=None) as batch_op:
+        batch_op.drop_index('ix_members_norm_lookup')
+        batch_op.drop_column('id_number_norm')
+        batch_op.drop_column('member_number_norm')
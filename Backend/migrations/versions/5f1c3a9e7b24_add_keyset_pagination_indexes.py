@@ -0,0 +1,36 @@
+"""add keyset pagination indexes
+
+Revision ID: 5f1c3a9e7b24
+Revises: c2e94b7a51f8
+Create Date: 2026-10-17 13:24:41.208337
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5f1c3a9e7b24'
+down_revision = 'c2e94b7a51f8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_members_name_id', 'members', ['name', 'id'], unique=False)
+    op.create_index('ix_verifications_verified_at_id', 'verifications', ['verified_at', 'id'], unique=False)
+    op.create_index('ix_correction_requests_submitted_at_id', 'correction_requests', ['submitted_at', 'id'], unique=False)
+    op.create_index('ix_correction_requests_status_submitted_at_id', 'correction_requests',
+                    ['status', 'submitted_at', 'id'], unique=False)
+    op.create_index('ix_search_logs_searched_at_id', 'search_logs', ['searched_at', 'id'], unique=False)
+    op.create_index('ix_search_logs_successful_searched_at_id', 'search_logs',
+                    ['search_successful', 'searched_at', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_search_logs_successful_searched_at_id', table_name='search_logs')
+    op.drop_index('ix_search_logs_searched_at_id', table_name='search_logs')
+    op.drop_index('ix_correction_requests_status_submitted_at_id', table_name='correction_requests')
+    op.drop_index('ix_correction_requests_submitted_at_id', table_name='correction_requests')
+    op.drop_index('ix_verifications_verified_at_id', table_name='verifications')
+    op.drop_index('ix_members_name_id', table_name='members')
@@ -0,0 +1,86 @@
+"""add zones table
+
+Revision ID: 6e2b8d4f1a73
+Revises: d47a1c8e2f60
+Create Date: 2026-10-17 17:12:38.554902
+
+Members and verifications get a zone_id foreign key backfilled from their
+zone names; the names stay for display and the member search index. On
+SQLite zone_id is added as a nullable column: making it NOT NULL needs a
+table rebuild, which would also drop the members search triggers.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6e2b8d4f1a73'
+down_revision = 'd47a1c8e2f60'
+branch_labels = None
+depends_on = None
+
+
+def add_zone_id(table_name):
+    if op.get_bind().dialect.name == 'sqlite':
+        # Alembic only adds foreign keys on SQLite through a table rebuild; plain ALTER TABLE can do it
+        op.execute(f"ALTER TABLE {table_name} ADD COLUMN zone_id INTEGER REFERENCES zones (id)")
+    else:
+        op.add_column(table_name, sa.Column('zone_id', sa.Integer(), sa.ForeignKey('zones.id'), nullable=True))
+
+
+def upgrade():
+    op.create_table(
+        'zones',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('member_count', sa.Integer(), nullable=False),
+        sa.Column('verification_count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name')
+    )
+    op.execute("""
+        INSERT INTO zones (name, member_count, verification_count, created_at)
+        SELECT zone, 0, 0, CURRENT_TIMESTAMP FROM (
+            SELECT zone FROM members UNION SELECT zone FROM verifications
+        ) names
+        ORDER BY zone
+    """)
+
+    for table_name in ('members', 'verifications'):
+        add_zone_id(table_name)
+    op.execute("UPDATE members SET zone_id = (SELECT zones.id FROM zones WHERE zones.name = members.zone)")
+    op.execute("UPDATE verifications SET zone_id = (SELECT zones.id FROM zones WHERE zones.name = verifications.zone)")
+    op.execute("""
+        UPDATE zones SET
+            member_count = (SELECT COUNT(*) FROM members WHERE members.zone_id = zones.id),
+            verification_count = (SELECT COUNT(*) FROM verifications WHERE verifications.zone_id = zones.id)
+    """)
+
+    if op.get_bind().dialect.name != 'sqlite':
+        op.alter_column('members', 'zone_id', existing_type=sa.Integer(), nullable=False)
+
+    op.create_index('ix_members_zone_id_name_id', 'members', ['zone_id', 'name', 'id'], unique=False)
+    op.create_index('ix_verifications_zone_id_verified_at_id', 'verifications',
+                    ['zone_id', 'verified_at', 'id'], unique=False)
+
+    # Per-zone member counts now live on the zones table
+    op.execute("DELETE FROM stat_counters WHERE name LIKE 'zone:%'")
+
+
+def downgrade():
+    op.execute("""
+        INSERT INTO stat_counters (name, value, updated_at)
+        SELECT 'zone:' || name, member_count, CURRENT_TIMESTAMP FROM zones WHERE member_count > 0
+    """)
+    op.drop_index('ix_verifications_zone_id_verified_at_id', table_name='verifications')
+    op.drop_index('ix_members_zone_id_name_id', table_name='members')
+
+    if op.get_bind().dialect.name == 'sqlite':
+        # DROP COLUMN cannot remove a column with a foreign key on SQLite; rebuilding members
+        # would drop its search triggers, so the unused zone_id columns are left in place
+        pass
+    else:
+        op.drop_column('verifications', 'zone_id')
+        op.drop_column('members', 'zone_id')
+    op.drop_table('zones')
@@ -0,0 +1,66 @@
+"""add search analytics aggregates
+
+Revision ID: 9c4e7a2b5d31
+Revises: 3b8f2d6a9c15
+Create Date: 2026-10-17 15:58:42.610337
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c4e7a2b5d31'
+down_revision = '3b8f2d6a9c15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'search_failures_daily',
+        sa.Column('day', sa.DateTime(), nullable=False),
+        sa.Column('member_number', sa.String(length=50), nullable=False),
+        sa.Column('failures', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('day', 'member_number')
+    )
+    op.create_table(
+        'search_ips_daily',
+        sa.Column('day', sa.DateTime(), nullable=False),
+        sa.Column('ip_address', sa.String(length=45), nullable=False),
+        sa.Column('searches', sa.Integer(), nullable=False),
+        sa.Column('failures', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('day', 'ip_address')
+    )
+
+    # Backfill from the logs kept so far (including SQLite archive tables)
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        day = "date_trunc('day', searched_at)"
+        sources = ['search_logs']
+    else:
+        day = "strftime('%Y-%m-%d 00:00:00.000000', searched_at)"
+        sources = ['search_logs'] + bind.execute(sa.text("SELECT name FROM search_log_partitions")).scalars().all()
+    logs = ' UNION ALL '.join(
+        f"SELECT searched_at, member_number, ip_address, search_successful FROM {name}" for name in sources
+    )
+
+    op.execute(f"""
+        INSERT INTO search_failures_daily (day, member_number, failures)
+        SELECT {day}, member_number, COUNT(*)
+        FROM ({logs}) logs
+        WHERE NOT search_successful OR search_successful IS NULL
+        GROUP BY {day}, member_number
+    """)
+    op.execute(f"""
+        INSERT INTO search_ips_daily (day, ip_address, searches, failures)
+        SELECT {day}, COALESCE(ip_address, ''), COUNT(*),
+               SUM(CASE WHEN search_successful THEN 0 ELSE 1 END)
+        FROM ({logs}) logs
+        GROUP BY {day}, COALESCE(ip_address, '')
+    """)
+
+
+def downgrade():
+    op.drop_table('search_ips_daily')
+    op.drop_table('search_failures_daily')
@@ -0,0 +1,48 @@
+"""add stat counters
+
+Revision ID: c2e94b7a51f8
+Revises: 8d5a0f3e6c12
+Create Date: 2026-10-17 13:05:27.904412
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c2e94b7a51f8'
+down_revision = '8d5a0f3e6c12'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'stat_counters',
+        sa.Column('name', sa.String(length=150), nullable=False),
+        sa.Column('value', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+    # Seed from the current data so the dashboard is correct right away
+    op.execute("""
+        INSERT INTO stat_counters (name, value, updated_at)
+        SELECT 'total_members', COUNT(*), CURRENT_TIMESTAMP FROM members
+        UNION ALL
+        SELECT 'total_verifications', COUNT(*), CURRENT_TIMESTAMP FROM verifications
+        UNION ALL
+        SELECT 'pending_corrections', COUNT(*), CURRENT_TIMESTAMP FROM correction_requests WHERE status = 'pending'
+        UNION ALL
+        SELECT 'total_searches', COUNT(*), CURRENT_TIMESTAMP FROM search_logs
+        UNION ALL
+        SELECT 'successful_searches', COUNT(*), CURRENT_TIMESTAMP FROM search_logs WHERE search_successful
+    """)
+    op.execute("""
+        INSERT INTO stat_counters (name, value, updated_at)
+        SELECT 'zone:' || zone, COUNT(*), CURRENT_TIMESTAMP FROM members GROUP BY zone
+    """)
+
+
+def downgrade():
+    op.drop_table('stat_counters')
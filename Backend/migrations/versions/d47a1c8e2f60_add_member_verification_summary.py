@@ -0,0 +1,49 @@
+"""add member verification summary
+
+Revision ID: d47a1c8e2f60
+Revises: 9c4e7a2b5d31
+Create Date: 2026-10-17 16:34:15.207781
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd47a1c8e2f60'
+down_revision = '9c4e7a2b5d31'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_verifications_member_id_verified_at', 'verifications',
+                    ['member_id', 'verified_at'], unique=False)
+    op.create_table(
+        'member_verification_summary',
+        sa.Column('member_id', sa.Integer(), nullable=False),
+        sa.Column('first_verified_at', sa.DateTime(), nullable=False),
+        sa.Column('last_verified_at', sa.DateTime(), nullable=False),
+        sa.Column('verification_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['member_id'], ['members.id']),
+        sa.PrimaryKeyConstraint('member_id')
+    )
+
+    # Existing rows are kept; the summary is built from them once
+    op.execute("""
+        INSERT INTO member_verification_summary (member_id, first_verified_at, last_verified_at, verification_count)
+        SELECT v.member_id, MIN(v.verified_at), MAX(v.verified_at), COUNT(*)
+        FROM verifications v
+        JOIN members m ON m.id = v.member_id
+        GROUP BY v.member_id
+    """)
+    op.execute("""
+        INSERT INTO stat_counters (name, value, updated_at)
+        SELECT 'verified_members', COUNT(*), CURRENT_TIMESTAMP FROM member_verification_summary
+    """)
+
+
+def downgrade():
+    op.execute("DELETE FROM stat_counters WHERE name = 'verified_members'")
+    op.drop_table('member_verification_summary')
+    op.drop_index('ix_verifications_member_id_verified_at', table_name='verifications')
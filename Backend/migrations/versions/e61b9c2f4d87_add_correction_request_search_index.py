@@ -0,0 +1,80 @@
+"""add correction request search index
+
+Revision ID: e61b9c2f4d87
+Revises: a7d3e5b18c40
+Create Date: 2026-10-17 14:48:52.117406
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e61b9c2f4d87'
+down_revision = 'a7d3e5b18c40'
+branch_labels = None
+depends_on = None
+
+TABLE = 'correction_requests'
+FTS_TABLE = 'correction_requests_fts'
+TRGM_INDEX = 'ix_correction_requests_search_trgm'
+COLUMNS = ('member_number', 'id_number', 'current_name', 'correct_name',
+           'current_zone', 'correct_zone', 'email', 'phone')
+
+
+def sqlite_fts_statements(table, fts_table, columns):
+    """FTS5 external-content table over `table` plus the triggers that keep it in sync"""
+    cols = ', '.join(columns)
+    new = ', '.join(f'new.{col}' for col in columns)
+    old = ', '.join(f'old.{col}' for col in columns)
+    return [
+        f"CREATE VIRTUAL TABLE {fts_table} USING fts5({cols}, content='{table}', content_rowid='id', tokenize='trigram')",
+        f"CREATE TRIGGER {fts_table}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts_table}(rowid, {cols}) VALUES (new.id, {new}); END",
+        f"CREATE TRIGGER {fts_table}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts_table}({fts_table}, rowid, {cols}) VALUES ('delete', old.id, {old}); END",
+        f"CREATE TRIGGER {fts_table}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+        f"INSERT INTO {fts_table}({fts_table}, rowid, {cols}) VALUES ('delete', old.id, {old}); "
+        f"INSERT INTO {fts_table}(rowid, {cols}) VALUES (new.id, {new}); END",
+        f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')"
+    ]
+
+
+def postgres_trgm_index(table, index, columns):
+    parts = " || ' ' || ".join(f"coalesce({table}.{col}, '')" for col in columns)
+    return f"CREATE INDEX {index} ON {table} USING gin ((lower({parts})) gin_trgm_ops)"
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    if bind.dialect.name == 'sqlite':
+        try:
+            for statement in sqlite_fts_statements(TABLE, FTS_TABLE, COLUMNS):
+                op.execute(statement)
+        except sa.exc.OperationalError as e:
+            # SQLite built without FTS5 / trigram (< 3.34): search keeps using ILIKE
+            print(f"⚠️ Skipping correction search index: {str(e)}")
+            for trigger in ('ai', 'ad', 'au'):
+                op.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{trigger}")
+            op.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+    elif bind.dialect.name == 'postgresql':
+        available = bind.execute(sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")).first()
+        if not available:
+            print("⚠️ pg_trgm is not available, skipping correction search index")
+            return
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute(postgres_trgm_index(TABLE, TRGM_INDEX, COLUMNS))
+
+
+def downgrade():
+    bind = op.get_bind()
+
+    if bind.dialect.name == 'sqlite':
+        for trigger in ('ai', 'ad', 'au'):
+            op.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{trigger}")
+        op.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+    elif bind.dialect.name == 'postgresql':
+        op.execute(f"DROP INDEX IF EXISTS {TRGM_INDEX}")
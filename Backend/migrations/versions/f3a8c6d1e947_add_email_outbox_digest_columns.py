@@ -0,0 +1,29 @@
+"""add email outbox digest columns
+
+Revision ID: f3a8c6d1e947
+Revises: b5f9e3c7d218
+Create Date: 2026-10-17 18:21:37.402968
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a8c6d1e947'
+down_revision = 'b5f9e3c7d218'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('email_outbox', sa.Column('reference_id', sa.Integer(), nullable=True))
+    op.add_column('email_outbox', sa.Column('attachment_name', sa.String(length=255), nullable=True))
+    op.add_column('email_outbox', sa.Column('attachment', sa.LargeBinary(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('email_outbox') as batch_op:
+        batch_op.drop_column('attachment')
+        batch_op.drop_column('attachment_name')
+        batch_op.drop_column('reference_id')
@@ -1,25 +1,110 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.orm import validates
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
+import json
+import math
+
+from replicas import RoutingSession
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+
+def normalize_number(value):
+    """
+    Canonical lookup key for member and ID numbers.
+    Strips spaces and the '.0' Excel adds to numeric cells, upper-cases
+    letters and drops leading zeros from purely numeric values, so
+    '0001', '001', '1' and 1.0 all normalize to '1' while 'm001' becomes 'M001'.
+    """
+    if value is None:
+        return ''
+    
+    if isinstance(value, float):
+        if math.isnan(value):
+            return ''
+        if value.is_integer():
+            value = int(value)
+    
+    str_value = str(value).strip().replace(' ', '').upper()
+    
+    if str_value.endswith('.0') and str_value[:-2].isdigit():
+        str_value = str_value[:-2]
+    
+    if str_value.isdigit():
+        return str_value.lstrip('0') or '0'
+    
+    return str_value
+
+
+ROLE_PERMISSIONS = {
+    'super_admin': frozenset(['manage_users', 'manage_members', 'view_verifications', 'view_corrections', 'manage_corrections']),
+    'member_manager': frozenset(['manage_members', 'view_verifications', 'view_corrections']),
+    'verification_viewer': frozenset(['view_verifications']),
+    'correction_viewer': frozenset(['view_corrections', 'manage_corrections'])
+}
+
+
+class Zone(db.Model):
+    __tablename__ = 'zones'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), unique=True, nullable=False)
+    # Maintained by the write paths (stats.bump_zones / bump_zone_verifications)
+    member_count = db.Column(db.Integer, default=0, nullable=False)
+    verification_count = db.Column(db.Integer, default=0, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'member_count': self.member_count,
+            'verification_count': self.verification_count
+        }
+    
+    def __repr__(self):
+        return f'<Zone {self.name}>'
 
-db = SQLAlchemy()
 
 class Member(db.Model):
     __tablename__ = 'members'
+    __table_args__ = (
+        db.Index('ix_members_norm_lookup', 'member_number_norm', 'id_number_norm', unique=True),
+        db.Index('ix_members_name_id', 'name', 'id'),
+        db.Index('ix_members_zone_id_name_id', 'zone_id', 'name', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False)
     member_number = db.Column(db.String(50), unique=True, nullable=False, index=True)
     id_number = db.Column(db.String(50), nullable=False, index=True)
-    zone = db.Column(db.String(100), nullable=False)
+    zone = db.Column(db.String(100), nullable=False)  # zone name, kept for display and the search index
+    zone_id = db.Column(db.Integer, db.ForeignKey('zones.id'), nullable=False)
     status = db.Column(db.String(20), default='active')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Normalized copies used by the public search (see normalize_number)
+    member_number_norm = db.Column(db.String(50), nullable=False)
+    id_number_norm = db.Column(db.String(50), nullable=False)
+    
     # Relationships
     verifications = db.relationship('Verification', backref='member', lazy=True, cascade='all, delete-orphan')
     corrections = db.relationship('CorrectionRequest', backref='member', lazy=True, cascade='all, delete-orphan')
     search_logs = db.relationship('SearchLog', backref='member', lazy=True, cascade='all, delete-orphan')
+    verification_summary = db.relationship('MemberVerificationSummary', lazy=True, uselist=False,
+                                           cascade='all, delete-orphan')
+    
+    @validates('member_number')
+    def _set_member_number_norm(self, key, value):
+        self.member_number_norm = normalize_number(value)
+        return value
+    
+    @validates('id_number')
+    def _set_id_number_norm(self, key, value):
+        self.id_number_norm = normalize_number(value)
+        return value
     
     def to_dict(self):
         return {
@@ -28,6 +113,7 @@ class Member(db.Model):
             'member_number': self.member_number,
             'id_number': self.id_number,
             'zone': self.zone,
+            'zone_id': self.zone_id,
             'status': self.status,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
@@ -59,13 +145,7 @@ class User(db.Model):
     
     def has_permission(self, permission):
         """Check if user has specific permission"""
-        permissions = {
-            'super_admin': ['manage_users', 'manage_members', 'view_verifications', 'view_corrections', 'manage_corrections'],
-            'member_manager': ['manage_members', 'view_verifications', 'view_corrections'],
-            'verification_viewer': ['view_verifications'],
-            'correction_viewer': ['view_corrections', 'manage_corrections']
-        }
-        return permission in permissions.get(self.role, [])
+        return permission in ROLE_PERMISSIONS.get(self.role, frozenset())
     
     def to_dict(self):
         return {
@@ -84,12 +164,18 @@ class User(db.Model):
 
 class Verification(db.Model):
     __tablename__ = 'verifications'
+    __table_args__ = (
+        db.Index('ix_verifications_verified_at_id', 'verified_at', 'id'),
+        db.Index('ix_verifications_member_id_verified_at', 'member_id', 'verified_at'),
+        db.Index('ix_verifications_zone_id_verified_at_id', 'zone_id', 'verified_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     member_id = db.Column(db.Integer, db.ForeignKey('members.id'), nullable=False)
     member_number = db.Column(db.String(50), nullable=False)
     member_name = db.Column(db.String(200), nullable=False)
     zone = db.Column(db.String(100), nullable=False)
+    zone_id = db.Column(db.Integer, db.ForeignKey('zones.id'))
     id_number = db.Column(db.String(50), nullable=False)
     verified_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     
@@ -100,6 +186,7 @@ class Verification(db.Model):
             'member_number': self.member_number,
             'member_name': self.member_name,
             'zone': self.zone,
+            'zone_id': self.zone_id,
             'id_number': self.id_number,
             'verified_at': self.verified_at.isoformat() if self.verified_at else None
         }
@@ -108,8 +195,33 @@ class Verification(db.Model):
         return f'<Verification {self.member_number} at {self.verified_at}>'
 
 
+class MemberVerificationSummary(db.Model):
+    __tablename__ = 'member_verification_summary'
+    
+    # One row per member that has verified, upserted together with each Verification row
+    member_id = db.Column(db.Integer, db.ForeignKey('members.id'), primary_key=True)
+    first_verified_at = db.Column(db.DateTime, nullable=False)
+    last_verified_at = db.Column(db.DateTime, nullable=False)
+    verification_count = db.Column(db.Integer, default=0, nullable=False)
+    
+    def to_dict(self):
+        return {
+            'member_id': self.member_id,
+            'first_verified_at': self.first_verified_at.isoformat(),
+            'last_verified_at': self.last_verified_at.isoformat(),
+            'verification_count': self.verification_count
+        }
+    
+    def __repr__(self):
+        return f'<MemberVerificationSummary {self.member_id}: {self.verification_count}>'
+
+
 class CorrectionRequest(db.Model):
     __tablename__ = 'correction_requests'
+    __table_args__ = (
+        db.Index('ix_correction_requests_submitted_at_id', 'submitted_at', 'id'),
+        db.Index('ix_correction_requests_status_submitted_at_id', 'status', 'submitted_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     member_id = db.Column(db.Integer, db.ForeignKey('members.id'), nullable=False)
@@ -162,6 +274,10 @@ class CorrectionRequest(db.Model):
 # NEW: Search Log model to track all searches
 class SearchLog(db.Model):
     __tablename__ = 'search_logs'
+    __table_args__ = (
+        db.Index('ix_search_logs_searched_at_id', 'searched_at', 'id'),
+        db.Index('ix_search_logs_successful_searched_at_id', 'search_successful', 'searched_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     member_id = db.Column(db.Integer, db.ForeignKey('members.id'), nullable=True)
@@ -184,4 +300,181 @@ class SearchLog(db.Model):
         }
     
     def __repr__(self):
-        return f'<SearchLog {self.member_number} - {"Success" if self.search_successful else "Failed"}>'
\ No newline at end of file
+        return f'<SearchLog {self.member_number} - {"Success" if self.search_successful else "Failed"}>'
+
+
+class Job(db.Model):
+    __tablename__ = 'jobs'
+    
+    id = db.Column(db.String(32), primary_key=True)  # uuid4 hex
+    kind = db.Column(db.String(50), nullable=False)
+    status = db.Column(db.String(20), default='queued', nullable=False)  # queued, running, succeeded, failed
+    total_rows = db.Column(db.Integer)
+    processed_rows = db.Column(db.Integer, default=0, nullable=False)
+    error_count = db.Column(db.Integer, default=0, nullable=False)
+    result = db.Column(db.Text)  # JSON payload returned to the client
+    error = db.Column(db.Text)
+    output_path = db.Column(db.String(500))
+    created_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
+    owner = db.Column(db.String(120))  # host:pid:start of the worker whose executor holds the job
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    started_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime)
+    
+    def eta_seconds(self):
+        if self.status != 'running' or not self.started_at or not self.total_rows or not self.processed_rows:
+            return None
+        elapsed = (datetime.utcnow() - self.started_at).total_seconds()
+        remaining = max(self.total_rows - self.processed_rows, 0)
+        return round(remaining * elapsed / self.processed_rows, 1)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'total_rows': self.total_rows,
+            'processed_rows': self.processed_rows,
+            'error_count': self.error_count,
+            'eta_seconds': self.eta_seconds(),
+            'result': json.loads(self.result) if self.result else None,
+            'error': self.error,
+            'has_download': bool(self.output_path),
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+    
+    def __repr__(self):
+        return f'<Job {self.kind} {self.id} - {self.status}>'
+
+
+class StatCounter(db.Model):
+    __tablename__ = 'stat_counters'
+    
+    # One row per stats.COUNTERS name such as 'total_members'; per-zone counts live on zones.member_count
+    name = db.Column(db.String(150), primary_key=True)
+    value = db.Column(db.BigInteger, default=0, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<StatCounter {self.name}={self.value}>'
+
+
+class TaskLease(db.Model):
+    __tablename__ = 'task_leases'
+    
+    # Lets one worker in the cluster claim a periodic task for a while
+    name = db.Column(db.String(100), primary_key=True)
+    holder = db.Column(db.String(100))
+    expires_at = db.Column(db.DateTime, nullable=False)
+    
+    def __repr__(self):
+        return f'<TaskLease {self.name} - {self.holder}>'
+
+
+class SearchLogPartition(db.Model):
+    __tablename__ = 'search_log_partitions'
+    
+    # One row per monthly search_logs_YYYY_MM table (PostgreSQL partition or SQLite archive)
+    name = db.Column(db.String(63), primary_key=True)
+    range_start = db.Column(db.DateTime, nullable=False, index=True)
+    range_end = db.Column(db.DateTime, nullable=False)
+    row_count = db.Column(db.Integer)  # SQLite archives only, filled when rows are moved in
+    successful_count = db.Column(db.Integer)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<SearchLogPartition {self.name}>'
+
+
+class SearchLogHourly(db.Model):
+    __tablename__ = 'search_log_hourly'
+    
+    bucket_start = db.Column(db.DateTime, primary_key=True)
+    zone = db.Column(db.String(100), primary_key=True)  # '' for searches that matched no member
+    searches = db.Column(db.Integer, default=0, nullable=False)
+    successes = db.Column(db.Integer, default=0, nullable=False)
+    unique_ips = db.Column(db.Integer, default=0, nullable=False)
+    
+    def to_dict(self):
+        return {
+            'bucket_start': self.bucket_start.isoformat(),
+            'zone': self.zone,
+            'searches': self.searches,
+            'successes': self.successes,
+            'unique_ips': self.unique_ips
+        }
+
+
+class SearchLogDaily(db.Model):
+    __tablename__ = 'search_log_daily'
+    
+    bucket_start = db.Column(db.DateTime, primary_key=True)
+    zone = db.Column(db.String(100), primary_key=True)
+    searches = db.Column(db.Integer, default=0, nullable=False)
+    successes = db.Column(db.Integer, default=0, nullable=False)
+    unique_ips = db.Column(db.Integer, default=0, nullable=False)
+    
+    def to_dict(self):
+        return {
+            'bucket_start': self.bucket_start.isoformat(),
+            'zone': self.zone,
+            'searches': self.searches,
+            'successes': self.successes,
+            'unique_ips': self.unique_ips
+        }
+
+
+class RollupWatermark(db.Model):
+    __tablename__ = 'rollup_watermarks'
+    
+    # Everything before rolled_up_to has been aggregated into the named rollup
+    name = db.Column(db.String(100), primary_key=True)
+    rolled_up_to = db.Column(db.DateTime, nullable=False)
+
+
+class SearchFailureDaily(db.Model):
+    __tablename__ = 'search_failures_daily'
+    
+    # Failed searches per member number and day, kept up to date by the search log writer
+    day = db.Column(db.DateTime, primary_key=True)
+    member_number = db.Column(db.String(50), primary_key=True)
+    failures = db.Column(db.Integer, default=0, nullable=False)
+
+
+class SearchIpDaily(db.Model):
+    __tablename__ = 'search_ips_daily'
+    
+    day = db.Column(db.DateTime, primary_key=True)
+    ip_address = db.Column(db.String(45), primary_key=True)  # '' when unknown
+    searches = db.Column(db.Integer, default=0, nullable=False)
+    failures = db.Column(db.Integer, default=0, nullable=False)
+
+
+class EmailOutbox(db.Model):
+    __tablename__ = 'email_outbox'
+    __table_args__ = (
+        db.Index('ix_email_outbox_status_next_attempt_at', 'status', 'next_attempt_at'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)  # e.g. 'correction_submitted'
+    recipients = db.Column(db.Text, nullable=False)  # comma-separated
+    subject = db.Column(db.String(255), nullable=False)
+    body = db.Column(db.Text, nullable=False)
+    reference_id = db.Column(db.Integer)  # e.g. the correction request id, for digests
+    attachment_name = db.Column(db.String(255))
+    attachment = db.Column(db.LargeBinary)
+    # pending, sending, sent, failed; held until folded into a digest, then digested
+    status = db.Column(db.String(20), default='pending', nullable=False)
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    # When the message is next due; while 'sending' it is when the claim expires
+    next_attempt_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime)
+    
+    def __repr__(self):
+        return f'<EmailOutbox {self.kind} {self.id} - {self.status}>'
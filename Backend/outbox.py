@@ -0,0 +1,256 @@
+"""
+Transactional email outbox.
+
+Request handlers call enqueue() before committing, so a notification is
+stored exactly when the change it describes is, and the request never
+waits on SMTP. OutboxSender drains due messages from a background task
+over one SMTP connection per batch and retries failures with exponential
+backoff.
+
+Kinds registered with OutboxSender.add_digest can be enqueued with
+hold=True: held messages are folded into one digest message per recipient
+list once the oldest has waited MAIL_DIGEST_SECONDS.
+
+For local testing point MAIL_SERVER/MAIL_PORT at a stand-in such as
+`python -m aiosmtpd -n -l localhost:8025` with MAIL_USE_TLS=False and
+MAIL_ENABLED=True.
+"""
+import mimetypes
+import smtplib
+import threading
+from datetime import datetime, timedelta
+
+from flask_mail import Message
+from sqlalchemy import delete, update
+
+from models import db, EmailOutbox
+
+# A claimed message that is still 'sending' after this long is picked up again
+CLAIM_SECONDS = 300
+MAX_RETRY_SECONDS = 3600
+
+
+def enqueue(recipients, subject, body, kind='notification', reference_id=None, hold=False, attachment=None):
+    """
+    Add a message to the outbox in the caller's transaction. Does not commit.
+    hold=True keeps it for the kind's digest; attachment is (filename, bytes).
+    """
+    message = EmailOutbox(
+        kind=kind,
+        recipients=','.join(recipients),
+        subject=subject,
+        body=body,
+        reference_id=reference_id,
+        status='held' if hold else 'pending',
+        next_attempt_at=datetime.utcnow()
+    )
+    if attachment is not None:
+        message.attachment_name, message.attachment = attachment
+    db.session.add(message)
+    return message
+
+
+class OutboxSender:
+    """Drains email_outbox; call drain() periodically (see tasks.PeriodicTask)"""
+
+    def __init__(self, app=None):
+        self.app = None
+        self._lock = threading.Lock()
+        self.sent = 0
+        self.retried = 0
+        self.failed = 0
+        self.connections = 0
+        self.digests = 0
+        self.digested = 0
+        self.last_error = None
+        self._digest_builders = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.batch_size = app.config['MAIL_OUTBOX_BATCH_SIZE']
+        self.max_attempts = app.config['MAIL_MAX_ATTEMPTS']
+        self.retry_base = app.config['MAIL_RETRY_BASE_SECONDS']
+        self.retention_days = app.config['MAIL_OUTBOX_RETENTION_DAYS']
+        self.digest_seconds = app.config['MAIL_DIGEST_SECONDS']
+        self.digest_max_items = app.config['MAIL_DIGEST_MAX_ITEMS']
+        app.extensions['outbox_sender'] = self
+
+    def add_digest(self, kind, build):
+        """
+        Fold held messages of `kind` into digests. build(reference_ids) returns
+        (subject, body, attachment or None), or None to send nothing.
+        """
+        self._digest_builders[kind] = build
+
+    def _collect_digests(self, now):
+        """Replace held messages whose window has passed with one digest per recipient list"""
+        for kind, build in self._digest_builders.items():
+            while True:
+                held = EmailOutbox.query.filter_by(status='held', kind=kind) \
+                    .order_by(EmailOutbox.id).limit(self.digest_max_items).all()
+                if not held or held[0].created_at > now - timedelta(seconds=self.digest_seconds):
+                    break
+
+                groups = {}
+                for message in held:
+                    groups.setdefault(message.recipients, []).append(message.reference_id)
+                ids = [message.id for message in held]
+                result = db.session.execute(
+                    update(EmailOutbox)
+                    .where(EmailOutbox.id.in_(ids), EmailOutbox.status == 'held')
+                    .values(status='digested', sent_at=now)
+                    .execution_options(synchronize_session=False)
+                )
+                if result.rowcount != len(ids):
+                    # Another worker got some of them first
+                    db.session.rollback()
+                    break
+
+                for recipients, reference_ids in groups.items():
+                    digest = build([ref for ref in reference_ids if ref is not None])
+                    if digest is not None:
+                        subject, body, attachment = digest
+                        enqueue(recipients.split(','), subject, body, kind=f'{kind}_digest', attachment=attachment)
+                        with self._lock:
+                            self.digests += 1
+                db.session.commit()
+                with self._lock:
+                    self.digested += len(ids)
+                print(f"📧 Folded {len(ids)} {kind} messages into {len(groups)} digest(s)")
+
+                if len(held) < self.digest_max_items:
+                    break
+
+    def _connect(self):
+        config = self.app.config
+        smtp_class = smtplib.SMTP_SSL if config.get('MAIL_USE_SSL') else smtplib.SMTP
+        host = smtp_class(config['MAIL_SERVER'], config['MAIL_PORT'], timeout=config['MAIL_TIMEOUT'])
+        if config['MAIL_USE_TLS']:
+            host.starttls()
+        if config['MAIL_USERNAME'] and config['MAIL_PASSWORD']:
+            host.login(config['MAIL_USERNAME'], config['MAIL_PASSWORD'])
+        with self._lock:
+            self.connections += 1
+        return host
+
+    def _claim(self, now):
+        """Mark up to batch_size due messages as 'sending' and return the ones this process got"""
+        due = EmailOutbox.query.filter(
+            EmailOutbox.status.in_(('pending', 'sending')),
+            EmailOutbox.next_attempt_at <= now
+        ).order_by(EmailOutbox.next_attempt_at, EmailOutbox.id).limit(self.batch_size).all()
+
+        claimed = []
+        for message in due:
+            result = db.session.execute(
+                update(EmailOutbox)
+                .where(EmailOutbox.id == message.id, EmailOutbox.status == message.status,
+                       EmailOutbox.next_attempt_at == message.next_attempt_at)
+                .values(status='sending', next_attempt_at=now + timedelta(seconds=CLAIM_SECONDS))
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 1:
+                claimed.append(message.id)
+        db.session.commit()
+        return EmailOutbox.query.filter(EmailOutbox.id.in_(claimed)).order_by(EmailOutbox.id).all() if claimed else []
+
+    def _retry(self, message, error, now):
+        message.attempts += 1
+        message.last_error = str(error)[:1000]
+        if message.attempts >= self.max_attempts:
+            message.status = 'failed'
+            with self._lock:
+                self.failed += 1
+        else:
+            delay = min(self.retry_base * 2 ** (message.attempts - 1), MAX_RETRY_SECONDS)
+            message.status = 'pending'
+            message.next_attempt_at = now + timedelta(seconds=delay)
+            with self._lock:
+                self.retried += 1
+        with self._lock:
+            self.last_error = message.last_error
+
+    @staticmethod
+    def _connection_lost(error):
+        # SMTPException subclasses OSError; only a disconnect or a socket-level error ends the batch
+        if isinstance(error, smtplib.SMTPServerDisconnected):
+            return True
+        return isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException)
+
+    def drain(self):
+        """Send every due message, one SMTP connection per batch. Returns the number sent."""
+        sent = 0
+        if self._digest_builders:
+            self._collect_digests(datetime.utcnow())
+
+        while True:
+            batch = self._claim(datetime.utcnow())
+            if not batch:
+                break
+
+            try:
+                host = self._connect()
+            except Exception as e:
+                now = datetime.utcnow()
+                for message in batch:
+                    self._retry(message, e, now)
+                db.session.commit()
+                print(f"⚠️ SMTP connection failed: {str(e)}")
+                break
+
+            try:
+                for index, message in enumerate(batch):
+                    try:
+                        email = Message(subject=message.subject, recipients=message.recipients.split(','),
+                                        body=message.body)
+                        if message.attachment is not None:
+                            content_type = mimetypes.guess_type(message.attachment_name)[0] or 'application/octet-stream'
+                            email.attach(message.attachment_name, content_type, message.attachment)
+                        host.sendmail(email.sender, list(email.send_to), email.as_bytes())
+                    except Exception as e:
+                        self._retry(message, e, datetime.utcnow())
+                        if self._connection_lost(e):
+                            # Hand the rest of the batch back untouched for the next run
+                            for rest in batch[index + 1:]:
+                                rest.status = 'pending'
+                                rest.next_attempt_at = datetime.utcnow()
+                            db.session.commit()
+                            return sent
+                    else:
+                        message.status = 'sent'
+                        message.sent_at = datetime.utcnow()
+                        sent += 1
+                        with self._lock:
+                            self.sent += 1
+                    # Commit per message so a crash never re-sends what already went out
+                    db.session.commit()
+            finally:
+                try:
+                    host.quit()
+                except Exception:
+                    pass
+
+            if len(batch) < self.batch_size:
+                break
+
+        if self.retention_days:
+            db.session.execute(delete(EmailOutbox).where(
+                EmailOutbox.status.in_(('sent', 'digested')),
+                EmailOutbox.sent_at < datetime.utcnow() - timedelta(days=self.retention_days)
+            ))
+            db.session.commit()
+        return sent
+
+    def stats(self):
+        with self._lock:
+            return {
+                'sent': self.sent,
+                'retried': self.retried,
+                'failed': self.failed,
+                'connections': self.connections,
+                'digests': self.digests,
+                'digested': self.digested,
+                'last_error': self.last_error
+            }
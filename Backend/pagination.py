@@ -0,0 +1,91 @@
+"""
+Keyset (cursor) pagination for the admin list endpoints
+"""
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import tuple_
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(values, direction='next'):
+    """Opaque, URL-safe token for the sort key of a boundary row"""
+    payload = {
+        'k': [value.isoformat() if isinstance(value, datetime) else value for value in values],
+        'd': direction
+    }
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token, columns):
+    """Return (values, direction) for a token produced by encode_cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        payload = json.loads(raw)
+        values, direction = payload['k'], payload['d']
+    except (ValueError, TypeError, KeyError):
+        raise InvalidCursor('Invalid cursor')
+
+    if direction not in ('next', 'prev') or not isinstance(values, list) or len(values) != len(columns):
+        raise InvalidCursor('Invalid cursor')
+
+    decoded = []
+    for column, value in zip(columns, values):
+        if value is not None and column.type.python_type is datetime:
+            try:
+                value = datetime.fromisoformat(value)
+            except (ValueError, TypeError):
+                raise InvalidCursor('Invalid cursor')
+        decoded.append(value)
+    return decoded, direction
+
+
+class KeysetPage:
+    def __init__(self, items, next_cursor, prev_cursor):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+
+def keyset_paginate(query, columns, per_page, cursor=None, descending=False):
+    """
+    Return one KeysetPage of `query` ordered by `columns` (the last one must be
+    unique, e.g. the primary key). Rows are located with a row-value comparison
+    on an index over the same columns, so every page costs the same as the
+    first one regardless of how deep it is.
+    """
+    direction = 'next'
+    if cursor:
+        values, direction = decode_cursor(cursor, columns)
+        # Walking backwards flips both the comparison and the sort order
+        after = descending if direction == 'prev' else not descending
+        key = tuple_(*columns)
+        query = query.filter(key > tuple_(*values) if after else key < tuple_(*values))
+
+    reverse = (direction == 'prev') != descending
+    query = query.order_by(*[column.desc() if reverse else column.asc() for column in columns])
+    rows = query.limit(per_page + 1).all()
+
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if direction == 'prev':
+        rows.reverse()
+
+    def key_of(row):
+        return [getattr(row, column.key) for column in columns]
+
+    next_cursor = prev_cursor = None
+    if rows:
+        if direction == 'next':
+            next_cursor = encode_cursor(key_of(rows[-1]), 'next') if has_more else None
+            prev_cursor = encode_cursor(key_of(rows[0]), 'prev') if cursor else None
+        else:
+            next_cursor = encode_cursor(key_of(rows[-1]), 'next')
+            prev_cursor = encode_cursor(key_of(rows[0]), 'prev') if has_more else None
+
+    return KeysetPage(rows, next_cursor, prev_cursor)
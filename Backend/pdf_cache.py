@@ -0,0 +1,121 @@
+"""
+On-disk cache of rendered correction PDFs
+"""
+import hashlib
+import os
+import tempfile
+import threading
+
+# Bump when the PDF layout changes so old renders are not served
+RENDER_VERSION = 1
+
+
+class PdfCache:
+    """
+    Content-addressed PDF files under `folder`. The key covers everything that
+    can change a correction's document (id, status, resolved_at), so an entry
+    never needs invalidating; it just stops being requested. The folder is
+    kept under max_bytes by evicting the least recently used files, using the
+    file mtime (refreshed on every hit) as the recency clock.
+    """
+
+    def __init__(self, folder, max_bytes):
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(folder, exist_ok=True)
+
+    @staticmethod
+    def key_for(correction):
+        resolved_at = correction.resolved_at.isoformat() if correction.resolved_at else ''
+        raw = f"{RENDER_VERSION}:{correction.id}:{correction.status}:{resolved_at}"
+        return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+    def _path(self, key):
+        return os.path.join(self.folder, f"{key}.pdf")
+
+    def get(self, key):
+        """Path of the cached file, or None"""
+        path = self._path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return path
+
+    def put(self, key, render):
+        """Call render(file) to produce the PDF, store it atomically and return its path"""
+        path = self._path(key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.folder, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                render(f)
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += size
+            if self._size > self.max_bytes:
+                self._evict(keep=path)
+        return path
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.folder):
+            if not name.endswith('.pdf'):
+                continue
+            try:
+                st = os.stat(os.path.join(self.folder, name))
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, name))
+        return entries
+
+    def _scan_size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self, keep):
+        # Rescan: other workers share the folder, so the running total is only an estimate
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in entries:
+            if total <= self.max_bytes:
+                break
+            path = os.path.join(self.folder, name)
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            self.evictions += 1
+        self._size = total
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size_bytes': self._size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+                'evictions': self.evictions
+            }
@@ -0,0 +1,345 @@
+"""
+PDF rendering for correction requests.
+
+The all-corrections report is rendered with bounded memory: rows are read in keyset batches and turned into page-sized tables only as
+reportlab asks for more flowables, so the number of rows and table cells
+held in memory does not grow with the size of the report.
+"""
+import time
+from datetime import datetime
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter, A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+
+from models import db, CorrectionRequest
+from pagination import keyset_paginate
+
+FETCH_BATCH_SIZE = 500
+# Roughly one A4 page of summary rows, so each table splits at most once
+ROWS_PER_TABLE = 30
+PROGRESS_EVERY = 2000
+
+SUMMARY_HEADER = ['ID', 'Member #', 'Zone Change', 'Status', 'Submitted']
+SUMMARY_COL_WIDTHS = [0.5*inch, 1*inch, 2.5*inch, 0.8*inch, 1*inch]
+SUMMARY_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#166534')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('TOPPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+    ('FONTSIZE', (0, 1), (-1, -1), 8),
+    ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
+    ('TOPPADDING', (0, 1), (-1, -1), 8),
+])
+
+
+class LazyFlowables(list):
+    """
+    A list that refills itself from an iterator as SimpleDocTemplate.build
+    consumes it from the front. build() only ever looks at the first few
+    entries, so keeping `lookahead` items buffered is enough.
+    """
+
+    def __init__(self, iterator, lookahead=2):
+        super().__init__()
+        self._iterator = iterator
+        self._lookahead = lookahead
+
+    def _fill(self):
+        while self._iterator is not None and super().__len__() < self._lookahead:
+            try:
+                self.append(next(self._iterator))
+            except StopIteration:
+                self._iterator = None
+
+    def __len__(self):
+        self._fill()
+        return super().__len__()
+
+    def __getitem__(self, index):
+        self._fill()
+        return super().__getitem__(index)
+
+
+class StageTimer:
+    """Accumulates wall time per named stage for the log line at the end"""
+
+    def __init__(self):
+        self.stages = {}
+
+    def add(self, stage, started):
+        self.stages[stage] = self.stages.get(stage, 0.0) + time.perf_counter() - started
+
+    def summary(self):
+        return ', '.join(f"{stage} {seconds:.2f}s" for stage, seconds in self.stages.items())
+
+
+def iter_corrections(status, timer, batch_size=FETCH_BATCH_SIZE, ids=None):
+    """
+    Yield correction summary rows newest first, one keyset batch in memory at
+    a time. `ids` limits the rows to those correction requests.
+    """
+    # Plain column rows: nothing is held in the identity map or expired by progress commits
+    query = db.session.query(
+        CorrectionRequest.id,
+        CorrectionRequest.member_number,
+        CorrectionRequest.current_zone,
+        CorrectionRequest.correct_zone,
+        CorrectionRequest.status,
+        CorrectionRequest.submitted_at
+    )
+    if status != 'all':
+        query = query.filter(CorrectionRequest.status == status)
+    if ids is not None:
+        query = query.filter(CorrectionRequest.id.in_(ids))
+
+    columns = [CorrectionRequest.submitted_at, CorrectionRequest.id]
+    cursor = None
+    while True:
+        started = time.perf_counter()
+        page = keyset_paginate(query, columns, batch_size, cursor, descending=True)
+        timer.add('fetch', started)
+
+        # Each batch is its own short query, so job progress can be committed in between
+        yield from page.items
+        if page.next_cursor is None:
+            return
+        cursor = page.next_cursor
+
+
+def summary_row(c):
+    zone_change = f"{c.current_zone} → {c.correct_zone}"
+    if len(zone_change) > 35:
+        zone_change = zone_change[:32] + "..."
+
+    return [
+        str(c.id),
+        c.member_number,
+        zone_change,
+        c.status.upper(),
+        c.submitted_at.strftime('%Y-%m-%d')
+    ]
+
+
+def summary_tables(rows, on_progress=None):
+    """Group summary rows into page-sized Tables, each repeating the header"""
+    chunk = []
+    count = 0
+    for row in rows:
+        chunk.append(row)
+        count += 1
+        if len(chunk) == ROWS_PER_TABLE:
+            yield _summary_table(chunk)
+            chunk = []
+        if on_progress and count % PROGRESS_EVERY == 0:
+            on_progress(count)
+    if chunk:
+        yield _summary_table(chunk)
+    if on_progress:
+        on_progress(count)
+
+
+def _summary_table(rows):
+    table = Table([SUMMARY_HEADER] + rows, colWidths=SUMMARY_COL_WIDTHS, repeatRows=1)
+    table.setStyle(SUMMARY_TABLE_STYLE)
+    return table
+
+
+def build_corrections_report(output, status='all', total=None, on_progress=None, ids=None):
+    """
+    Render the all-corrections summary report to `output` (a filename or a
+    binary file object), or only the requests in `ids`. on_progress(rows_done)
+    is called every PROGRESS_EVERY rows. Returns the number of rows rendered.
+    """
+    timer = StageTimer()
+    started = time.perf_counter()
+    rendered = [0]
+
+    def track(count):
+        rendered[0] = count
+        if on_progress:
+            on_progress(count)
+
+    doc = SimpleDocTemplate(output, pagesize=A4, rightMargin=50, leftMargin=50,
+                            topMargin=50, bottomMargin=30)
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=20,
+        textColor=colors.HexColor('#166534'),
+        spaceAfter=20,
+        alignment=1
+    )
+
+    subtitle = f"Generated: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}"
+    if total is not None:
+        subtitle += f"<br/>Total Requests: {total}"
+
+    def flowables():
+        yield Paragraph("Member Correction Requests Report", title_style)
+        yield Paragraph(subtitle, ParagraphStyle('Subtitle', parent=styles['Normal'], fontSize=10,
+                                                 alignment=1, textColor=colors.grey))
+        yield Spacer(1, 0.3*inch)
+        rows = (summary_row(c) for c in iter_corrections(status, timer, ids=ids))
+        yield from summary_tables(rows, track)
+
+    doc.build(LazyFlowables(flowables()))
+
+    timer.stages['render'] = time.perf_counter() - started - timer.stages.get('fetch', 0.0)
+    timer.stages['total'] = time.perf_counter() - started
+    print(f"📄 Corrections report: {rendered[0]} rows, {doc.page} pages ({timer.summary()})")
+    return rendered[0]
+
+
+def build_correction_pdf(correction, output):
+    """Render the single correction request document to `output` (a filename or a binary file object)"""
+    doc = SimpleDocTemplate(output, pagesize=letter, rightMargin=72, leftMargin=72,
+                            topMargin=72, bottomMargin=18)
+
+    # Container for PDF elements
+    elements = []
+    styles = getSampleStyleSheet()
+
+    # Custom styles
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#166534'),
+        spaceAfter=30,
+        alignment=1  # Center
+    )
+
+    heading_style = ParagraphStyle(
+        'CustomHeading',
+        parent=styles['Heading2'],
+        fontSize=14,
+        textColor=colors.HexColor('#166534'),
+        spaceAfter=12,
+        spaceBefore=12
+    )
+
+    # Title
+    title = Paragraph("Member Correction Request", title_style)
+    elements.append(title)
+    elements.append(Spacer(1, 0.2*inch))
+
+    # Request Information
+    elements.append(Paragraph("Request Information", heading_style))
+
+    request_data = [
+        ['Request ID:', str(correction.id)],
+        ['Status:', correction.status.upper()],
+        ['Submitted:', correction.submitted_at.strftime('%B %d, %Y at %I:%M %p')],
+    ]
+
+    if correction.resolved_at:
+        request_data.append(['Resolved:', correction.resolved_at.strftime('%B %d, %Y at %I:%M %p')])
+
+    request_table = Table(request_data, colWidths=[2*inch, 4*inch])
+    request_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#F3F4F6')),
+        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+        ('TOPPADDING', (0, 0), (-1, -1), 12),
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#E5E7EB'))
+    ]))
+    elements.append(request_table)
+    elements.append(Spacer(1, 0.3*inch))
+
+    # Member Identification
+    elements.append(Paragraph("Member Identification", heading_style))
+
+    id_data = [
+        ['Member Number:', correction.member_number],
+        ['ID Number:', correction.id_number],
+    ]
+
+    id_table = Table(id_data, colWidths=[2*inch, 4*inch])
+    id_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#F3F4F6')),
+        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+        ('TOPPADDING', (0, 0), (-1, -1), 12),
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#E5E7EB'))
+    ]))
+    elements.append(id_table)
+    elements.append(Spacer(1, 0.3*inch))
+
+    # Comparison Table
+    elements.append(Paragraph("Requested Changes", heading_style))
+
+    comparison_data = [
+        ['Field', 'Current Information', 'Requested Correction'],
+        ['Name', correction.current_name, correction.correct_name],
+        ['Working Station', correction.current_zone, correction.correct_zone],
+        ['Status', correction.current_status, '-']
+    ]
+
+    comparison_table = Table(comparison_data, colWidths=[1.5*inch, 2.25*inch, 2.25*inch])
+    comparison_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#166534')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 11),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('TOPPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('FONTSIZE', (0, 1), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 10),
+        ('TOPPADDING', (0, 1), (-1, -1), 10),
+    ]))
+    elements.append(comparison_table)
+    elements.append(Spacer(1, 0.3*inch))
+
+    # Contact Information
+    elements.append(Paragraph("Contact Information", heading_style))
+
+    contact_data = [
+        ['Email:', correction.email or 'Not provided'],
+        ['Phone:', correction.phone or 'Not provided'],
+    ]
+
+    contact_table = Table(contact_data, colWidths=[2*inch, 4*inch])
+    contact_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#F3F4F6')),
+        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+        ('TOPPADDING', (0, 0), (-1, -1), 12),
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#E5E7EB'))
+    ]))
+    elements.append(contact_table)
+
+    # Additional Notes
+    if correction.additional_notes:
+        elements.append(Spacer(1, 0.3*inch))
+        elements.append(Paragraph("Additional Notes", heading_style))
+        notes_style = ParagraphStyle(
+            'Notes',
+            parent=styles['BodyText'],
+            fontSize=10,
+            leading=14
+        )
+        elements.append(Paragraph(correction.additional_notes, notes_style))
+
+
+    doc.build(elements)
@@ -0,0 +1,197 @@
+"""
+Token-bucket rate limiting and single-flight request coalescing
+"""
+import threading
+import time
+
+
+class MemoryBucketBackend:
+    """Buckets kept in this process; idle buckets are pruned once there are max_keys of them"""
+
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, rate, now):
+        with self._lock:
+            tokens, last = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - last) * rate)
+
+            if tokens >= 1:
+                allowed, retry_after = True, 0.0
+                tokens -= 1
+            else:
+                allowed, retry_after = False, (1 - tokens) / rate
+
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._prune(capacity, rate, now)
+            return allowed, retry_after
+
+    def _prune(self, capacity, rate, now):
+        # A bucket that has refilled completely behaves exactly like a missing one
+        full = [key for key, (tokens, last) in self._buckets.items()
+                if tokens + (now - last) * rate >= capacity]
+        for key in full:
+            del self._buckets[key]
+
+        # Still too many active keys (e.g. a wide scan): forget the oldest ones
+        excess = len(self._buckets) - int(self.max_keys * 0.9)
+        if excess > 0:
+            for key in list(self._buckets)[:excess]:
+                del self._buckets[key]
+
+    def size(self):
+        with self._lock:
+            return len(self._buckets)
+
+
+class RedisBucketBackend:
+    """Buckets shared by all workers through Redis (or anything speaking its protocol)"""
+
+    SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(bucket[1]) or capacity
+    local ts = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + math.max(now - ts, 0) * rate)
+    local allowed = 0
+    local retry_after = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+        allowed = 1
+    else
+        retry_after = (1 - tokens) / rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+    return {allowed, tostring(retry_after)}
+    """
+
+    def __init__(self, client, prefix='ratelimit:'):
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(self.SCRIPT)
+
+    @classmethod
+    def from_url(cls, url, prefix='ratelimit:'):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError('RATE_LIMIT_BACKEND=redis requires the redis package')
+        return cls(redis.Redis.from_url(url), prefix)
+
+    def take(self, key, capacity, rate, now):
+        allowed, retry_after = self._script(keys=[self.prefix + key], args=[capacity, rate, now])
+        return bool(allowed), float(retry_after)
+
+    def size(self):
+        return None
+
+
+class RateLimiter:
+    """
+    Allows `burst` requests at once per key, refilled at per_minute / 60
+    tokens per second. per_minute <= 0 disables the limiter.
+    """
+
+    def __init__(self, per_minute, burst, backend=None):
+        self.rate = per_minute / 60.0
+        self.capacity = max(burst, 1)
+        self.backend = backend or MemoryBucketBackend()
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.limited = 0
+        self.errors = 0
+
+    def take(self, key):
+        """Return (allowed, retry_after_seconds) for one request from key"""
+        if self.rate <= 0:
+            return True, 0.0
+
+        try:
+            allowed, retry_after = self.backend.take(key, self.capacity, self.rate, time.time())
+        except Exception as e:
+            # Fail open: a broken limiter backend must not take search down
+            with self._lock:
+                self.errors += 1
+            print(f"⚠️ Rate limiter error: {str(e)}")
+            return True, 0.0
+
+        with self._lock:
+            if allowed:
+                self.allowed += 1
+            else:
+                self.limited += 1
+        return allowed, retry_after
+
+    def stats(self):
+        with self._lock:
+            return {
+                'per_minute': round(self.rate * 60, 2),
+                'burst': self.capacity,
+                'backend': type(self.backend).__name__,
+                'tracked_keys': self.backend.size(),
+                'allowed': self.allowed,
+                'limited': self.limited,
+                'errors': self.errors
+            }
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls with the same key into one: the first caller
+    runs fn(), the others wait for its result instead of repeating the work.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.shared = 0
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.shared += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self):
+        with self._lock:
+            return {
+                'in_flight': len(self._calls),
+                'executed': self.executed,
+                'shared': self.shared
+            }
@@ -0,0 +1,187 @@
+"""
+Read replica routing.
+
+Routes marked @read_only (routes/common.py) run their SELECTs on one of the
+DATABASE_REPLICA_URLS, taken round-robin from the replicas that passed the
+last health check; with none configured or none healthy they read from the
+primary. Flushes, INSERT/UPDATE/DELETE, SELECT ... FOR UPDATE and raw SQL
+always go to the primary; once a request has written (a flush, DML or a
+locking read), the rest of its reads follow.
+
+Read-your-writes: after a signed-in user's request writes, their session
+reads from the primary for REPLICA_STICKY_SECONDS so an admin sees their own
+edit even while the replicas catch up.
+
+Locally, two SQLite files are enough (copy the database and point
+DATABASE_REPLICA_URLS at the copy); replica connections are opened
+read-only, so a write routed there by mistake fails loudly.
+"""
+import itertools
+import time
+
+from flask import g, session, has_app_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event, exc, text
+from sqlalchemy.engine import make_url
+
+from db_engine import engine_options, configure_engine
+
+# Seconds the replica is behind the primary; 0 on a caught-up standby and on a server that is not one
+POSTGRES_LAG_SQL = """
+SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+            ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END
+"""
+
+
+def is_plain_select(clause):
+    return getattr(clause, 'is_select', False) and getattr(clause, '_for_update_arg', None) is None
+
+
+def is_write(session, clause):
+    """A flush, INSERT/UPDATE/DELETE or SELECT ... FOR UPDATE; bare get_bind() calls and raw SQL are not"""
+    if session._flushing or getattr(clause, 'is_dml', False):
+        return True
+    return getattr(clause, 'is_select', False) and getattr(clause, '_for_update_arg', None) is not None
+
+
+class RoutingSession(Session):
+    """Flask-SQLAlchemy session that sends the reads of @read_only requests to the chosen replica"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_app_context():
+            if is_plain_select(clause):
+                replica = g.get('db_replica')
+                if replica is not None:
+                    return replica
+            elif is_write(self, clause):
+                # Keep the rest of this request on the primary
+                g.db_replica = None
+                g.db_wrote = True
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def replica_binds(config):
+    """SQLALCHEMY_BINDS entries (replica_0, replica_1, ...) for DATABASE_REPLICA_URLS"""
+    binds = {}
+    for index, url in enumerate(config['DATABASE_REPLICA_URLS']):
+        options = engine_options(config, url)
+        if make_url(url).get_backend_name() == 'postgresql':
+            options['connect_args'] = {'options': '-c default_transaction_read_only=on'}
+        binds[f'replica_{index}'] = dict(options, url=url)
+    return binds
+
+
+class Replica:
+    def __init__(self, name, engine):
+        self.name = name
+        self.engine = engine
+        self.healthy = True
+        self.reads = 0
+        self.last_error = None
+
+    def stats(self):
+        return {
+            'name': self.name,
+            'url': self.engine.url.render_as_string(hide_password=True),
+            'healthy': self.healthy,
+            'reads': self.reads,
+            'last_error': self.last_error
+        }
+
+
+class ReplicaRouter:
+    """
+    Picks the replica for each @read_only request and tracks replica health.
+    check() runs every REPLICA_HEALTH_SECONDS in each worker; a replica that
+    raises a connection error between checks is taken out straight away.
+    Replica.reads counts statements actually run on the replica.
+    """
+
+    def __init__(self, app=None):
+        self.replicas = []
+        self.sticky_seconds = 0
+        self.max_lag = 0
+        self.primary_fallbacks = 0
+        self._healthy = []
+        self._turn = itertools.count()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        config = app.config
+        self.sticky_seconds = config['REPLICA_STICKY_SECONDS']
+        self.max_lag = config['REPLICA_MAX_LAG_SECONDS']
+        with app.app_context():
+            engines = app.extensions['sqlalchemy'].engines
+            for name in replica_binds(config):
+                replica = Replica(name, engines[name])
+                configure_engine(replica.engine, config, read_only=True)
+                event.listen(replica.engine, 'handle_error', self._error_handler(replica))
+                event.listen(replica.engine, 'before_cursor_execute', self._read_counter(replica))
+                self.replicas.append(replica)
+        self._healthy = list(self.replicas)
+        app.after_request(self.remember_writes)
+        app.extensions['replica_router'] = self
+
+    def _error_handler(self, replica):
+        def handle_error(context):
+            if context.is_disconnect or isinstance(context.sqlalchemy_exception, exc.OperationalError):
+                self._set_health(replica, False, str(context.original_exception))
+        return handle_error
+
+    @staticmethod
+    def _read_counter(replica):
+        def count_read(conn, cursor, statement, parameters, context, executemany):
+            if not conn.get_execution_options().get('health_check'):
+                replica.reads += 1
+        return count_read
+
+    def _set_health(self, replica, healthy, error=None):
+        if healthy != replica.healthy:
+            if healthy:
+                print(f"✅ Read replica {replica.name} is back")
+            else:
+                print(f"⚠️ Read replica {replica.name} taken out of rotation: {error}")
+        replica.healthy = healthy
+        if error:
+            replica.last_error = error
+        self._healthy = [r for r in self.replicas if r.healthy]
+
+    def route_reads(self):
+        """Send this request's reads to the next healthy replica unless the session is pinned to the primary"""
+        if not self.replicas:
+            return
+        healthy = self._healthy
+        if not healthy or session.get('read_primary_until', 0) > time.time():
+            self.primary_fallbacks += 1
+            return
+        g.db_replica = healthy[next(self._turn) % len(healthy)].engine
+
+    def remember_writes(self, response):
+        """Pin a signed-in user's reads to the primary for a while after they write"""
+        if self.replicas and self.sticky_seconds and g.get('db_wrote') and 'user_id' in session:
+            session['read_primary_until'] = time.time() + self.sticky_seconds
+        return response
+
+    def check(self):
+        """Each replica must answer and, on PostgreSQL, be no more than REPLICA_MAX_LAG_SECONDS behind"""
+        for replica in self.replicas:
+            try:
+                with replica.engine.connect().execution_options(health_check=True) as conn:
+                    # A real table, so an empty or unmigrated database does not pass
+                    conn.execute(text('SELECT version_num FROM alembic_version')).scalar()
+                    lag = 0
+                    if replica.engine.dialect.name == 'postgresql' and self.max_lag:
+                        lag = conn.execute(text(POSTGRES_LAG_SQL)).scalar() or 0
+                if lag > self.max_lag > 0:
+                    self._set_health(replica, False, f'{lag:.0f}s behind the primary')
+                else:
+                    self._set_health(replica, True)
+            except Exception as e:
+                self._set_health(replica, False, str(getattr(e, 'orig', None) or e))
+
+    def stats(self):
+        return {
+            'replicas': [replica.stats() for replica in self.replicas],
+            'primary_fallbacks': self.primary_fallbacks
+        }
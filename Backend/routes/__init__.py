@@ -0,0 +1,10 @@
+"""
+Route blueprints. URLs are unchanged from the single-module app; only the
+endpoint names gain a blueprint prefix (e.g. 'public.search_member').
+"""
+from routes import auth, corrections, exports, members, public, search_logs, system, verifications
+
+
+def register_blueprints(app):
+    for module in (auth, members, verifications, corrections, search_logs, exports, public, system):
+        app.register_blueprint(module.bp)
@@ -0,0 +1,184 @@
+"""Login, session and admin user management routes"""
+from datetime import datetime
+
+from flask import Blueprint, request, jsonify, session
+
+from extensions import permission_cache
+from models import db, User
+from routes.common import login_required, permission_required, read_only
+
+bp = Blueprint('auth', __name__)
+
+# ============= AUTHENTICATION ROUTES =============
+
+@bp.route('/auth/login', methods=['POST'])
+def login():
+    data = request.json
+    username = data.get('username')
+    password = data.get('password')
+    
+    if not username or not password:
+        return jsonify({'error': 'Username and password required'}), 400
+    
+    user = User.query.filter_by(username=username).first()
+    
+    if user and user.check_password(password) and user.is_active:
+        session.permanent = True
+        session['user_id'] = user.id
+        session['username'] = user.username
+        session['role'] = user.role
+        
+        user.last_login = datetime.utcnow()
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': 'Login successful',
+            'user': user.to_dict()
+        })
+    
+    return jsonify({'error': 'Invalid credentials'}), 401
+
+@bp.route('/auth/logout', methods=['POST'])
+def logout():
+    session.clear()
+    return jsonify({'success': True, 'message': 'Logged out successfully'})
+
+@bp.route('/auth/me', methods=['GET'])
+@login_required
+def get_current_user():
+    user = User.query.get(session['user_id'])
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    return jsonify(user.to_dict())
+
+@bp.route('/auth/change-password', methods=['POST'])
+@login_required
+def change_password():
+    data = request.json
+    current_password = data.get('current_password')
+    new_password = data.get('new_password')
+    
+    if not current_password or not new_password:
+        return jsonify({'error': 'Current and new password required'}), 400
+    
+    user = db.session.get(User, session['user_id'])
+    
+    if not user.check_password(current_password):
+        return jsonify({'error': 'Current password is incorrect'}), 401
+    
+    user.set_password(new_password)
+    db.session.commit()
+    
+    return jsonify({'success': True, 'message': 'Password changed successfully'})
+
+# ============= USER MANAGEMENT ROUTES (Super Admin Only) =============
+
+@bp.route('/admin/users', methods=['GET'])
+@permission_required('manage_users')
+@read_only
+def get_all_users():
+    users = User.query.order_by(User.created_at.desc()).all()
+    return jsonify([user.to_dict() for user in users])
+
+@bp.route('/admin/users', methods=['POST'])
+@permission_required('manage_users')
+def create_user():
+    data = request.json
+    
+    required_fields = ['username', 'email', 'password', 'role']
+    for field in required_fields:
+        if not data.get(field):
+            return jsonify({'error': f'{field} is required'}), 400
+    
+    if User.query.filter_by(username=data['username']).first():
+        return jsonify({'error': 'Username already exists'}), 400
+    
+    if User.query.filter_by(email=data['email']).first():
+        return jsonify({'error': 'Email already exists'}), 400
+    
+    valid_roles = ['super_admin', 'member_manager', 'verification_viewer', 'correction_viewer']
+    if data['role'] not in valid_roles:
+        return jsonify({'error': f'Invalid role. Must be one of: {", ".join(valid_roles)}'}), 400
+    
+    new_user = User(
+        username=data['username'].strip(),
+        email=data['email'].strip(),
+        role=data['role'],
+        created_by=session['user_id']
+    )
+    new_user.set_password(data['password'])
+    
+    try:
+        db.session.add(new_user)
+        db.session.commit()
+        return jsonify(new_user.to_dict()), 201
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/admin/users/<int:user_id>', methods=['PUT'])
+@permission_required('manage_users')
+def update_user(user_id):
+    user = User.query.get_or_404(user_id)
+    data = request.json
+    
+    if data.get('username'):
+        existing = User.query.filter_by(username=data['username']).first()
+        if existing and existing.id != user_id:
+            return jsonify({'error': 'Username already exists'}), 400
+        user.username = data['username'].strip()
+    
+    if data.get('email'):
+        existing = User.query.filter_by(email=data['email']).first()
+        if existing and existing.id != user_id:
+            return jsonify({'error': 'Email already exists'}), 400
+        user.email = data['email'].strip()
+    
+    if data.get('role'):
+        valid_roles = ['super_admin', 'member_manager', 'verification_viewer', 'correction_viewer']
+        if data['role'] not in valid_roles:
+            return jsonify({'error': f'Invalid role'}), 400
+        user.role = data['role']
+    
+    if 'is_active' in data:
+        user.is_active = data['is_active']
+    
+    if data.get('password'):
+        user.set_password(data['password'])
+    
+    try:
+        db.session.commit()
+        permission_cache.delete(user_id)
+        return jsonify(user.to_dict())
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/admin/users/<int:user_id>', methods=['DELETE'])
+@permission_required('manage_users')
+def delete_user(user_id):
+    if user_id == session['user_id']:
+        return jsonify({'error': 'Cannot delete your own account'}), 400
+    
+    user = User.query.get_or_404(user_id)
+    
+    try:
+        db.session.delete(user)
+        db.session.commit()
+        permission_cache.delete(user_id)
+        return jsonify({'message': 'User deleted successfully'})
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/admin/roles', methods=['GET'])
+@login_required
+def get_available_roles():
+    roles = [
+        {'value': 'super_admin', 'label': 'Super Admin', 'description': 'Full access to all features'},
+        {'value': 'member_manager', 'label': 'Member Manager', 'description': 'Manage members, view verifications and corrections'},
+        {'value': 'verification_viewer', 'label': 'Verification Viewer', 'description': 'View verification records only'},
+        {'value': 'correction_viewer', 'label': 'Correction Viewer', 'description': 'View and manage correction requests'}
+    ]
+    return jsonify(roles)
@@ -0,0 +1,182 @@
+"""
+Helpers shared by the blueprints: auth decorators, pagination and list filters.
+"""
+import os
+import time
+import uuid
+from functools import wraps
+
+from flask import current_app, request, jsonify, session
+
+from extensions import permission_cache, replica_router
+from models import db, User, Member, Verification, CorrectionRequest, SearchLog, ROLE_PERMISSIONS
+from pagination import keyset_paginate, InvalidCursor
+import search_index
+import zones
+
+ALLOWED_EXTENSIONS = {'xlsx', 'xls', 'csv'}
+
+def allowed_file(filename):
+    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+
+def login_required(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if 'user_id' not in session:
+            return jsonify({'error': 'Authentication required'}), 401
+        return f(*args, **kwargs)
+    return decorated_function
+
+def permission_required(permission):
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if 'user_id' not in session:
+                return jsonify({'error': 'Authentication required'}), 401
+            if permission not in get_permissions(session['user_id']):
+                return jsonify({'error': 'Permission denied'}), 403
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
+
+def read_only(f):
+    """Serve the route's reads from a read replica (see replicas.py); put it after the auth decorator"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        replica_router.route_reads()
+        return f(*args, **kwargs)
+    return decorated_function
+
+def get_permissions(user_id):
+    """Permission set for a user, cached so authorization skips the users table"""
+    permissions = permission_cache.get(user_id)
+    if permissions is None:
+        role = db.session.query(User.role).filter_by(id=user_id).scalar()
+        permissions = ROLE_PERMISSIONS.get(role, frozenset())
+        permission_cache.set(user_id, permissions)
+    return permissions
+
+def save_upload(file):
+    """Store an uploaded member file on disk so a background job can read it"""
+    extension = file.filename.rsplit('.', 1)[1].lower()
+    path = os.path.join(current_app.config['UPLOAD_FOLDER'], f"{uuid.uuid4().hex}.{extension}")
+    file.save(path)
+    return path
+
+def purge_job_outputs():
+    """Delete job output files older than JOB_OUTPUT_RETENTION_HOURS"""
+    folder = current_app.config['JOB_OUTPUT_FOLDER']
+    cutoff = time.time() - current_app.config['JOB_OUTPUT_RETENTION_HOURS'] * 3600
+    for name in os.listdir(folder):
+        path = os.path.join(folder, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            pass
+
+def paginated_response(key, query, columns, default_per_page, descending=False, total=None, ranking=None):
+    """
+    List endpoint response in one of two modes:
+      ?page=N         - classic OFFSET paging with total/pages, kept for existing clients
+      ?cursor=<token> - keyset paging over `columns`; omit the cursor for the first page
+    `total` is a precomputed count (e.g. from the stats counters). Without one,
+    cursor mode only counts when asked with ?include_total=true. `ranking`
+    (search relevance) orders page mode ahead of `columns`; cursors always
+    follow `columns` since they need a stable key.
+    """
+    per_page = min(max(request.args.get('per_page', default_per_page, type=int), 1), 100)
+    include_total = request.args.get('include_total', 'false').lower() == 'true'
+    
+    if 'page' in request.args:
+        page = max(request.args.get('page', 1, type=int), 1)
+        if total is None:
+            total = query.order_by(None).count()
+        order = list(ranking or []) + [column.desc() if descending else column.asc() for column in columns]
+        items = query.order_by(*order).offset((page - 1) * per_page).limit(per_page).all()
+        pages = (total + per_page - 1) // per_page
+        return jsonify({
+            key: [item.to_dict() for item in items],
+            'total': total,
+            'page': page,
+            'per_page': per_page,
+            'pages': pages,
+            'has_next': page < pages,
+            'has_prev': page > 1
+        }), 200
+    
+    try:
+        result = keyset_paginate(query, columns, per_page, request.args.get('cursor'), descending)
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
+    
+    if total is None and include_total:
+        total = query.order_by(None).count()
+    
+    return jsonify({
+        key: [item.to_dict() for item in result.items],
+        'total': total,
+        'per_page': per_page,
+        'next_cursor': result.next_cursor,
+        'prev_cursor': result.prev_cursor,
+        'has_next': result.next_cursor is not None,
+        'has_prev': result.prev_cursor is not None
+    }), 200
+
+# List filters shared by the paginated and export endpoints; each returns (query, ranking)
+
+def requested_zone_id():
+    """?zone_id=<id> or ?zone=<name>; None when not filtering, 0 (matches nothing) for an unknown name"""
+    zone_id = request.args.get('zone_id', type=int)
+    if zone_id is None and request.args.get('zone', '').strip():
+        zone_id = zones.find_zone_id(request.args['zone'].strip()) or 0
+    return zone_id
+
+def filtered_members():
+    search = request.args.get('search', '', type=str).strip()
+    zone_id = requested_zone_id()
+    
+    query = Member.query
+    if zone_id is not None:
+        query = query.filter(Member.zone_id == zone_id)
+    if search:
+        return search_index.apply_search(query, Member, search)
+    return query, None
+
+def filtered_verifications():
+    zone_id = requested_zone_id()
+    
+    query = Verification.query
+    if zone_id is not None:
+        query = query.filter(Verification.zone_id == zone_id)
+    return query, None
+
+def filtered_corrections():
+    status = request.args.get('status', 'all')
+    search = request.args.get('search', '', type=str).strip()
+    
+    query = CorrectionRequest.query
+    if status != 'all':
+        query = query.filter_by(status=status)
+    if search:
+        return search_index.apply_search(query, CorrectionRequest, search)
+    return query, None
+
+def filtered_search_logs(log=SearchLog):
+    """`log` is SearchLog or the entity from search_log_storage.search_log_entity()"""
+    success_filter = request.args.get('success', 'all')
+    
+    query = db.session.query(log)
+    if success_filter == 'successful':
+        query = query.filter(log.search_successful == True)
+    elif success_filter == 'failed':
+        query = query.filter(log.search_successful == False)
+    return query, None
+
+def get_export_format():
+    export_format = request.args.get('format', 'csv').lower()
+    return export_format if export_format in ('csv', 'xlsx') else None
+
+def get_client_ip():
+    # ProxyFix (see create_app) has already resolved X-Forwarded-For for TRUSTED_PROXY_COUNT proxies
+    return request.remote_addr
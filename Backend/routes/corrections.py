@@ -0,0 +1,129 @@
+"""Correction request routes and PDFs"""
+import os
+from datetime import datetime
+
+from flask import Blueprint, current_app, request, jsonify, session, send_file
+
+from extensions import pdf_cache, job_runner
+from models import db, CorrectionRequest
+from routes.common import (permission_required, read_only, paginated_response, filtered_corrections,
+                           purge_job_outputs)
+import stats
+
+bp = Blueprint('corrections', __name__)
+
+# ============= CORRECTION ROUTES =============
+
+@bp.route('/admin/corrections', methods=['GET'])
+@permission_required('view_corrections')
+@read_only
+def get_corrections():
+    status = request.args.get('status', 'all')
+    search = request.args.get('search', '', type=str).strip()
+    
+    try:
+        query, ranking = filtered_corrections()
+        total = None
+        if status == 'pending' and not search:
+            total = stats.read_stats()['pending_corrections']
+        
+        return paginated_response('corrections', query, [CorrectionRequest.submitted_at, CorrectionRequest.id],
+                                  20, descending=True, total=total, ranking=ranking)
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    
+@bp.route('/admin/corrections/<int:correction_id>/resolve', methods=['POST'])
+@permission_required('manage_corrections')
+def resolve_correction(correction_id):
+    try:
+        correction = CorrectionRequest.query.get_or_404(correction_id)
+        if correction.status == 'pending':
+            stats.bump(pending_corrections=-1)
+        correction.status = 'resolved'
+        correction.resolved_at = datetime.utcnow()
+        correction.resolved_by = session.get('user_id')
+        
+        db.session.commit()
+        
+        return jsonify({'success': True, 'message': 'Correction marked as resolved'}), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/admin/corrections/<int:correction_id>/download-pdf', methods=['GET'])
+@permission_required('view_corrections')
+def download_correction_pdf(correction_id):
+    """Download the PDF for a specific correction request, rendered once per status change"""
+    try:
+        correction = CorrectionRequest.query.get_or_404(correction_id)
+        key = pdf_cache.key_for(correction)
+        
+        if key in request.if_none_match:
+            return '', 304, {'ETag': f'"{key}"'}
+        
+        path = pdf_cache.get(key)
+        if path is None:
+            print(f"📄 Rendering PDF for correction {correction_id}")
+            import pdf_reports
+            path = pdf_cache.put(key, lambda output: pdf_reports.build_correction_pdf(correction, output))
+        
+        filename = f"correction_request_{correction.id}_{correction.member_number}.pdf"
+        
+        return send_file(
+            path,
+            mimetype='application/pdf',
+            as_attachment=True,
+            download_name=filename,
+            etag=key,
+            conditional=True,
+            max_age=0
+        )
+        
+    except Exception as e:
+        print(f"❌ PDF Generation Error: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/admin/corrections/download-all-pdf', methods=['GET'])
+@permission_required('view_corrections')
+def download_all_corrections_pdf():
+    """Start a background job that renders all correction requests to PDF"""
+    status = request.args.get('status', 'all')
+    
+    query = CorrectionRequest.query
+    if status != 'all':
+        query = query.filter_by(status=status)
+    
+    if query.first() is None:
+        return jsonify({'error': 'No corrections found'}), 404
+    
+    job = job_runner.submit('corrections_pdf', run_corrections_pdf, created_by=session['user_id'], status=status)
+    return jsonify({'success': True, 'job_id': job.id, 'status': job.status}), 202
+
+def run_corrections_pdf(progress, status):
+    """Background job body for download_all_corrections_pdf"""
+    import pdf_reports
+    print("📄 Starting bulk PDF generation")
+    print(f"Filter status: {status}")
+    purge_job_outputs()
+    
+    query = CorrectionRequest.query
+    if status != 'all':
+        query = query.filter_by(status=status)
+    
+    total = query.order_by(None).count()
+    print(f"✅ Found {total} corrections")
+    progress.update(total_rows=total)
+    
+    output_path = os.path.join(current_app.config['JOB_OUTPUT_FOLDER'], f"{progress.job_id}.pdf")
+    rendered = pdf_reports.build_corrections_report(
+        output_path, status=status, total=total,
+        on_progress=lambda count: progress.update(processed_rows=count)
+    )
+    
+    filename = f"all_corrections_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+    return {'total': rendered, 'filename': filename}, output_path
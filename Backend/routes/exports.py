@@ -0,0 +1,72 @@
+"""CSV / Excel exports"""
+from flask import Blueprint, jsonify
+
+from exports import export_response
+from models import Member, Verification, CorrectionRequest
+from routes.common import (login_required, permission_required, read_only, get_export_format,
+                           filtered_members, filtered_verifications, filtered_corrections, filtered_search_logs)
+import search_log_storage
+
+bp = Blueprint('exports', __name__)
+
+# ============= EXPORTS =============
+# ?format=csv (streamed, default) or ?format=xlsx, plus the filters of the matching list endpoint
+
+@bp.route('/admin/export/members', methods=['GET'])
+@permission_required('manage_members')
+@read_only
+def export_members():
+    export_format = get_export_format()
+    if not export_format:
+        return jsonify({'error': 'Invalid format. Must be one of: csv, xlsx'}), 400
+    
+    query, _ = filtered_members()
+    columns = [Member.id, Member.name, Member.member_number, Member.id_number, Member.zone,
+               Member.status, Member.created_at, Member.updated_at]
+    return export_response(query, columns, [Member.name, Member.id], 'members', export_format)
+
+@bp.route('/admin/export/verifications', methods=['GET'])
+@permission_required('view_verifications')
+@read_only
+def export_verifications():
+    export_format = get_export_format()
+    if not export_format:
+        return jsonify({'error': 'Invalid format. Must be one of: csv, xlsx'}), 400
+    
+    query, _ = filtered_verifications()
+    columns = [Verification.id, Verification.member_id, Verification.member_number, Verification.member_name,
+               Verification.zone, Verification.id_number, Verification.verified_at]
+    return export_response(query, columns,
+                           [Verification.verified_at.desc(), Verification.id.desc()], 'verifications', export_format)
+
+@bp.route('/admin/export/corrections', methods=['GET'])
+@permission_required('view_corrections')
+@read_only
+def export_corrections():
+    export_format = get_export_format()
+    if not export_format:
+        return jsonify({'error': 'Invalid format. Must be one of: csv, xlsx'}), 400
+    
+    query, _ = filtered_corrections()
+    columns = [CorrectionRequest.id, CorrectionRequest.member_id, CorrectionRequest.member_number,
+               CorrectionRequest.id_number, CorrectionRequest.current_name, CorrectionRequest.current_zone,
+               CorrectionRequest.current_status, CorrectionRequest.correct_name, CorrectionRequest.correct_zone,
+               CorrectionRequest.email, CorrectionRequest.phone, CorrectionRequest.additional_notes,
+               CorrectionRequest.status, CorrectionRequest.submitted_at, CorrectionRequest.resolved_at]
+    return export_response(query, columns, [CorrectionRequest.submitted_at.desc(), CorrectionRequest.id.desc()],
+                           'corrections', export_format)
+
+@bp.route('/admin/export/search-logs', methods=['GET'])
+@login_required
+@read_only
+def export_search_logs():
+    export_format = get_export_format()
+    if not export_format:
+        return jsonify({'error': 'Invalid format. Must be one of: csv, xlsx'}), 400
+    
+    log = search_log_storage.search_log_entity()
+    query, _ = filtered_search_logs(log)
+    columns = [log.id, log.member_id, log.member_number, log.id_number,
+               log.search_successful, log.ip_address, log.user_agent, log.searched_at]
+    return export_response(query, columns, [log.searched_at.desc(), log.id.desc()],
+                           'search_logs', export_format)
@@ -0,0 +1,293 @@
+"""Member management routes, bulk member files and dashboard stats"""
+import os
+
+from flask import Blueprint, current_app, request, jsonify, session
+from sqlalchemy import func
+
+from extensions import member_cache, job_runner
+from models import db, Member, MemberVerificationSummary, Zone, normalize_number
+from routes.common import (login_required, permission_required, read_only, allowed_file, save_upload,
+                           paginated_response, requested_zone_id, filtered_members)
+import stats
+import zones
+
+bp = Blueprint('members', __name__)
+
+# ============= MEMBER MANAGEMENT ROUTES =============
+
+@bp.route('/admin/members', methods=['GET'])
+@permission_required('manage_members')
+@read_only
+def get_all_members():
+    search = request.args.get('search', '', type=str).strip()
+    query, ranking = filtered_members()
+    zone_id = requested_zone_id()
+    if search:
+        total = None
+    elif zone_id is not None:
+        total = db.session.query(Zone.member_count).filter_by(id=zone_id).scalar() or 0
+    else:
+        total = stats.read_stats()['total_members']
+    
+    return paginated_response('members', query, [Member.name, Member.id], 50, total=total, ranking=ranking)
+
+@bp.route('/admin/members', methods=['POST'])
+@permission_required('manage_members')
+def add_member():
+    data = request.json
+    
+    required_fields = ['name', 'member_number', 'id_number', 'zone']
+    for field in required_fields:
+        if not data.get(field):
+            return jsonify({'error': f'{field} is required'}), 400
+    
+    existing = Member.query.filter_by(member_number=data['member_number']).first()
+    if existing:
+        return jsonify({'error': 'Member number already exists'}), 400
+    
+    duplicate = Member.query.filter_by(
+        member_number_norm=normalize_number(data['member_number']),
+        id_number_norm=normalize_number(data['id_number'])
+    ).first()
+    if duplicate:
+        return jsonify({'error': f'Member {duplicate.member_number} already has the same member and ID number'}), 400
+    
+    try:
+        new_member = Member(
+            name=data['name'].strip(),
+            member_number=data['member_number'].strip(),
+            id_number=data['id_number'].strip(),
+            zone=data['zone'].strip(),
+            zone_id=zones.zone_id(data['zone'].strip()),
+            status=data.get('status', 'active').strip()
+        )
+        db.session.add(new_member)
+        stats.bump(total_members=1)
+        stats.bump_zones({new_member.zone: 1})
+        db.session.commit()
+        member_cache.clear()
+        return jsonify(new_member.to_dict()), 201
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/admin/members/bulk-upload', methods=['POST'])
+@permission_required('manage_members')
+def bulk_upload():
+    if 'file' not in request.files:
+        return jsonify({'error': 'No file provided'}), 400
+    
+    file = request.files['file']
+    
+    if file.filename == '' or not allowed_file(file.filename):
+        return jsonify({'error': 'Invalid file'}), 400
+    
+    path = save_upload(file)
+    job = job_runner.submit('bulk_upload', run_bulk_upload, created_by=session['user_id'], path=path)
+    return jsonify({'success': True, 'job_id': job.id, 'status': job.status}), 202
+
+def run_bulk_upload(progress, path):
+    """Background job body for bulk_upload"""
+    from member_bulk import (UPLOAD_COLUMNS, read_member_batches, count_member_rows, load_existing_member_keys,
+                             prepare_new_members, insert_members)
+    batch_size = current_app.config['UPLOAD_BATCH_SIZE']
+    added_count = 0
+    skipped_count = 0
+    errors = []
+    
+    try:
+        progress.update(total_rows=count_member_rows(path))
+        member_numbers, normalized_keys = load_existing_member_keys()
+        
+        for first_row, df in read_member_batches(path, batch_size):
+            missing_columns = [col for col in UPLOAD_COLUMNS if col not in df.columns]
+            if missing_columns:
+                raise ValueError(f'Missing required columns: {", ".join(missing_columns)}')
+            
+            new_members, batch_errors = prepare_new_members(df, member_numbers, normalized_keys, first_row)
+            added_count += insert_members(new_members, batch_size)
+            skipped_count += len(batch_errors)
+            errors.extend(batch_errors[:20 - len(errors)])
+            progress.update(processed_rows=first_row - 2 + len(df), error_count=skipped_count)
+        
+        return {
+            'success': True,
+            'added': added_count,
+            'skipped': skipped_count,
+            'errors': errors if errors else None
+        }
+    finally:
+        if added_count:
+            member_cache.clear()
+        os.remove(path)
+
+@bp.route('/admin/members/<int:member_id>', methods=['PUT'])
+@permission_required('manage_members')
+def update_member(member_id):
+    member = Member.query.get_or_404(member_id)
+    data = request.json
+    old_zone = member.zone
+    
+    member.name = data.get('name', member.name).strip()
+    member.member_number = data.get('member_number', member.member_number).strip()
+    member.id_number = data.get('id_number', member.id_number).strip()
+    member.zone = data.get('zone', member.zone).strip()
+    member.status = data.get('status', member.status).strip()
+    
+    try:
+        if member.zone != old_zone:
+            member.zone_id = zones.zone_id(member.zone)
+            stats.bump_zones({old_zone: -1, member.zone: 1})
+        db.session.commit()
+        member_cache.clear()
+        return jsonify(member.to_dict())
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+    
+
+def bulk_update_response(result):
+    errors = result['error_details']
+    return {
+        'success': True,
+        'updated': result['updated'],
+        'not_found': result['not_found'],
+        'unchanged': result['unchanged'],
+        'errors': result['errors'],
+        'error_details': errors[:20] if errors else None,
+        'message': f'Successfully updated {result["updated"]} members'
+    }
+
+@bp.route('/admin/members/bulk-update', methods=['POST'])
+@permission_required('manage_members')
+def bulk_update_members():
+    """
+    Bulk update members from uploaded Excel or CSV file
+    Expected columns: member_number (required for matching), name, id_number, zone, status
+    """
+    if 'file' not in request.files:
+        return jsonify({'error': 'No file provided'}), 400
+    
+    file = request.files['file']
+    
+    if file.filename == '' or not allowed_file(file.filename):
+        return jsonify({'error': 'Invalid file. Please upload an Excel (.xlsx or .xls) or CSV file'}), 400
+    
+    path = save_upload(file)
+    job = job_runner.submit('bulk_update', run_bulk_update, created_by=session['user_id'], path=path)
+    return jsonify({'success': True, 'job_id': job.id, 'status': job.status}), 202
+
+def run_bulk_update(progress, path):
+    """Background job body for bulk_update_members"""
+    from member_bulk import read_member_batches, count_member_rows, new_update_result, apply_member_updates, \
+        updates_from_frame
+    result = new_update_result()
+    
+    try:
+        progress.update(total_rows=count_member_rows(path))
+        
+        for first_row, df in read_member_batches(path, current_app.config['UPLOAD_BATCH_SIZE']):
+            # member_number is required to identify which record to update
+            if 'member_number' not in df.columns:
+                raise ValueError('Missing required column: member_number')
+            
+            apply_member_updates(updates_from_frame(df, first_row), result)
+            progress.update(
+                processed_rows=first_row - 2 + len(df),
+                error_count=result['errors'] + result['not_found']
+            )
+        
+        return bulk_update_response(result)
+    finally:
+        if result['updated'] > 0:
+            member_cache.clear()
+        os.remove(path)
+
+
+@bp.route('/admin/members/bulk-update-json', methods=['POST'])
+@permission_required('manage_members')
+def bulk_update_members_json():
+    """
+    Bulk update members from JSON data
+    Expected format: { "updates": [{ "member_number": "...", "name": "...", ... }] }
+    """
+    from member_bulk import apply_member_updates, updates_from_json
+    data = request.json
+    updates = data.get('updates', [])
+    
+    if not updates or not isinstance(updates, list):
+        return jsonify({'error': 'Please provide a list of updates'}), 400
+    
+    try:
+        result = apply_member_updates(updates_from_json(updates))
+        if result['updated'] > 0:
+            member_cache.clear()
+        
+        return jsonify(bulk_update_response(result)), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/admin/members/<int:member_id>', methods=['DELETE'])
+@permission_required('manage_members')
+def delete_member(member_id):
+    member = Member.query.get_or_404(member_id)
+    
+    try:
+        # The cascade deletes the member's verifications, summary, corrections and search logs too
+        stats.bump(
+            total_members=-1,
+            total_verifications=-len(member.verifications),
+            verified_members=-1 if member.verification_summary else 0,
+            pending_corrections=-sum(1 for c in member.corrections if c.status == 'pending'),
+            total_searches=-len(member.search_logs),
+            successful_searches=-sum(1 for log in member.search_logs if log.search_successful)
+        )
+        stats.bump_zones({member.zone: -1})
+        verification_zones = {}
+        for verification in member.verifications:
+            verification_zones[verification.zone] = verification_zones.get(verification.zone, 0) - 1
+        stats.bump_zone_verifications(verification_zones)
+        db.session.delete(member)
+        db.session.commit()
+        member_cache.clear()
+        return jsonify({'message': 'Member deleted successfully'})
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/admin/members/bulk-delete', methods=['POST'])
+@permission_required('manage_members')
+def bulk_delete_members():
+    data = request.json
+    member_ids = data.get('ids', [])
+    
+    if not member_ids or not isinstance(member_ids, list):
+        return jsonify({'error': 'Please provide a list of member IDs'}), 400
+    
+    try:
+        zone_counts = db.session.query(Member.zone, func.count(Member.id)) \
+            .filter(Member.id.in_(member_ids)).group_by(Member.zone).all()
+        verified_count = MemberVerificationSummary.query \
+            .filter(MemberVerificationSummary.member_id.in_(member_ids)).delete(synchronize_session=False)
+        deleted_count = Member.query.filter(Member.id.in_(member_ids)).delete(synchronize_session=False)
+        stats.bump(total_members=-deleted_count, verified_members=-verified_count)
+        stats.bump_zones({zone: -count for zone, count in zone_counts})
+        db.session.commit()
+        member_cache.clear()
+        
+        return jsonify({
+            'success': True,
+            'deleted': deleted_count,
+            'message': f'Successfully deleted {deleted_count} members'
+        })
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/admin/stats', methods=['GET'])
+@login_required
+@read_only
+def get_stats():
+    return jsonify(stats.read_stats())
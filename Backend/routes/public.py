@@ -0,0 +1,180 @@
+"""Public member lookup, verification and correction routes"""
+import math
+from datetime import datetime
+
+from flask import Blueprint, current_app, request, jsonify
+
+from extensions import member_cache, member_lookups, search_limiter, search_log_writer
+from models import db, Member, Verification, CorrectionRequest, normalize_number
+from routes.common import read_only, get_client_ip
+import stats
+import verification_summary
+import outbox
+
+bp = Blueprint('public', __name__)
+
+# ============= PUBLIC ROUTES =============
+def lookup_member(cache_key, generation):
+    match = Member.query.filter_by(
+        member_number_norm=cache_key[0],
+        id_number_norm=cache_key[1]
+    ).first()
+    
+    if not match:
+        return None
+    member = match.to_dict()
+    # Not stored if an admin write cleared the cache while this query ran
+    member_cache.set(cache_key, member, generation)
+    return member
+
+@bp.route('/search', methods=['POST'])
+@read_only
+def search_member():
+    allowed, retry_after = search_limiter.take(get_client_ip())
+    if not allowed:
+        retry_after = max(1, math.ceil(retry_after))
+        return jsonify({'error': 'Too many searches. Please try again shortly.', 'retry_after': retry_after}), \
+            429, {'Retry-After': str(retry_after)}
+    
+    data = request.json
+    member_number = data.get('member_number', '').strip()
+    id_number = data.get('id_number', '').strip()
+    
+    if not member_number or not id_number:
+        return jsonify({'error': 'Both member number and ID number are required'}), 400
+    
+    # Both numbers are matched on their normalized form (see normalize_number)
+    cache_key = (normalize_number(member_number), normalize_number(id_number))
+    
+    # Serve repeat lookups from the cache, falling back to the database
+    member = member_cache.get(cache_key)
+    
+    if member is None:
+        # Identical lookups arriving together share one query; one started
+        # before the last cache clear is not shared with lookups after it
+        generation = member_cache.generation
+        member = member_lookups.do((generation, cache_key), lambda: lookup_member(cache_key, generation))
+    
+    # Log the search (written in batches by the background writer)
+    search_log_writer.log(
+        member_id=member['id'] if member else None,
+        member_number=member_number,
+        id_number=id_number,
+        search_successful=member is not None,
+        ip_address=get_client_ip(),
+        user_agent=request.headers.get('User-Agent', '')[:500]
+    )
+    
+    if member:
+        return jsonify({'found': True, 'member': member})
+    else:
+        return jsonify({'found': False, 'message': 'No member found with the provided details'})
+
+@bp.route('/verify-details', methods=['POST'])
+def verify_details():
+    data = request.json
+    
+    try:
+        member = Member.query.get(data['member_id'])
+        
+        if not member or member.member_number != data['member_number']:
+            return jsonify({'error': 'Member not found'}), 404
+        
+        if verification_summary.is_repeat(member.id, current_app.config['VERIFICATION_DEDUP_SECONDS']):
+            return jsonify({'success': True, 'message': 'Details verified successfully'}), 200
+        
+        verification = Verification(
+            member_id=member.id,
+            member_number=member.member_number,
+            member_name=member.name,
+            zone=member.zone,
+            zone_id=member.zone_id,
+            id_number=data['id_number'],
+            verified_at=datetime.utcnow()
+        )
+        
+        db.session.add(verification)
+        verification_summary.record(member.id, verification.verified_at)
+        stats.bump(total_verifications=1)
+        stats.bump_zone_verifications({member.zone: 1})
+        db.session.commit()
+        
+        print(f"✅ Member verified: {member.name} ({member.member_number})")
+        
+        return jsonify({'success': True, 'message': 'Details verified successfully'}), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Verification error: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/submit-correction', methods=['POST'])
+def submit_correction():
+    data = request.json
+    
+    try:
+        member = Member.query.get(data['member_id'])
+        
+        if not member or member.member_number != data['member_number']:
+            return jsonify({'error': 'Member not found'}), 404
+        
+        if not data.get('email') and not data.get('phone'):
+            return jsonify({'error': 'Please provide either email or phone number'}), 400
+        
+        correction = CorrectionRequest(
+            member_id=member.id,
+            member_number=data['member_number'],
+            id_number=data['id_number'],
+            current_name=data['current_name'],
+            current_zone=data['current_zone'],
+            current_status=data['current_status'],
+            correct_name=data['correct_name'],
+            correct_zone=data['correct_zone'],
+            email=data.get('email'),
+            phone=data.get('phone'),
+            additional_notes=data.get('additional_notes')
+        )
+        
+        db.session.add(correction)
+        stats.bump(pending_corrections=1)
+        
+        # Queued in the same transaction; the outbox task sends it
+        if current_app.config['MAIL_ENABLED']:
+            db.session.flush()
+            outbox.enqueue(
+                [current_app.config['ADMIN_EMAIL']],
+                subject=f'Member Correction Request - {data["member_number"]}',
+                body=f"""
+                                New correction request received:
+
+                                Member Number: {data['member_number']}
+                                ID Number: {data['id_number']}
+
+                                CURRENT DETAILS:
+                                • Name: {data['current_name']}
+                                • Zone: {data['current_zone']}
+                                • Status: {data['current_status']}
+
+                                REQUESTED CORRECTIONS:
+                                • Name: {data['correct_name']}
+                                • Zone: {data['correct_zone']}
+
+                                CONTACT:
+                                • Email: {data.get('email', 'Not provided')}
+                                • Phone: {data.get('phone', 'Not provided')}
+
+                                Additional Notes: {data.get('additional_notes', 'None')}
+                                                    """.strip(),
+                kind='correction_submitted',
+                reference_id=correction.id,
+                hold=current_app.config['MAIL_DIGEST_SECONDS'] > 0
+            )
+        db.session.commit()
+        
+        print(f"✅ Correction request submitted: {data['member_number']}")
+        
+        return jsonify({'success': True, 'message': 'Correction request submitted successfully', 'correction_id': correction.id}), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
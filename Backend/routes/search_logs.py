@@ -0,0 +1,72 @@
+"""Search log and search analytics routes"""
+from flask import Blueprint, request, jsonify
+
+from extensions import analytics_cache
+from routes.common import login_required, read_only, paginated_response, filtered_search_logs
+import stats
+import search_log_storage
+import search_analytics
+
+bp = Blueprint('search_logs', __name__)
+
+
+def warm_analytics_cache():
+    """Recompute the default analytics views so dashboard loads hit the cache"""
+    for range_name, bucket in search_analytics.DEFAULT_BUCKETS.items():
+        key = (range_name, bucket, None, 10)
+        analytics_cache.set(key, search_analytics.search_analytics(*key))
+
+# ============= SEARCH LOGS =============
+
+@bp.route('/admin/search-logs', methods=['GET'])
+@login_required
+@read_only
+def get_search_logs():
+    success_filter = request.args.get('success', 'all')
+    
+    try:
+        log = search_log_storage.search_log_entity()
+        query, _ = filtered_search_logs(log)
+        counters = stats.read_stats()
+        total = counters['total_searches']
+        
+        if success_filter == 'successful':
+            total = counters['successful_searches']
+        elif success_filter == 'failed':
+            total = counters['total_searches'] - counters['successful_searches']
+        
+        return paginated_response('logs', query, [log.searched_at, log.id], 50,
+                                  descending=True, total=total)
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# ============= ANALYTICS =============
+
+@bp.route('/admin/analytics/searches', methods=['GET'])
+@login_required
+@read_only
+def get_search_analytics():
+    """?range=24h|7d|30d|90d|365d&bucket=hour|day&zone=<zone>&top=10"""
+    range_name = request.args.get('range', '7d')
+    if range_name not in search_analytics.RANGES:
+        return jsonify({'error': f'Invalid range. Must be one of: {", ".join(search_analytics.RANGES)}'}), 400
+    
+    bucket = request.args.get('bucket', search_analytics.DEFAULT_BUCKETS[range_name])
+    if bucket not in search_analytics.STEPS:
+        return jsonify({'error': 'Invalid bucket. Must be one of: hour, day'}), 400
+    if bucket == 'hour' and search_analytics.RANGES[range_name] > search_analytics.MAX_HOURLY_RANGE:
+        return jsonify({'error': 'Hourly buckets are only available for ranges up to 30d'}), 400
+    
+    zone = request.args.get('zone') or None
+    top = min(max(request.args.get('top', 10, type=int), 1), 100)
+    
+    try:
+        key = (range_name, bucket, zone, top)
+        result = analytics_cache.get(key)
+        if result is None:
+            result = search_analytics.search_analytics(*key)
+            analytics_cache.set(key, result)
+        return jsonify(result)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
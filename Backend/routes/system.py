@@ -0,0 +1,72 @@
+"""Metrics, background job and utility routes"""
+import json
+import os
+
+from flask import Blueprint, jsonify, session, send_file
+
+from extensions import (member_cache, permission_cache, analytics_cache, zone_cache, pdf_cache, search_limiter,
+                        member_lookups, search_log_writer, job_runner, outbox_sender, replica_router)
+from models import db
+from routes.common import login_required
+
+bp = Blueprint('system', __name__)
+
+@bp.route('/admin/metrics', methods=['GET'])
+@login_required
+def get_metrics():
+    return jsonify({
+        'member_cache': member_cache.stats(),
+        'permission_cache': permission_cache.stats(),
+        'analytics_cache': analytics_cache.stats(),
+        'zone_cache': zone_cache.stats(),
+        'pdf_cache': pdf_cache.stats(),
+        'search_rate_limit': search_limiter.stats(),
+        'member_lookups': member_lookups.stats(),
+        'search_log_writer': search_log_writer.stats(),
+        'email_outbox': outbox_sender.stats(),
+        'read_replicas': replica_router.stats()
+    })
+
+# ============= JOB ROUTES =============
+
+def get_visible_job(job_id):
+    job = job_runner.get(job_id)
+    if job and (job.created_by == session['user_id'] or session.get('role') == 'super_admin'):
+        return job
+    return None
+
+@bp.route('/admin/jobs/<job_id>', methods=['GET'])
+@login_required
+def get_job(job_id):
+    job = get_visible_job(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job.to_dict())
+
+@bp.route('/admin/jobs/<job_id>/download', methods=['GET'])
+@login_required
+def download_job_output(job_id):
+    job = get_visible_job(job_id)
+    if not job or job.status != 'succeeded' or not job.output_path or not os.path.exists(job.output_path):
+        return jsonify({'error': 'No download available for this job'}), 404
+    
+    return send_file(
+        job.output_path,
+        as_attachment=True,
+        download_name=json.loads(job.result).get('filename')
+    )
+
+# ============= UTILITY ROUTES =============
+
+@bp.route('/health', methods=['GET'])
+def health_check():
+    return jsonify({'status': 'healthy', 'message': 'SACCO API is running'})
+
+@bp.app_errorhandler(404)
+def not_found(e):
+    return jsonify({'error': 'Resource not found'}), 404
+
+@bp.app_errorhandler(500)
+def internal_error(e):
+    db.session.rollback()
+    return jsonify({'error': 'Internal server error'}), 500
@@ -0,0 +1,61 @@
+"""Zone and verification routes"""
+from flask import Blueprint, jsonify
+
+from extensions import zone_cache
+from models import db, Verification, Zone
+from routes.common import login_required, permission_required, read_only, paginated_response, requested_zone_id, \
+    filtered_verifications
+import stats
+import verification_summary
+import zones
+
+bp = Blueprint('verifications', __name__)
+
+# ============= VERIFICATION ROUTES =============
+
+@bp.route('/admin/zones', methods=['GET'])
+@login_required
+@read_only
+def get_zones():
+    """All zones with their member and verification counts"""
+    try:
+        result = zone_cache.get('zones')
+        if result is None:
+            result = zones.list_zones()
+            zone_cache.set('zones', result)
+        return jsonify({'zones': result, 'total': len(result)})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/admin/verifications/by-zone', methods=['GET'])
+@permission_required('view_verifications')
+@read_only
+def get_verifications_by_zone():
+    try:
+        zones = verification_summary.zone_counts()
+        counters = stats.read_stats()
+        return jsonify({
+            'zones': zones,
+            'total_members': counters['total_members'],
+            'verified_members': counters['verified_members'],
+            'unverified_members': max(counters['total_members'] - counters['verified_members'], 0)
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/admin/verifications', methods=['GET'])
+@permission_required('view_verifications')
+@read_only
+def get_verifications():
+    try:
+        query, _ = filtered_verifications()
+        zone_id = requested_zone_id()
+        if zone_id is not None:
+            total = db.session.query(Zone.verification_count).filter_by(id=zone_id).scalar() or 0
+        else:
+            total = stats.read_stats()['total_verifications']
+        return paginated_response('verifications', query,
+                                  [Verification.verified_at, Verification.id], 20, descending=True, total=total)
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
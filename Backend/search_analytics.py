@@ -0,0 +1,186 @@
+"""
+Search analytics served from aggregate tables instead of the raw search log.
+
+- search_log_hourly / search_log_daily (rolled up by search_log_storage)
+  give the time series per zone
+- search_failures_daily / search_ips_daily give the top lists; the search
+  log writer upserts them in the same transaction as the rows they count
+
+Only the stretch after the rollup watermark (minutes for hourly buckets,
+at most a day for daily ones) is aggregated from raw rows.
+"""
+from collections import Counter
+from datetime import datetime, timedelta
+
+from sqlalchemy import case, delete, desc, func
+
+from db_utils import dialect_insert, time_bucket, parse_bucket
+from models import (db, Member, SearchLog, SearchLogHourly, SearchLogDaily, RollupWatermark,
+                    SearchFailureDaily, SearchIpDaily)
+
+RANGES = {
+    '24h': timedelta(hours=24),
+    '7d': timedelta(days=7),
+    '30d': timedelta(days=30),
+    '90d': timedelta(days=90),
+    '365d': timedelta(days=365)
+}
+DEFAULT_BUCKETS = {'24h': 'hour', '7d': 'hour', '30d': 'day', '90d': 'day', '365d': 'day'}
+# Hourly rollups are only kept for SEARCH_ROLLUP_HOURLY_RETENTION_DAYS
+MAX_HOURLY_RANGE = timedelta(days=30)
+STEPS = {'hour': timedelta(hours=1), 'day': timedelta(days=1)}
+
+
+def _truncate(value, bucket):
+    return datetime(value.year, value.month, value.day, value.hour if bucket == 'hour' else 0)
+
+
+# ============= WRITE PATH =============
+
+def record(rows):
+    """
+    Add a batch of search log rows to the per-day failure and IP counts.
+    Does not commit; the caller commits together with the rows.
+    """
+    failures = Counter()
+    ips = Counter()
+    ip_failures = Counter()
+    for row in rows:
+        day = _truncate(row['searched_at'], 'day')
+        ip_key = (day, (row.get('ip_address') or '')[:45])
+        ips[ip_key] += 1
+        if not row.get('search_successful'):
+            failures[(day, row['member_number'][:50])] += 1
+            ip_failures[ip_key] += 1
+
+    # Sorted keys keep concurrent writers locking rows in the same order
+    if failures:
+        stmt = dialect_insert(SearchFailureDaily.__table__)
+        db.session.execute(stmt.on_conflict_do_update(
+            index_elements=['day', 'member_number'],
+            set_={'failures': SearchFailureDaily.__table__.c.failures + stmt.excluded.failures}
+        ), [{'day': day, 'member_number': number, 'failures': count}
+            for (day, number), count in sorted(failures.items())])
+
+    if ips:
+        table = SearchIpDaily.__table__
+        stmt = dialect_insert(table)
+        db.session.execute(stmt.on_conflict_do_update(
+            index_elements=['day', 'ip_address'],
+            set_={'searches': table.c.searches + stmt.excluded.searches,
+                  'failures': table.c.failures + stmt.excluded.failures}
+        ), [{'day': day, 'ip_address': ip, 'searches': count, 'failures': ip_failures[(day, ip)]}
+            for (day, ip), count in sorted(ips.items())])
+
+
+def prune(before):
+    """Delete per-day top-list counts older than `before`"""
+    db.session.execute(delete(SearchFailureDaily).where(SearchFailureDaily.day < before))
+    db.session.execute(delete(SearchIpDaily).where(SearchIpDaily.day < before))
+    db.session.commit()
+
+
+# ============= READ PATH =============
+
+def _series(range_start, end, bucket, zone):
+    model = SearchLogHourly if bucket == 'hour' else SearchLogDaily
+    watermark = db.session.get(RollupWatermark, model.__tablename__)
+    rolled_up_to = watermark.rolled_up_to if watermark else range_start
+    rolled_up_to = max(range_start, min(rolled_up_to, end))
+
+    buckets = {}
+
+    def add(bucket_start, searches, successes, unique_ips):
+        totals = buckets.setdefault(parse_bucket(bucket_start), [0, 0, 0])
+        totals[0] += searches or 0
+        totals[1] += successes or 0
+        totals[2] += unique_ips or 0
+
+    query = db.session.query(
+        model.bucket_start, func.sum(model.searches), func.sum(model.successes), func.sum(model.unique_ips)
+    ).filter(model.bucket_start >= range_start, model.bucket_start < rolled_up_to)
+    if zone is not None:
+        query = query.filter(model.zone == zone)
+    for row in query.group_by(model.bucket_start):
+        add(*row)
+
+    # Buckets not rolled up yet, grouped per zone like the rollups so unique_ips adds up the same way
+    if rolled_up_to < end:
+        raw_bucket = time_bucket(SearchLog.searched_at, bucket)
+        raw_zone = func.coalesce(Member.zone, '')
+        query = db.session.query(
+            raw_bucket,
+            func.count(SearchLog.id),
+            func.sum(case((SearchLog.search_successful.is_(True), 1), else_=0)),
+            func.count(func.distinct(SearchLog.ip_address))
+        ).outerjoin(Member, Member.id == SearchLog.member_id) \
+            .filter(SearchLog.searched_at >= rolled_up_to, SearchLog.searched_at < end)
+        if zone is not None:
+            query = query.filter(raw_zone == zone)
+        for row in query.group_by(raw_bucket, raw_zone):
+            add(*row)
+
+    series = []
+    bucket_start = range_start
+    while bucket_start < end:
+        searches, successes, unique_ips = buckets.get(bucket_start, (0, 0, 0))
+        series.append({
+            'bucket_start': bucket_start.isoformat(),
+            'searches': searches,
+            'successes': successes,
+            'failures': searches - successes,
+            'failure_rate': round((searches - successes) / searches, 4) if searches else None,
+            'unique_ips': unique_ips
+        })
+        bucket_start += STEPS[bucket]
+    return series
+
+
+def search_analytics(range_name, bucket, zone=None, top=10, now=None):
+    """
+    Time series of `range_name` in `bucket`s ending with the current one,
+    optionally for one zone, plus the top failing member numbers and top IPs
+    over the whole days the range touches. unique_ips counts distinct IPs per
+    bucket and zone, summed over zones.
+    """
+    now = now or datetime.utcnow()
+    end = _truncate(now, bucket) + STEPS[bucket]
+    start = end - RANGES[range_name]
+    series = _series(start, end, bucket, zone)
+
+    first_day = _truncate(start, 'day')
+    failures = func.sum(SearchFailureDaily.failures).label('failures')
+    top_failing = db.session.query(SearchFailureDaily.member_number, failures) \
+        .filter(SearchFailureDaily.day >= first_day, SearchFailureDaily.day < end) \
+        .group_by(SearchFailureDaily.member_number) \
+        .order_by(desc('failures'), SearchFailureDaily.member_number).limit(top).all()
+
+    searches = func.sum(SearchIpDaily.searches).label('searches')
+    top_ips = db.session.query(SearchIpDaily.ip_address, searches, func.sum(SearchIpDaily.failures)) \
+        .filter(SearchIpDaily.day >= first_day, SearchIpDaily.day < end) \
+        .group_by(SearchIpDaily.ip_address) \
+        .order_by(desc('searches'), SearchIpDaily.ip_address).limit(top).all()
+
+    total_searches = sum(point['searches'] for point in series)
+    total_failures = sum(point['failures'] for point in series)
+    return {
+        'range': range_name,
+        'bucket': bucket,
+        'zone': zone,
+        'from': start.isoformat(),
+        'to': end.isoformat(),
+        'totals': {
+            'searches': total_searches,
+            'failures': total_failures,
+            'failure_rate': round(total_failures / total_searches, 4) if total_searches else None
+        },
+        'series': series,
+        'top_failing_member_numbers': [
+            {'member_number': number, 'failures': count} for number, count in top_failing
+        ],
+        'top_ips': [
+            {'ip_address': ip or None, 'searches': count, 'failures': failed or 0}
+            for ip, count, failed in top_ips
+        ],
+        'generated_at': now.isoformat()
+    }
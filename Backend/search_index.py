@@ -0,0 +1,160 @@
+"""
+Indexed substring search for the admin list endpoints.
+
+SQLite uses an FTS5 table with the trigram tokenizer (external content,
+kept in sync by triggers), PostgreSQL a pg_trgm GIN index over one search
+document expression. Both serve '%term%' matching from an index, rank the
+results, and PostgreSQL additionally matches misspelt terms by trigram
+word similarity. When the index has not been created (migration not run,
+FTS5/pg_trgm unavailable) search falls back to plain ILIKE.
+"""
+from sqlalchemy import and_, func, literal, literal_column, or_, select, table, column, text
+
+from models import db
+
+# Trigram indexes cannot serve terms shorter than one trigram
+MIN_TERM_LENGTH = 3
+MAX_TERMS = 8
+
+SEARCH_DOCUMENTS = {
+    'members': {
+        'fts_table': 'members_fts',
+        'trgm_index': 'ix_members_search_trgm',
+        'columns': ('name', 'member_number', 'id_number', 'zone')
+    },
+    'correction_requests': {
+        'fts_table': 'correction_requests_fts',
+        'trgm_index': 'ix_correction_requests_search_trgm',
+        'columns': ('member_number', 'id_number', 'current_name', 'correct_name',
+                    'current_zone', 'correct_zone', 'email', 'phone')
+    }
+}
+
+_backends = {}
+
+
+def document_sql(table_name, columns):
+    """The search document expression; must match the one the GIN index was built on"""
+    parts = " || ' ' || ".join(f"coalesce({table_name}.{col}, '')" for col in columns)
+    return f"lower({parts})"
+
+
+def index_ddl(table_name, dialect_name):
+    """
+    Statements that build the search index for a table (used by the
+    benchmarks; migrations keep their own frozen copy).
+    """
+    spec = SEARCH_DOCUMENTS[table_name]
+    fts_table = spec['fts_table']
+    cols = ', '.join(spec['columns'])
+    new = ', '.join(f'new.{col}' for col in spec['columns'])
+    old = ', '.join(f'old.{col}' for col in spec['columns'])
+
+    if dialect_name == 'sqlite':
+        return [
+            f"CREATE VIRTUAL TABLE {fts_table} USING fts5({cols}, content='{table_name}', content_rowid='id', "
+            f"tokenize='trigram')",
+            f"CREATE TRIGGER {fts_table}_ai AFTER INSERT ON {table_name} BEGIN "
+            f"INSERT INTO {fts_table}(rowid, {cols}) VALUES (new.id, {new}); END",
+            f"CREATE TRIGGER {fts_table}_ad AFTER DELETE ON {table_name} BEGIN "
+            f"INSERT INTO {fts_table}({fts_table}, rowid, {cols}) VALUES ('delete', old.id, {old}); END",
+            f"CREATE TRIGGER {fts_table}_au AFTER UPDATE OF {cols} ON {table_name} BEGIN "
+            f"INSERT INTO {fts_table}({fts_table}, rowid, {cols}) VALUES ('delete', old.id, {old}); "
+            f"INSERT INTO {fts_table}(rowid, {cols}) VALUES (new.id, {new}); END",
+            f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')"
+        ]
+    if dialect_name == 'postgresql':
+        return [
+            "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+            f"CREATE INDEX {spec['trgm_index']} ON {table_name} "
+            f"USING gin (({document_sql(table_name, spec['columns'])}) gin_trgm_ops)"
+        ]
+    return []
+
+
+def search_backend(table_name):
+    """'fts5', 'trgm' or None for a table, detected once per process"""
+    engine = db.engine
+    key = (str(engine.url), table_name)
+    if key not in _backends:
+        spec = SEARCH_DOCUMENTS[table_name]
+        backend = None
+        with engine.connect() as conn:
+            if engine.dialect.name == 'sqlite':
+                found = conn.execute(text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                                     {'name': spec['fts_table']}).first()
+                backend = 'fts5' if found else None
+            elif engine.dialect.name == 'postgresql':
+                found = conn.execute(text("SELECT to_regclass(:name)"), {'name': spec['trgm_index']}).scalar()
+                backend = 'trgm' if found else None
+        _backends[key] = backend
+    return _backends[key]
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    """Alembic hook: keep autogenerate from dropping the hand-made search tables and indexes"""
+    if reflected and compare_to is None:
+        for spec in SEARCH_DOCUMENTS.values():
+            # FTS5 also creates <name>_data, <name>_idx, ... shadow tables
+            if type_ == 'table' and name.startswith(spec['fts_table']):
+                return False
+            if type_ == 'index' and name == spec['trgm_index']:
+                return False
+    return True
+
+
+def split_terms(search):
+    return search.lower().split()[:MAX_TERMS]
+
+
+def apply_search(query, model, search):
+    """
+    Filter `query` to rows of `model` matching every whitespace-separated
+    term of `search` in any indexed column. Returns (query, ranking) where
+    ranking is a list of ORDER BY expressions, best match first (empty when
+    there is nothing to rank by).
+    """
+    table_name = model.__tablename__
+    spec = SEARCH_DOCUMENTS[table_name]
+    columns = [getattr(model, col) for col in spec['columns']]
+    terms = split_terms(search)
+    backend = search_backend(table_name)
+
+    if backend == 'fts5':
+        indexed = [term for term in terms if len(term) >= MIN_TERM_LENGTH]
+        short = [term for term in terms if len(term) < MIN_TERM_LENGTH]
+        query = query.filter(*[_ilike_any(columns, term) for term in short])
+        if not indexed:
+            return query, []
+
+        fts = table(spec['fts_table'], column('rowid'))
+        fts_ref = literal_column(spec['fts_table'])
+        match = ' AND '.join('"%s"' % term.replace('"', '""') for term in indexed)
+        hits = (
+            select(fts.c.rowid.label('id'), func.bm25(fts_ref).label('rank'))
+            .select_from(fts)
+            .where(fts_ref.op('MATCH')(match))
+            .subquery()
+        )
+        query = query.join(hits, model.id == hits.c.id)
+        return query, [hits.c.rank.asc()]
+
+    if backend == 'trgm':
+        document = literal_column(document_sql(table_name, spec['columns']))
+        # '%>' is pg_trgm's word similarity operator: doc contains a word close to the term
+        query = query.filter(and_(*[
+            or_(document.like(literal(f'%{_escape_like(term)}%'), escape='\\'), document.op('%>')(literal(term)))
+            for term in terms
+        ]))
+        return query, [func.word_similarity(literal(' '.join(terms)), document).desc()]
+
+    return query.filter(*[_ilike_any(columns, term) for term in terms]), []
+
+
+def _escape_like(term):
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def _ilike_any(columns, term):
+    pattern = f'%{_escape_like(term)}%'
+    return or_(*[col.ilike(pattern, escape='\\') for col in columns])
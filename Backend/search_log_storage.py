@@ -0,0 +1,299 @@
+"""
+Time-partitioned search log storage, retention and rollups.
+
+PostgreSQL: search_logs is range-partitioned by month (search_logs_YYYY_MM,
+plus search_logs_default for stray timestamps). Partitions are created a
+few months ahead, and retention drops whole partitions.
+
+SQLite: search_logs is the hot table. Completed months older than
+SEARCH_LOG_HOT_MONTHS are moved into search_logs_YYYY_MM archive tables,
+which retention drops the same way. search_log_entity() reads the hot and
+archive tables as one UNION ALL, which SQLite merges in index order, so
+keyset pages only touch the tables they need.
+
+search_log_partitions catalogs the monthly tables on both. Closed hours and
+days are rolled up per zone into search_log_hourly / search_log_daily, and
+raw rows only leave (archive or drop) once the daily rollup has covered them.
+"""
+import re
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import Column, Index, MetaData, Table, case, delete, func, insert, select, text, union_all
+from sqlalchemy.orm import aliased
+
+from db_utils import dialect_insert, time_bucket, parse_bucket
+from models import db, Member, SearchLog, SearchLogPartition, SearchLogHourly, SearchLogDaily, RollupWatermark
+import stats
+import search_analytics
+
+PARTITION_PATTERN = re.compile(r'^search_logs_(\d{4}_\d{2}|default)$')
+# Rows are written by the background writer a few seconds late; leave open buckets alone
+ROLLUP_GRACE = timedelta(minutes=5)
+# Bound the work of one maintenance run after a long pause
+MAX_ROLLUP_SPAN = timedelta(days=31)
+
+
+def month_start(value):
+    return datetime(value.year, value.month, 1)
+
+
+def add_months(month, months):
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f"search_logs_{month.year:04d}_{month.month:02d}"
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    """Alembic hook: the monthly tables (and their indexes) are managed here, not by autogenerate"""
+    if reflected and compare_to is None:
+        table_name = name if type_ == 'table' else getattr(getattr(obj, 'table', None), 'name', '')
+        if PARTITION_PATTERN.match(table_name or ''):
+            return False
+    return True
+
+
+def _dialect():
+    return db.engine.dialect.name
+
+
+def _archive_table(name):
+    """Column-for-column copy of search_logs without the foreign key"""
+    columns = [Column(column.name, column.type, primary_key=column.primary_key)
+               for column in SearchLog.__table__.columns]
+    return Table(
+        name, MetaData(), *columns,
+        Index(f'ix_{name}_searched_at_id', 'searched_at', 'id'),
+        Index(f'ix_{name}_successful_searched_at_id', 'search_successful', 'searched_at', 'id')
+    )
+
+
+def search_log_entity():
+    """
+    Entity to query search logs through: SearchLog itself, or on SQLite with
+    archived months an alias over the hot and archive tables.
+    """
+    if _dialect() != 'sqlite':
+        return SearchLog
+
+    names = db.session.execute(
+        select(SearchLogPartition.name).order_by(SearchLogPartition.range_start.desc())
+    ).scalars().all()
+    if not names:
+        return SearchLog
+
+    columns = [column.name for column in SearchLog.__table__.columns]
+    tables = [SearchLog.__table__] + [_archive_table(name) for name in names]
+    source = union_all(*[select(*[table.c[column] for column in columns]) for table in tables])
+    return aliased(SearchLog, source.subquery('search_logs_all'))
+
+
+# ============= PARTITIONS =============
+
+def ensure_partitions(now, months_ahead):
+    """PostgreSQL: create the partitions for this month and the next months_ahead"""
+    existing = set(db.session.execute(select(SearchLogPartition.name)).scalars())
+    month = month_start(now)
+    created = []
+    for _ in range(months_ahead + 1):
+        name = partition_name(month)
+        end = add_months(month, 1)
+        if name not in existing:
+            db.session.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF search_logs "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{end.isoformat()}')"
+            ))
+            db.session.add(SearchLogPartition(name=name, range_start=month, range_end=end))
+            created.append(name)
+        month = end
+    db.session.commit()
+    return created
+
+
+def archive_months(now, hot_months, rolled_up_to):
+    """
+    SQLite: move each completed month older than the hot window, and already
+    covered by the daily rollup, into its own archive table.
+    """
+    cutoff = min(add_months(month_start(now), 1 - hot_months), month_start(rolled_up_to))
+    table = SearchLog.__table__
+    archived = []
+
+    while True:
+        oldest = db.session.query(func.min(SearchLog.searched_at)).filter(SearchLog.searched_at < cutoff).scalar()
+        if oldest is None:
+            break
+
+        month = month_start(oldest)
+        end = add_months(month, 1)
+        name = partition_name(month)
+        archive = _archive_table(name)
+        in_month = (table.c.searched_at >= month) & (table.c.searched_at < end)
+
+        # A month is archived once; rows that arrive for it later are appended
+        archive.create(db.session.connection(), checkfirst=True)
+        counts = db.session.execute(
+            select(func.count(), func.sum(case((table.c.search_successful.is_(True), 1), else_=0))).where(in_month)
+        ).one()
+        db.session.execute(insert(archive).from_select(
+            [column.name for column in table.columns], select(*table.columns).where(in_month)
+        ))
+        db.session.execute(delete(table).where(in_month))
+
+        partition = db.session.get(SearchLogPartition, name)
+        if partition is None:
+            partition = SearchLogPartition(name=name, range_start=month, range_end=end,
+                                           row_count=0, successful_count=0)
+            db.session.add(partition)
+        partition.row_count += counts[0]
+        partition.successful_count += counts[1] or 0
+        db.session.commit()
+        archived.append(name)
+
+    return archived
+
+
+def apply_retention(now, retention_months, rolled_up_to):
+    """Drop monthly tables that ended more than retention_months ago (and are rolled up)"""
+    cutoff = min(add_months(month_start(now), -retention_months), rolled_up_to)
+    expired = SearchLogPartition.query.filter(SearchLogPartition.range_end <= cutoff) \
+        .order_by(SearchLogPartition.range_start).all()
+    dropped = []
+
+    for partition in expired:
+        name = partition.name
+        if _dialect() == 'postgresql':
+            total, successful = db.session.execute(text(
+                f"SELECT COUNT(*), COUNT(*) FILTER (WHERE search_successful) FROM {name}"
+            )).one()
+        else:
+            total, successful = partition.row_count or 0, partition.successful_count or 0
+
+        db.session.execute(text(f"DROP TABLE IF EXISTS {name}"))
+        db.session.delete(partition)
+        stats.bump(total_searches=-total, successful_searches=-successful)
+        db.session.commit()
+        dropped.append(name)
+
+    return dropped
+
+
+# ============= ROLLUPS =============
+
+def _watermark(name):
+    return db.session.get(RollupWatermark, name)
+
+
+def _set_watermark(name, value):
+    stmt = dialect_insert(RollupWatermark.__table__).values(name=name, rolled_up_to=value)
+    db.session.execute(stmt.on_conflict_do_update(
+        index_elements=['name'], set_={'rolled_up_to': stmt.excluded.rolled_up_to}
+    ))
+
+
+def _closed_until(unit, now):
+    """Start of the newest hour/day that is entirely in the past (plus the grace period)"""
+    closed = now - ROLLUP_GRACE
+    return datetime(closed.year, closed.month, closed.day, closed.hour if unit == 'hour' else 0)
+
+
+def rollup(model, unit, now):
+    """
+    Aggregate up to MAX_ROLLUP_SPAN of closed hours or days since the last
+    run into `model`: searches, successes and distinct IPs per zone (the
+    member's current zone, '' when nothing matched). Returns the new watermark.
+    """
+    closed_until = _closed_until(unit, now)
+    watermark = _watermark(model.__tablename__)
+    if watermark is not None:
+        start = watermark.rolled_up_to
+    else:
+        oldest = db.session.query(func.min(SearchLog.searched_at)).scalar()
+        if oldest is None:
+            _set_watermark(model.__tablename__, closed_until)
+            db.session.commit()
+            return closed_until
+        start = datetime(oldest.year, oldest.month, oldest.day, oldest.hour if unit == 'hour' else 0)
+
+    end = min(closed_until, start + MAX_ROLLUP_SPAN)
+    if end <= start:
+        return start
+
+    bucket = time_bucket(SearchLog.searched_at, unit)
+    zone = func.coalesce(Member.zone, '')
+    rows = db.session.query(
+        bucket, zone,
+        func.count(SearchLog.id),
+        func.sum(case((SearchLog.search_successful.is_(True), 1), else_=0)),
+        func.count(func.distinct(SearchLog.ip_address))
+    ).outerjoin(Member, Member.id == SearchLog.member_id) \
+        .filter(SearchLog.searched_at >= start, SearchLog.searched_at < end) \
+        .group_by(bucket, zone).all()
+
+    # Clear the range first so a run interrupted after its insert cannot double count
+    db.session.execute(delete(model).where(model.bucket_start >= start, model.bucket_start < end))
+    if rows:
+        db.session.execute(insert(model), [{
+            'bucket_start': parse_bucket(bucket_start),
+            'zone': zone_name,
+            'searches': searches,
+            'successes': successes or 0,
+            'unique_ips': unique_ips
+        } for bucket_start, zone_name, searches, successes, unique_ips in rows])
+    _set_watermark(model.__tablename__, end)
+    db.session.commit()
+    return end
+
+
+def rollup_all(model, unit, now):
+    """Repeat rollup() until it has caught up with the last closed bucket"""
+    closed_until = _closed_until(unit, now)
+    while True:
+        rolled_up_to = rollup(model, unit, now)
+        if rolled_up_to >= closed_until:
+            return rolled_up_to
+
+
+# ============= MAINTENANCE =============
+
+def run_maintenance(now=None):
+    """Periodic job: partitions ahead, rollups, archiving and retention"""
+    config = current_app.config
+    now = now or datetime.utcnow()
+    retention_months = config['SEARCH_LOG_RETENTION_MONTHS']
+    dialect = _dialect()
+
+    if dialect == 'postgresql':
+        created = ensure_partitions(now, config['SEARCH_LOG_PARTITIONS_AHEAD'])
+        if created:
+            print(f"🗂️ Created search log partitions: {', '.join(created)}")
+
+    rollup_all(SearchLogHourly, 'hour', now)
+    daily_until = rollup_all(SearchLogDaily, 'day', now)
+
+    if dialect == 'sqlite':
+        hot_months = config['SEARCH_LOG_HOT_MONTHS']
+        if retention_months:
+            hot_months = min(hot_months, retention_months)
+        archived = archive_months(now, max(hot_months, 1), daily_until)
+        if archived:
+            print(f"🗂️ Archived search logs into: {', '.join(archived)}")
+
+    if retention_months:
+        dropped = apply_retention(now, retention_months, daily_until)
+        if dropped:
+            print(f"🧹 Dropped expired search logs: {', '.join(dropped)}")
+
+    hourly_days = config['SEARCH_ROLLUP_HOURLY_RETENTION_DAYS']
+    if hourly_days:
+        db.session.execute(delete(SearchLogHourly).where(
+            SearchLogHourly.bucket_start < now - timedelta(days=hourly_days)
+        ))
+        db.session.commit()
+
+    analytics_days = config['SEARCH_ANALYTICS_RETENTION_DAYS']
+    if analytics_days:
+        search_analytics.prune(now - timedelta(days=analytics_days))
@@ -0,0 +1,172 @@
+"""
+Background writer that batches SearchLog inserts off the request thread
+"""
+import atexit
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import insert
+
+from models import db, SearchLog
+import stats
+import search_analytics
+
+
+class SearchLogWriter:
+    """
+    Queues search log rows in memory and flushes them in bulk from a daemon
+    thread, either when a batch fills up or when the flush interval elapses.
+
+    Overflow policies when the queue is full:
+      drop  - discard the new row (counted in `dropped`)
+      block - wait up to SEARCH_LOG_BLOCK_TIMEOUT seconds for space, then drop
+      sync  - write the row immediately in the calling thread
+    """
+
+    OVERFLOW_POLICIES = ('drop', 'block', 'sync')
+
+    def __init__(self, app=None):
+        self.app = None
+        self._queue = None
+        self._thread = None
+        self._pid = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.flushes = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.queue_size = app.config['SEARCH_LOG_QUEUE_SIZE']
+        self.batch_size = app.config['SEARCH_LOG_BATCH_SIZE']
+        self.flush_interval = app.config['SEARCH_LOG_FLUSH_INTERVAL']
+        self.block_timeout = app.config['SEARCH_LOG_BLOCK_TIMEOUT']
+        self.overflow = app.config['SEARCH_LOG_OVERFLOW']
+        if self.overflow not in self.OVERFLOW_POLICIES:
+            raise ValueError(f'Invalid SEARCH_LOG_OVERFLOW. Must be one of: {", ".join(self.OVERFLOW_POLICIES)}')
+
+        self._queue = queue.Queue(maxsize=self.queue_size)
+        app.extensions['search_log_writer'] = self
+        atexit.register(self.stop)
+
+    def log(self, **values):
+        """Queue one SearchLog row; returns immediately unless the queue is full"""
+        values.setdefault('searched_at', datetime.utcnow())
+        self._ensure_started()
+
+        try:
+            self._queue.put_nowait(values)
+        except queue.Full:
+            self._handle_overflow(values)
+            return
+
+        with self._lock:
+            self.enqueued += 1
+
+    def _handle_overflow(self, row):
+        if self.overflow == 'block':
+            try:
+                self._queue.put(row, timeout=self.block_timeout)
+                with self._lock:
+                    self.enqueued += 1
+                return
+            except queue.Full:
+                pass
+        elif self.overflow == 'sync':
+            self._write([row])
+            return
+
+        with self._lock:
+            self.dropped += 1
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+
+            # After a fork the parent's queue and thread are not ours to drain
+            if self._pid is not None and self._pid != os.getpid():
+                self._queue = queue.Queue(maxsize=self.queue_size)
+
+            self._pid = os.getpid()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='search-log-writer', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not (self._stop.is_set() and self._queue.empty()):
+            batch = self._collect_batch()
+            if batch:
+                self._write(batch)
+
+    def _collect_batch(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+
+        while len(batch) < self.batch_size:
+            try:
+                if self._stop.is_set():
+                    batch.append(self._queue.get_nowait())
+                    continue
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _write(self, rows):
+        with self.app.app_context():
+            try:
+                db.session.execute(insert(SearchLog), rows)
+                stats.bump(
+                    total_searches=len(rows),
+                    successful_searches=sum(1 for row in rows if row['search_successful'])
+                )
+                search_analytics.record(rows)
+                db.session.commit()
+                with self._lock:
+                    self.written += len(rows)
+                    self.flushes += 1
+            except Exception as e:
+                db.session.rollback()
+                with self._lock:
+                    self.failed += len(rows)
+                print(f"Failed to log {len(rows)} searches: {str(e)}")
+
+    def stop(self, timeout=10):
+        """Drain everything queued so far and stop the worker thread"""
+        thread = self._thread
+        if thread is None or not thread.is_alive() or self._pid != os.getpid():
+            return
+
+        self._stop.set()
+        thread.join(timeout)
+        self._thread = None
+
+    def stats(self):
+        with self._lock:
+            return {
+                'queued': self._queue.qsize() if self._queue else 0,
+                'queue_size': self.queue_size,
+                'overflow_policy': self.overflow,
+                'enqueued': self.enqueued,
+                'written': self.written,
+                'dropped': self.dropped,
+                'failed': self.failed,
+                'flushes': self.flushes
+            }
@@ -0,0 +1,122 @@
+"""
+Dashboard counters kept in the stat_counters table.
+
+Write paths call bump()/bump_zones() before committing their own
+transaction, so a counter changes together with the rows it describes.
+Per-zone counts live on the zones table itself.
+A periodic reconcile recomputes every counter from the base tables to
+correct any drift; setup_database seeds them with ensure_counters().
+"""
+from datetime import datetime
+
+from sqlalchemy import bindparam, func, select, update
+
+from db_utils import dialect_insert
+from models import (db, Member, Verification, MemberVerificationSummary, CorrectionRequest, SearchLog,
+                    SearchLogPartition, StatCounter, Zone)
+
+COUNTERS = ('total_members', 'total_verifications', 'verified_members', 'pending_corrections',
+            'total_searches', 'successful_searches')
+
+
+def bump(**deltas):
+    """Add deltas to named counters, e.g. bump(total_members=1)"""
+    _apply(deltas)
+
+
+def bump_zones(zone_deltas):
+    """
+    Add per-zone member count deltas by zone name, e.g.
+    bump_zones({'Zone A': 1, 'Zone B': -1}). New zones must exist already
+    (zones.ensure_zones).
+    """
+    _apply_zones(Zone.member_count, zone_deltas)
+
+
+def bump_zone_verifications(zone_deltas):
+    """Add per-zone verification count deltas by zone name"""
+    _apply_zones(Zone.verification_count, zone_deltas)
+
+
+def _apply_zones(column, zone_deltas):
+    rows = [{'zone_name': zone, 'delta': delta} for zone, delta in sorted(zone_deltas.items()) if delta]
+    if rows:
+        db.session.execute(
+            update(Zone.__table__)
+            .where(Zone.__table__.c.name == bindparam('zone_name'))
+            .values({column.key: column + bindparam('delta')}),
+            rows
+        )
+
+
+def _apply(deltas):
+    now = datetime.utcnow()
+    rows = [{'name': name, 'value': delta, 'updated_at': now} for name, delta in deltas.items() if delta]
+    if not rows:
+        return
+
+    stmt = dialect_insert(StatCounter.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['name'],
+        set_={'value': StatCounter.__table__.c.value + stmt.excluded.value, 'updated_at': stmt.excluded.updated_at}
+    )
+    db.session.execute(stmt, rows)
+
+
+def read_stats():
+    """
+    Counters as returned by /admin/stats: one small indexed read. Counters
+    not seeded yet read as 0 until setup_database or the reconcile task runs.
+    """
+    values = dict(db.session.execute(select(StatCounter.name, StatCounter.value)).all())
+
+    zones = db.session.execute(
+        select(Zone.name).where(Zone.member_count > 0).order_by(Zone.name)
+    ).scalars().all()
+    stats = {name: values.get(name, 0) for name in COUNTERS}
+    stats['zones'] = zones
+    stats['total_zones'] = len(zones)
+    return stats
+
+
+def ensure_counters():
+    """Seed the counters with a reconcile if any are missing (a database not built by the migrations)"""
+    seeded = db.session.execute(select(func.count()).where(StatCounter.name.in_(COUNTERS))).scalar()
+    if seeded < len(COUNTERS):
+        reconcile()
+
+
+def reconcile():
+    """
+    Recompute every counter from the base tables (full scans) and upsert the
+    results, so the rows bump() adds to are never missing mid-reconcile.
+    """
+    now = datetime.utcnow()
+    # SQLite keeps archived months outside search_logs; the catalog has their counts
+    archived, archived_successful = db.session.query(
+        func.coalesce(func.sum(SearchLogPartition.row_count), 0),
+        func.coalesce(func.sum(SearchLogPartition.successful_count), 0)
+    ).one()
+    rows = [
+        ('total_members', db.session.query(func.count(Member.id)).scalar()),
+        ('total_verifications', db.session.query(func.count(Verification.id)).scalar()),
+        ('verified_members', db.session.query(func.count(MemberVerificationSummary.member_id)).scalar()),
+        ('pending_corrections', db.session.query(func.count(CorrectionRequest.id))
+            .filter(CorrectionRequest.status == 'pending').scalar()),
+        ('total_searches', db.session.query(func.count(SearchLog.id)).scalar() + archived),
+        ('successful_searches', db.session.query(func.count(SearchLog.id))
+            .filter(SearchLog.search_successful.is_(True)).scalar() + archived_successful)
+    ]
+    db.session.execute(update(Zone).values(
+        member_count=select(func.count(Member.id)).where(Member.zone_id == Zone.id).scalar_subquery(),
+        verification_count=select(func.count(Verification.id)).where(Verification.zone_id == Zone.id)
+        .scalar_subquery()
+    ))
+
+    stmt = dialect_insert(StatCounter.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['name'],
+        set_={'value': stmt.excluded.value, 'updated_at': stmt.excluded.updated_at}
+    )
+    db.session.execute(stmt, [{'name': name, 'value': value or 0, 'updated_at': now} for name, value in rows])
+    db.session.commit()
@@ -0,0 +1,102 @@
+"""
+Periodic background tasks (reconcile jobs, compactors, senders)
+"""
+import os
+import socket
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy import or_, update
+
+from db_utils import dialect_insert
+from models import db, TaskLease
+
+
+def acquire_lease(name, seconds):
+    """
+    Claim the named lease for `seconds` if it is free, expired or already
+    ours. Returns True when this process holds it.
+    """
+    now = datetime.utcnow()
+    holder = f"{socket.gethostname()}:{os.getpid()}"[:100]
+
+    db.session.execute(
+        dialect_insert(TaskLease.__table__)
+        .values(name=name, holder=None, expires_at=datetime(1970, 1, 1))
+        .on_conflict_do_nothing(index_elements=['name'])
+    )
+    result = db.session.execute(
+        update(TaskLease)
+        .where(TaskLease.name == name, or_(TaskLease.expires_at < now, TaskLease.holder == holder))
+        .values(holder=holder, expires_at=now + timedelta(seconds=seconds))
+    )
+    db.session.commit()
+    return result.rowcount == 1
+
+
+class PeriodicTask:
+    """
+    Runs fn() inside an app context every `interval` seconds on a daemon
+    thread. The thread is started lazily from the first request so each
+    forked gunicorn worker gets its own. An interval of 0 disables the task.
+
+    With lease=True only one worker across the deployment runs the task per
+    interval (tasks that are not safe or not worth running concurrently);
+    the others skip their turn.
+    """
+
+    def __init__(self, name, fn, interval, app=None, lease=False):
+        self.name = name
+        self.fn = fn
+        self.interval = interval
+        self.lease = lease
+        self.app = None
+        self._thread = None
+        self._pid = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.skipped = 0
+        self.failures = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        app.before_request(self.ensure_started)
+
+    def ensure_started(self):
+        if not self.interval:
+            return
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def run_once(self):
+        with self.app.app_context():
+            try:
+                if self.lease and not acquire_lease(self.name, self.interval):
+                    self.skipped += 1
+                    return
+                self.fn()
+                self.runs += 1
+            except Exception as e:
+                db.session.rollback()
+                self.failures += 1
+                print(f"⚠️ {self.name} failed: {str(e)}")
+            finally:
+                db.session.remove()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.run_once()
+
+    def stop(self):
+        self._stop.set()
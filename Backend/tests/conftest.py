@@ -0,0 +1,91 @@
+"""
+Shared fixtures. Every test gets its own app on a scratch copy of a migrated
+database. The migrations start from the original schema, so the template is
+built once per session from instance/sacco_members.db.
+
+    pip install -r requirements-dev.txt
+    python -m pytest tests
+"""
+import os
+import shutil
+import sys
+
+import pytest
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+from app import create_app, setup_database  # noqa: E402
+from models import db, Member  # noqa: E402
+import stats  # noqa: E402
+import zones  # noqa: E402
+
+ADMIN = {'username': 'admin', 'password': 'admin123'}  # created by setup_database
+MEMBER = {'name': 'Jane Wanjiru', 'member_number': 'M100', 'id_number': '12345678', 'zone': 'Zone A'}
+
+
+def app_config(folder, database_url, **overrides):
+    config = {
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': database_url,
+        'SESSION_COOKIE_SECURE': False,
+        'UPLOAD_FOLDER': os.path.join(folder, 'uploads'),
+        'JOB_OUTPUT_FOLDER': os.path.join(folder, 'jobs'),
+        'PDF_CACHE_FOLDER': os.path.join(folder, 'pdf_cache'),
+        'SEARCH_RATE_LIMIT_PER_MINUTE': 0,
+        'MAIL_ENABLED': False,
+        # Background tasks are driven by the tests themselves
+        'MAIL_OUTBOX_INTERVAL': 0,
+        'STATS_RECONCILE_SECONDS': 0,
+        'SEARCH_LOG_MAINTENANCE_SECONDS': 0,
+        'REPLICA_HEALTH_SECONDS': 0
+    }
+    config.update(overrides)
+    return config
+
+
+@pytest.fixture(scope='session')
+def template_db(tmp_path_factory):
+    """Migrated database with the default admin and one member"""
+    folder = str(tmp_path_factory.mktemp('template'))
+    path = os.path.join(folder, 'template.db')
+    shutil.copy(os.path.join(BACKEND, 'instance', 'sacco_members.db'), path)
+
+    cwd = os.getcwd()
+    os.chdir(BACKEND)  # Flask-Migrate looks for ./migrations
+    try:
+        app = create_app(app_config(folder, f'sqlite:///{path}'))
+        with app.app_context():
+            setup_database()
+            db.session.add(Member(zone_id=zones.zone_id(MEMBER['zone']), status='active', **MEMBER))
+            db.session.commit()
+            stats.reconcile()
+            db.engine.dispose()  # checkpoints the WAL so the file can be copied
+    finally:
+        os.chdir(cwd)
+    return path
+
+
+@pytest.fixture
+def make_db(template_db, tmp_path):
+    """Copy the template to tmp_path/<name> and return its SQLAlchemy URL"""
+    def make(name):
+        path = tmp_path / name
+        shutil.copy(template_db, path)
+        return f'sqlite:///{path}'
+    return make
+
+
+@pytest.fixture
+def make_app(make_db, tmp_path):
+    """create_app() on a fresh copy of the template; keyword arguments override the config"""
+    def make(**overrides):
+        database_url = overrides.pop('SQLALCHEMY_DATABASE_URI', None) or make_db('primary.db')
+        return create_app(app_config(str(tmp_path), database_url, **overrides))
+    return make
+
+
+def login(client):
+    response = client.post('/auth/login', json=ADMIN)
+    assert response.status_code == 200, response.get_json()
+    return client
@@ -0,0 +1,48 @@
+"""Job runner: queued jobs whose worker went away are failed, not left queued"""
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from models import db, Job
+
+
+def test_queued_job_of_a_gone_worker_fails(make_app):
+    app = make_app(JOB_STALE_SECONDS=60)
+    runner = app.extensions['job_runner']
+    with app.app_context():
+        # Queued by a worker that restarted before it started the job
+        db.session.add(Job(id='a' * 32, kind='bulk_upload', status='queued', owner='web-1:4242:20261017090000000000',
+                           updated_at=datetime.utcnow() - timedelta(seconds=61)))
+        db.session.commit()
+
+        job = runner.get('a' * 32)
+        assert job.status == 'failed'
+        assert 'never started' in job.error
+
+
+def test_heartbeat_keeps_jobs_waiting_in_this_worker_queued(make_app):
+    app = make_app(JOB_STALE_SECONDS=60, JOB_WORKERS=1)
+    runner = app.extensions['job_runner']
+    release = threading.Event()
+
+    def blocker(progress):
+        release.wait(10)
+        return {}
+
+    with app.app_context():
+        running = runner.submit('bulk_upload', blocker)
+        waiting = runner.submit('bulk_upload', blocker)
+        assert waiting.owner == runner.owner
+        try:
+            db.session.execute(update(Job).where(Job.id == waiting.id)
+                               .values(updated_at=datetime.utcnow() - timedelta(seconds=61)))
+            db.session.commit()
+            runner.heartbeat()
+            assert runner.get(waiting.id).status == 'queued'
+        finally:
+            release.set()
+            runner._get_executor().shutdown(wait=True)
+        db.session.expire_all()
+        assert runner.get(running.id).status == 'succeeded'
+        assert runner.get(waiting.id).status == 'succeeded'
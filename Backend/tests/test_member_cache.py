@@ -0,0 +1,41 @@
+"""Member cache: a /search lookup that races an admin write must not cache the old row"""
+from sqlalchemy import event
+
+from cache import LRUCache
+from conftest import MEMBER
+from models import db
+
+SEARCH = {'member_number': MEMBER['member_number'], 'id_number': MEMBER['id_number']}
+
+
+def test_set_from_before_a_clear_is_dropped():
+    cache = LRUCache(maxsize=10)
+    generation = cache.generation
+    cache.clear()
+    cache.set('key', 'old', generation)
+    assert cache.get('key') is None
+    assert cache.stats()['stale_sets'] == 1
+
+    cache.set('key', 'new', cache.generation)
+    assert cache.get('key') == 'new'
+
+
+def test_lookup_racing_a_cache_clear_is_not_cached(make_app):
+    app = make_app()
+    member_cache = app.extensions['member_cache']
+
+    def clear_during_lookup(conn, cursor, statement, parameters, context, executemany):
+        if 'FROM members' in statement:
+            # An admin edit commits and clears the cache while the lookup query runs
+            member_cache.clear()
+
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', clear_during_lookup)
+    client = app.test_client()
+    assert client.post('/search', json=SEARCH).get_json()['found'] is True
+    assert member_cache.stats()['size'] == 0
+
+    with app.app_context():
+        event.remove(db.engine, 'before_cursor_execute', clear_during_lookup)
+    client.post('/search', json=SEARCH)
+    assert member_cache.stats()['size'] == 1
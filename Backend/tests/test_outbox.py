@@ -0,0 +1,174 @@
+"""Outbox sending and correction digests against a local aiosmtpd server"""
+import socket
+from datetime import datetime, timedelta
+from email import message_from_bytes
+
+import pytest
+from aiosmtpd.controller import Controller
+from sqlalchemy import update
+
+from conftest import MEMBER
+from models import db, EmailOutbox, Member
+import outbox
+
+ADMIN_EMAIL = 'admin@example.com'
+
+
+class Inbox:
+    """aiosmtpd handler that keeps what it receives and can refuse the next few messages"""
+
+    def __init__(self):
+        self.messages = []
+        self.refuse = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.refuse:
+            self.refuse -= 1
+            return '451 Requested action aborted: try again later'
+        self.messages.append(message_from_bytes(envelope.content))
+        return '250 OK'
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def inbox():
+    handler = Inbox()
+    controller = Controller(handler, hostname='127.0.0.1', port=free_port())
+    controller.start()
+    yield handler, controller.port
+    controller.stop()
+
+
+@pytest.fixture
+def mail_app(make_app, inbox):
+    def make(**overrides):
+        return make_app(MAIL_ENABLED=True, MAIL_SERVER='127.0.0.1', MAIL_PORT=inbox[1], MAIL_USE_TLS=False,
+                        MAIL_USERNAME='', ADMIN_EMAIL=ADMIN_EMAIL, **overrides)
+    return make
+
+
+def enqueue(count):
+    for n in range(count):
+        outbox.enqueue([ADMIN_EMAIL], f'Message {n}', 'body')
+    db.session.commit()
+
+
+def statuses():
+    return [message.status for message in EmailOutbox.query.order_by(EmailOutbox.id)]
+
+
+def test_message_is_claimed_once(mail_app):
+    app = mail_app()
+    sender = app.extensions['outbox_sender']
+    with app.app_context():
+        enqueue(3)
+        now = datetime.utcnow()
+
+        assert len(sender._claim(now)) == 3
+        assert sender._claim(now) == []
+        assert statuses() == ['sending'] * 3
+
+        # A claim left 'sending' past its lease (the worker died) is taken again
+        assert len(sender._claim(now + timedelta(seconds=outbox.CLAIM_SECONDS + 1))) == 3
+
+
+def test_drain_sends_each_message_once_per_batch_connection(mail_app, inbox):
+    app = mail_app(MAIL_OUTBOX_BATCH_SIZE=2)
+    sender = app.extensions['outbox_sender']
+    with app.app_context():
+        enqueue(5)
+        assert sender.drain() == 5
+        assert sender.drain() == 0
+
+        assert sorted(message['Subject'] for message in inbox[0].messages) == [f'Message {n}' for n in range(5)]
+        assert statuses() == ['sent'] * 5
+        assert sender.stats()['connections'] == 3
+
+
+def test_smtp_failure_is_retried_with_backoff(mail_app, inbox):
+    app = mail_app(MAIL_RETRY_BASE_SECONDS=30, MAIL_MAX_ATTEMPTS=3)
+    sender = app.extensions['outbox_sender']
+    handler = inbox[0]
+    with app.app_context():
+        enqueue(1)
+        handler.refuse = 1
+        before = datetime.utcnow()
+
+        assert sender.drain() == 0
+        message = EmailOutbox.query.one()
+        assert (message.status, message.attempts) == ('pending', 1)
+        assert message.last_error.startswith('(451')
+        assert message.next_attempt_at >= before + timedelta(seconds=30)
+        # Not due yet
+        assert sender.drain() == 0
+
+        db.session.execute(update(EmailOutbox).values(next_attempt_at=datetime.utcnow()))
+        db.session.commit()
+        assert sender.drain() == 1
+        assert [m['Subject'] for m in handler.messages] == ['Message 0']
+        assert EmailOutbox.query.one().status == 'sent'
+        assert sender.stats()['retried'] == 1
+
+
+def test_message_fails_after_max_attempts(mail_app, inbox):
+    app = mail_app(MAIL_RETRY_BASE_SECONDS=0, MAIL_MAX_ATTEMPTS=2)
+    sender = app.extensions['outbox_sender']
+    with app.app_context():
+        enqueue(1)
+        inbox[0].refuse = 2
+        sender.drain()
+        sender.drain()
+
+        message = EmailOutbox.query.one()
+        assert (message.status, message.attempts) == ('failed', 2)
+        assert sender.stats()['failed'] == 1
+        assert inbox[0].messages == []
+
+
+def submit_correction(client, member_id, correct_name):
+    response = client.post('/submit-correction', json={
+        'member_id': member_id,
+        'member_number': MEMBER['member_number'],
+        'id_number': MEMBER['id_number'],
+        'current_name': MEMBER['name'],
+        'current_zone': MEMBER['zone'],
+        'current_status': 'active',
+        'correct_name': correct_name,
+        'correct_zone': MEMBER['zone'],
+        'email': 'jane@example.com'
+    })
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()['correction_id']
+
+
+def test_held_corrections_are_folded_into_one_digest(mail_app, inbox):
+    app = mail_app(MAIL_DIGEST_SECONDS=60)
+    sender = app.extensions['outbox_sender']
+    client = app.test_client()
+    with app.app_context():
+        member_id = Member.query.filter_by(member_number=MEMBER['member_number']).one().id
+    ids = [submit_correction(client, member_id, name) for name in ('Jane W.', 'Jane Kamau', 'Janet Wanjiru')]
+
+    with app.app_context():
+        assert statuses() == ['held'] * 3
+        # Inside the window nothing goes out
+        assert sender.drain() == 0
+        assert inbox[0].messages == []
+
+        db.session.execute(update(EmailOutbox).values(created_at=datetime.utcnow() - timedelta(seconds=120)))
+        db.session.commit()
+        assert sender.drain() == 1
+        assert sender.drain() == 0
+
+        [digest] = inbox[0].messages
+        assert digest['Subject'] == 'Member Correction Requests - 3 new'
+        assert digest['To'] == ADMIN_EMAIL
+        rows = digest.get_payload(decode=True).decode().splitlines()
+        assert sorted(int(row.split()[0]) for row in rows if 'PENDING' in row) == ids
+        assert statuses() == ['digested'] * 3 + ['sent']
+        assert sender.stats()['digested'] == 3
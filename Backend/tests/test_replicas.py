@@ -0,0 +1,177 @@
+"""Read replica routing against a primary and replica SQLite file"""
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+import pytest
+from sqlalchemy import event
+
+from conftest import MEMBER, login
+from models import db
+
+
+def rename_member(database_url, name):
+    with closing(sqlite3.connect(database_url[len('sqlite:///'):])) as connection:
+        connection.execute("UPDATE members SET name = ? WHERE member_number = ?", (name, MEMBER['member_number']))
+        connection.commit()
+
+
+class StatementLog:
+    """Statements run by request handling (the test's own thread) per bind key"""
+
+    def __init__(self, app):
+        self.counts = {}
+        self.statements = []
+        with app.app_context():
+            for key, engine in db.engines.items():
+                event.listen(engine, 'before_cursor_execute', self._counter(key))
+
+    def _counter(self, key):
+        def count(conn, cursor, statement, parameters, context, executemany):
+            if threading.current_thread() is threading.main_thread():
+                self.counts[key] = self.counts.get(key, 0) + 1
+                self.statements.append((key, statement))
+        return count
+
+    def reset(self):
+        self.counts = {}
+        self.statements = []
+
+
+@pytest.fixture
+def replica_url(make_db):
+    url = make_db('replica.db')
+    rename_member(url, 'Replica copy')
+    return url
+
+
+@pytest.fixture
+def app(make_app, replica_url):
+    return make_app(DATABASE_REPLICA_URLS=[replica_url], REPLICA_STICKY_SECONDS=60, MEMBER_CACHE_SIZE=0)
+
+
+def admin_client(app):
+    """Signed in, without the primary pin that writing last_login leaves on the session"""
+    client = login(app.test_client())
+    with client.session_transaction() as session:
+        session.pop('read_primary_until', None)
+    return client
+
+
+def clear_caches(app):
+    for name in ('member_cache', 'analytics_cache', 'zone_cache'):
+        app.extensions[name].clear()
+
+
+SEARCH = {'member_number': MEMBER['member_number'], 'id_number': MEMBER['id_number']}
+
+READ_ONLY = [
+    ('POST', '/search', SEARCH),
+    ('GET', '/admin/members', None),
+    ('GET', '/admin/members?search=Jane', None),
+    ('GET', '/admin/stats', None),
+    ('GET', '/admin/zones', None),
+    ('GET', '/admin/users', None),
+    ('GET', '/admin/verifications', None),
+    ('GET', '/admin/verifications/by-zone', None),
+    ('GET', '/admin/corrections', None),
+    ('GET', '/admin/search-logs', None),
+    ('GET', '/admin/analytics/searches?range=7d', None),
+    ('GET', '/admin/export/members', None),
+    ('GET', '/admin/export/search-logs', None)
+]
+
+
+@pytest.mark.parametrize('method,url,body', READ_ONLY, ids=[f'{m} {u}' for m, u, _ in READ_ONLY])
+def test_read_only_endpoint_reads_only_from_replica(app, method, url, body):
+    client = admin_client(app)
+    log = StatementLog(app)
+    # Warm the per-process lookups (permissions, search backend detection) that use the primary
+    client.open(url, method=method, json=body).get_data()
+    clear_caches(app)
+    log.reset()
+
+    response = client.open(url, method=method, json=body)
+    response.get_data()
+
+    assert response.status_code == 200, response.get_data(as_text=True)
+    assert log.counts.get('replica_0', 0) > 0
+    assert log.counts.get(None, 0) == 0, log.statements
+    with client.session_transaction() as session:
+        assert 'read_primary_until' not in session
+
+    replica = app.extensions['replica_router'].stats()['replicas'][0]
+    assert replica['reads'] >= log.counts['replica_0']
+
+
+def test_public_search_returns_replica_data(app):
+    response = app.test_client().post('/search', json=SEARCH)
+    assert response.get_json()['member']['name'] == 'Replica copy'
+
+
+def member_name(client):
+    members = client.get('/admin/members').get_json()['members']
+    return next(m['name'] for m in members if m['member_number'] == MEMBER['member_number'])
+
+
+def test_admin_edit_pins_reads_to_primary(app):
+    client = admin_client(app)
+    assert member_name(client) == 'Replica copy'
+    member_id = next(m['id'] for m in client.get('/admin/members').get_json()['members']
+                     if m['member_number'] == MEMBER['member_number'])
+
+    response = client.put(f'/admin/members/{member_id}', json={'name': 'Edited on primary'})
+    assert response.status_code == 200
+    with client.session_transaction() as session:
+        assert session['read_primary_until'] > time.time()
+
+    log = StatementLog(app)
+    assert member_name(client) == 'Edited on primary'
+    assert log.counts.get('replica_0', 0) == 0
+
+    with client.session_transaction() as session:
+        session['read_primary_until'] = time.time() - 1
+    assert member_name(client) == 'Replica copy'
+
+    # Other clients were never pinned
+    assert app.test_client().post('/search', json=SEARCH).get_json()['member']['name'] == 'Replica copy'
+
+
+def test_failed_health_check_falls_back_to_primary(make_app, make_db, tmp_path):
+    missing = tmp_path / 'not-there' / 'replica.db'
+    app = make_app(DATABASE_REPLICA_URLS=[f'sqlite:///{missing}'], MEMBER_CACHE_SIZE=0)
+    router = app.extensions['replica_router']
+    client = app.test_client()
+
+    with app.app_context():
+        router.check()
+    assert router.stats()['replicas'][0]['healthy'] is False
+    assert client.post('/search', json=SEARCH).get_json()['member']['name'] == MEMBER['name']
+    assert router.stats()['primary_fallbacks'] == 1
+
+    missing.parent.mkdir()
+    missing.write_bytes((tmp_path / 'primary.db').read_bytes())
+    rename_member(f'sqlite:///{missing}', 'Replica copy')
+    with app.app_context():
+        router.check()
+    assert router.stats()['replicas'][0]['healthy'] is True
+    assert client.post('/search', json=SEARCH).get_json()['member']['name'] == 'Replica copy'
+
+
+def test_replicas_are_used_round_robin(make_app, make_db):
+    urls = [make_db('replica_a.db'), make_db('replica_b.db')]
+    rename_member(urls[0], 'Replica A')
+    rename_member(urls[1], 'Replica B')
+    app = make_app(DATABASE_REPLICA_URLS=urls, MEMBER_CACHE_SIZE=0)
+    client = app.test_client()
+
+    names = [client.post('/search', json=SEARCH).get_json()['member']['name'] for _ in range(4)]
+    assert names == ['Replica A', 'Replica B', 'Replica A', 'Replica B']
+
+
+def test_replica_connections_refuse_writes(app):
+    with app.app_context():
+        with db.engines['replica_0'].connect() as connection:
+            with pytest.raises(Exception, match='readonly|read-only'):
+                connection.exec_driver_sql("UPDATE members SET name = 'x'")
@@ -0,0 +1,42 @@
+"""Dashboard counters"""
+from sqlalchemy import delete, select
+
+from conftest import login
+from models import db, Member, StatCounter
+import stats
+
+
+def counters():
+    return dict(db.session.execute(select(StatCounter.name, StatCounter.value)).all())
+
+
+def test_stats_endpoint_does_not_reconcile_missing_counters(make_app):
+    app = make_app()
+    with app.app_context():
+        db.session.execute(delete(StatCounter))
+        db.session.commit()
+
+    response = login(app.test_client()).get('/admin/stats')
+    assert response.status_code == 200
+    assert response.get_json()['total_members'] == 0
+    with app.app_context():
+        assert counters() == {}
+
+        stats.ensure_counters()
+        assert counters()['total_members'] == Member.query.count()
+
+
+def test_reconcile_overwrites_drifted_counters_in_place(make_app):
+    app = make_app()
+    with app.app_context():
+        members = Member.query.count()
+        pending = counters()['pending_corrections']
+        stats.bump(total_members=5, pending_corrections=-2)
+        db.session.commit()
+        assert counters()['total_members'] == members + 5
+
+        stats.reconcile()
+        values = counters()
+        assert values['total_members'] == members
+        assert values['pending_corrections'] == pending
+        assert set(values) >= set(stats.COUNTERS)
@@ -0,0 +1,65 @@
+"""
+Per-member verification summary kept beside the raw verifications table.
+
+record() upserts member_verification_summary in the caller's transaction,
+so "has this member verified", "when" and "how many members have verified
+per zone" never need to scan or COUNT DISTINCT the raw rows.
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import func
+
+from db_utils import dialect_insert
+from models import db, Member, MemberVerificationSummary, Zone
+import stats
+
+
+def is_repeat(member_id, window_seconds, now=None):
+    """True when the member already verified within the last window_seconds"""
+    if not window_seconds:
+        return False
+    last = db.session.query(MemberVerificationSummary.last_verified_at) \
+        .filter_by(member_id=member_id).scalar()
+    now = now or datetime.utcnow()
+    return last is not None and last > now - timedelta(seconds=window_seconds)
+
+
+def record(member_id, verified_at):
+    """Count one new Verification row for the member. Does not commit."""
+    table = MemberVerificationSummary.__table__
+    stmt = dialect_insert(table).values(
+        member_id=member_id, first_verified_at=verified_at, last_verified_at=verified_at, verification_count=1
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['member_id'],
+        set_={'last_verified_at': stmt.excluded.last_verified_at,
+              'verification_count': table.c.verification_count + 1}
+    ).returning(table.c.verification_count)
+
+    if db.session.execute(stmt).scalar() == 1:
+        stats.bump(verified_members=1)
+
+
+def zone_counts():
+    """Verified / unverified members per zone, from the summary and the zone member counts"""
+    verified = dict(
+        db.session.query(Member.zone_id, func.count(MemberVerificationSummary.member_id))
+        .join(Member, Member.id == MemberVerificationSummary.member_id)
+        .group_by(Member.zone_id).all()
+    )
+
+    zones = []
+    for zone in Zone.query.order_by(Zone.name):
+        total = zone.member_count
+        done = verified.get(zone.id, 0)
+        if not total and not done:
+            continue
+        zones.append({
+            'zone': zone.name,
+            'zone_id': zone.id,
+            'members': total,
+            'verified': done,
+            'unverified': max(total - done, 0),
+            'verified_rate': round(done / total, 4) if total else None
+        })
+    return zones
@@ -0,0 +1,36 @@
+"""
+Zone dimension table: members and verifications reference zones by id
+"""
+from sqlalchemy import select
+
+from db_utils import dialect_insert
+from models import db, Zone
+
+
+def ensure_zones(names):
+    """
+    Return {name: id} for the given zone names, creating missing zones in
+    the caller's transaction. Does not commit.
+    """
+    names = sorted({name for name in names if name})
+    if not names:
+        return {}
+
+    db.session.execute(
+        dialect_insert(Zone.__table__).on_conflict_do_nothing(index_elements=['name']),
+        [{'name': name, 'member_count': 0, 'verification_count': 0} for name in names]
+    )
+    return dict(db.session.execute(select(Zone.name, Zone.id).where(Zone.name.in_(names))).all())
+
+
+def zone_id(name):
+    return ensure_zones([name])[name]
+
+
+def find_zone_id(name):
+    """Id of an existing zone, or None"""
+    return db.session.query(Zone.id).filter_by(name=name).scalar()
+
+
+def list_zones():
+    return [zone.to_dict() for zone in Zone.query.order_by(Zone.name)]
@@ -49,7 +49,7 @@ export default function PublicSearch() {
       if (data.found) {
         setResult(data.member);
       } else {
-        setError(data.message || 'No member found with the provided details');
+        setError(data.message || data.error || 'No member found with the provided details');
       }
     } catch (err) {
       setError('Network error. Please try again.');
@@ -2,6 +2,27 @@ import React, { useState, useEffect } from 'react';
 
 const API_URL = import.meta.env.VITE_API_URL || 'http://127.0.0.1:5000';
 
+// Lists page with keyset cursors while browsing (every page costs the same as the
+// first); searches use numbered pages so results stay in relevance order
+const FIRST_PAGE = { page: 1, cursor: '' };
+const NO_LINKS = { next: '', prev: '', hasNext: false, hasPrev: false, pages: null };
+// Stop polling a job that has shown no progress for this many one-second polls
+const JOB_STALL_POLLS = 15 * 60;
+
+const pagingParams = (paging, searching) => (searching ? { page: paging.page } : { cursor: paging.cursor });
+
+const pageLinks = (data, perPage) => ({
+  next: data.next_cursor || '',
+  prev: data.prev_cursor || '',
+  hasNext: Boolean(data.has_next),
+  hasPrev: Boolean(data.has_prev),
+  pages: data.pages || (data.total != null ? Math.max(1, Math.ceil(data.total / perPage)) : null)
+});
+
+const nextPage = (paging, links) => ({ page: paging.page + 1, cursor: links.next });
+const prevPage = (paging, links) => ({ page: Math.max(1, paging.page - 1), cursor: links.prev });
+const pageLabel = (paging, links) => (links.pages ? `Page ${paging.page} of ${links.pages}` : `Page ${paging.page}`);
+
 export default function AdminPanel() {
   const [currentUser, setCurrentUser] = useState(null);
   const [members, setMembers] = useState([]);
@@ -18,17 +39,17 @@ export default function AdminPanel() {
   const [activeTab, setActiveTab] = useState('add');
   const [mainSection, setMainSection] = useState('members');
   const [loading, setLoading] = useState(true);
-  const [currentPage, setCurrentPage] = useState(1);
-  const [totalPages, setTotalPages] = useState(1);
+  const [memberPaging, setMemberPaging] = useState(FIRST_PAGE);
+  const [memberLinks, setMemberLinks] = useState(NO_LINKS);
   const [itemsPerPage] = useState(50);
   const [searchFilter, setSearchFilter] = useState('');
-  const [verificationPage, setVerificationPage] = useState(1);
-  const [verificationPages, setVerificationPages] = useState(1);
-  const [correctionPage, setCorrectionPage] = useState(1);
-  const [correctionPages, setCorrectionPages] = useState(1);
+  const [verificationPaging, setVerificationPaging] = useState(FIRST_PAGE);
+  const [verificationLinks, setVerificationLinks] = useState(NO_LINKS);
+  const [correctionPaging, setCorrectionPaging] = useState(FIRST_PAGE);
+  const [correctionLinks, setCorrectionLinks] = useState(NO_LINKS);
   const [correctionFilter, setCorrectionFilter] = useState('all');
-  const [searchLogPage, setSearchLogPage] = useState(1);
-  const [searchLogPages, setSearchLogPages] = useState(1);
+  const [searchLogPaging, setSearchLogPaging] = useState(FIRST_PAGE);
+  const [searchLogLinks, setSearchLogLinks] = useState(NO_LINKS);
   const [searchLogFilter, setSearchLogFilter] = useState('all');
   const [selectedMembers, setSelectedMembers] = useState([]);
   const [selectAll, setSelectAll] = useState(false);
@@ -95,7 +116,7 @@ useEffect(() => {
   
   setSelectedMembers([]);
   setSelectAll(false);
-}, [currentUser, currentPage, searchFilter, mainSection, verificationPage, correctionPage, correctionFilter, correctionSearchFilter, searchLogPage, searchLogFilter]);  const hasPermission = (permission) => {
+}, [currentUser, memberPaging, searchFilter, mainSection, verificationPaging, correctionPaging, correctionFilter, correctionSearchFilter, searchLogPaging, searchLogFilter]);  const hasPermission = (permission) => {
     if (!currentUser) return false;
     const permissions = {
       'super_admin': ['manage_users', 'manage_members', 'view_verifications', 'view_corrections', 'manage_corrections'],
@@ -109,12 +130,12 @@ useEffect(() => {
   const fetchMembers = async () => {
     if (!hasPermission('manage_members')) return;
     try {
-      const params = new URLSearchParams({ page: currentPage, per_page: itemsPerPage, search: searchFilter });
+      const params = new URLSearchParams({ ...pagingParams(memberPaging, searchFilter), per_page: itemsPerPage, search: searchFilter });
       const response = await fetch(`${API_URL}/admin/members?${params}`, { credentials: 'include' });
       if (response.ok) {
         const data = await response.json();
         setMembers(data.members || data);
-        if (data.total) setTotalPages(Math.ceil(data.total / itemsPerPage));
+        setMemberLinks(pageLinks(data, itemsPerPage));
       } else if (response.status === 401) {
         setError('Session expired. Please login again.');
       } else if (response.status === 403) {
@@ -144,12 +165,12 @@ useEffect(() => {
   const fetchVerifications = async () => {
     if (!hasPermission('view_verifications')) return;
     try {
-      const params = new URLSearchParams({ page: verificationPage, per_page: 20 });
+      const params = new URLSearchParams({ ...pagingParams(verificationPaging, false), per_page: 20 });
       const response = await fetch(`${API_URL}/admin/verifications?${params}`, { credentials: 'include' });
       if (response.ok) {
         const data = await response.json();
         setVerifications(data.verifications || []);
-        setVerificationPages(data.pages || 1);
+        setVerificationLinks(pageLinks(data, 20));
       }
     } catch (err) {
       console.error('Failed to fetch verifications');
@@ -160,7 +181,7 @@ useEffect(() => {
       if (!hasPermission('view_corrections')) return;
       try {
         const params = new URLSearchParams({ 
-          page: correctionPage, 
+          ...pagingParams(correctionPaging, correctionSearchFilter),
           per_page: 20, 
           status: correctionFilter,
           search: correctionSearchFilter  
@@ -169,7 +190,7 @@ useEffect(() => {
         if (response.ok) {
           const data = await response.json();
           setCorrections(data.corrections || []);
-          setCorrectionPages(data.pages || 1);
+          setCorrectionLinks(pageLinks(data, 20));
         }
       } catch (err) {
         console.error('Failed to fetch corrections');
@@ -178,12 +199,12 @@ useEffect(() => {
 
   const fetchSearchLogs = async () => {
     try {
-      const params = new URLSearchParams({ page: searchLogPage, per_page: 50, success: searchLogFilter });
+      const params = new URLSearchParams({ ...pagingParams(searchLogPaging, false), per_page: 50, success: searchLogFilter });
       const response = await fetch(`${API_URL}/admin/search-logs?${params}`, { credentials: 'include' });
       if (response.ok) {
         const data = await response.json();
         setSearchLogs(data.logs || []);
-        setSearchLogPages(data.pages || 1);
+        setSearchLogLinks(pageLinks(data, 50));
       }
     } catch (err) {
       console.error('Failed to fetch search logs');
@@ -287,6 +308,31 @@ useEffect(() => {
     }
   };
 
+  // Bulk uploads and PDF reports run as background jobs; poll until they finish or stall
+  const waitForJob = async (jobId, label) => {
+    let lastProgress = null;
+    let stalledPolls = 0;
+    while (true) {
+      const response = await fetch(`${API_URL}/admin/jobs/${jobId}`, { credentials: 'include' });
+      const job = await response.json();
+      if (!response.ok) throw new Error(job.error || 'Failed to check job status');
+      if (job.status === 'succeeded') return job;
+      if (job.status === 'failed') throw new Error(job.error || 'Job failed');
+      const progress = `${job.status}:${job.processed_rows}`;
+      stalledPolls = progress === lastProgress ? stalledPolls + 1 : 0;
+      lastProgress = progress;
+      if (stalledPolls >= JOB_STALL_POLLS) {
+        throw new Error(`${label} stopped making progress; check the job again later or retry`);
+      }
+      if (job.total_rows) {
+        let message = `${label}: ${job.processed_rows} of ${job.total_rows} rows processed`;
+        if (job.eta_seconds != null) message += ` (about ${Math.ceil(job.eta_seconds)}s left)`;
+        setSuccess(message);
+      }
+      await new Promise(resolve => setTimeout(resolve, 1000));
+    }
+  };
+
   const handleFileUpload = async (e) => {
     const file = e.target.files[0];
     if (!file) return;
@@ -297,8 +343,9 @@ useEffect(() => {
     formData.append('file', file);
     try {
       const response = await fetch(`${API_URL}/admin/members/bulk-upload`, { method: 'POST', body: formData, credentials: 'include' });
-      const data = await response.json();
+      const job = await response.json();
       if (response.ok) {
+        const data = (await waitForJob(job.job_id, 'Uploading')).result;
         let message = `Successfully added ${data.added} members`;
         if (data.skipped > 0) message += `, skipped ${data.skipped} records`;
         setSuccess(message);
@@ -306,10 +353,10 @@ useEffect(() => {
         fetchMembers();
         fetchStats();
       } else {
-        setError(data.error || 'Failed to upload file');
+        setError(job.error || 'Failed to upload file');
       }
     } catch (err) {
-      setError('Network error. Please try again.');
+      setError(err.message || 'Network error. Please try again.');
     } finally {
       setUploading(false);
       e.target.value = '';
@@ -380,14 +427,25 @@ useEffect(() => {
       setError('Failed to download PDF');
     }
   } catch (err) {
-    setError('Error downloading PDF');
+    setError(err.message || 'Error downloading PDF');
   }
   };
 
   const handleDownloadAllCorrectionsPDF = async () => {
   try {
     const params = new URLSearchParams({ status: correctionFilter });
-    const response = await fetch(`${API_URL}/admin/corrections/download-all-pdf?${params}`, {
+    const jobResponse = await fetch(`${API_URL}/admin/corrections/download-all-pdf?${params}`, {
+      credentials: 'include',
+    });
+    const job = await jobResponse.json();
+    if (!jobResponse.ok) {
+      setError(job.error || 'Failed to download PDF');
+      return;
+    }
+    
+    await waitForJob(job.job_id, 'Generating PDF');
+    setSuccess('');
+    const response = await fetch(`${API_URL}/admin/jobs/${job.job_id}/download`, {
       credentials: 'include',
     });
     
@@ -405,7 +463,7 @@ useEffect(() => {
       setError('Failed to download PDF');
     }
   } catch (err) {
-    setError('Error downloading PDF');
+    setError(err.message || 'Error downloading PDF');
   }
   };
 
@@ -432,7 +490,7 @@ useEffect(() => {
 
   const handleSearchChange = (e) => {
     setSearchFilter(e.target.value);
-    setCurrentPage(1);
+    setMemberPaging(FIRST_PAGE);
   };
 
   const handleBulkUpdateFileUpload = async (e) => {
@@ -453,9 +511,10 @@ useEffect(() => {
       credentials: 'include'
     });
     
-    const data = await response.json();
+    const job = await response.json();
     
     if (response.ok) {
+      const data = (await waitForJob(job.job_id, 'Updating')).result;
       let message = `Successfully updated ${data.updated} member(s)`;
       if (data.not_found > 0) {
         message += `, ${data.not_found} member(s) not found`;
@@ -473,10 +532,10 @@ useEffect(() => {
       fetchMembers();
       fetchStats();
     } else {
-      setError(data.error || 'Failed to update members');
+      setError(job.error || 'Failed to update members');
     }
   } catch (err) {
-    setError('Network error. Please try again.');
+    setError(err.message || 'Network error. Please try again.');
   } finally {
     setUploading(false);
     e.target.value = '';
@@ -504,10 +563,6 @@ useEffect(() => {
     window.URL.revokeObjectURL(url);
 };
 
-  const goToPage = (page) => {
-    if (page >= 1 && page <= totalPages) setCurrentPage(page);
-  };
-
   const StatusBadge = ({ status }) => {
     const colors = {
       active: 'bg-green-100 text-green-800',
@@ -709,7 +764,7 @@ useEffect(() => {
           <div className="bg-white rounded-lg shadow-md p-4 md:p-6">
             <div className="flex flex-col sm:flex-row justify-between items-start sm:items-center mb-6 gap-4">
               <h2 className="text-lg md:text-xl font-semibold">Search Activity Logs</h2>
-              <select value={searchLogFilter} onChange={(e) => setSearchLogFilter(e.target.value)} className="px-4 py-2 border rounded-md focus:ring-2 focus:ring-green-500">
+              <select value={searchLogFilter} onChange={(e) => { setSearchLogFilter(e.target.value); setSearchLogPaging(FIRST_PAGE); }} className="px-4 py-2 border rounded-md focus:ring-2 focus:ring-green-500">
                 <option value="all">All Searches</option>
                 <option value="successful">Successful Only</option>
                 <option value="failed">Failed Only</option>
@@ -752,10 +807,10 @@ useEffect(() => {
                 </div>
 
                 <div className="mt-6 flex flex-col sm:flex-row items-center justify-between gap-4">
-                  <div className="text-sm text-gray-600">Page {searchLogPage} of {searchLogPages}</div>
+                  <div className="text-sm text-gray-600">{pageLabel(searchLogPaging, searchLogLinks)}</div>
                   <div className="flex gap-2">
-                    <button onClick={() => setSearchLogPage(p => Math.max(1, p - 1))} disabled={searchLogPage === 1} className="px-3 py-1 text-sm border rounded hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed">Previous</button>
-                    <button onClick={() => setSearchLogPage(p => Math.min(searchLogPages, p + 1))} disabled={searchLogPage === searchLogPages} className="px-3 py-1 text-sm border rounded hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed">Next</button>
+                    <button onClick={() => setSearchLogPaging(prevPage(searchLogPaging, searchLogLinks))} disabled={!searchLogLinks.hasPrev} className="px-3 py-1 text-sm border rounded hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed">Previous</button>
+                    <button onClick={() => setSearchLogPaging(nextPage(searchLogPaging, searchLogLinks))} disabled={!searchLogLinks.hasNext} className="px-3 py-1 text-sm border rounded hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed">Next</button>
                   </div>
                 </div>
               </>
@@ -816,9 +871,9 @@ useEffect(() => {
                     <div className="mt-4">
                       <label className="cursor-pointer">
                         <span className="mt-2 block text-sm font-medium text-gray-900">{uploading ? 'Uploading...' : 'Click to upload Excel file'}</span>
-                        <input type="file" accept=".xlsx,.xls" onChange={handleFileUpload} disabled={uploading} className="hidden" />
+                        <input type="file" accept=".xlsx,.xls,.csv" onChange={handleFileUpload} disabled={uploading} className="hidden" />
                       </label>
-                      <p className="mt-1 text-xs text-gray-500">Excel files (.xlsx, .xls) only</p>
+                      <p className="mt-1 text-xs text-gray-500">Excel (.xlsx, .xls) or CSV files</p>
                     </div>
                   </div>
                   <div className="mt-6">
@@ -839,17 +894,17 @@ useEffect(() => {
                     <div className="mt-4">
                       <label className="cursor-pointer">
                         <span className="mt-2 block text-sm font-medium text-gray-900">
-                          {uploading ? 'Updating...' : 'Click to upload Excel file for bulk update'}
+                          {uploading ? 'Updating...' : 'Click to upload Excel or CSV file for bulk update'}
                         </span>
                         <input 
                           type="file" 
-                          accept=".xlsx,.xls" 
+                          accept=".xlsx,.xls,.csv" 
                           onChange={handleBulkUpdateFileUpload} 
                           disabled={uploading} 
                           className="hidden" 
                         />
                       </label>
-                      <p className="mt-1 text-xs text-gray-500">Excel files (.xlsx, .xls) only</p>
+                      <p className="mt-1 text-xs text-gray-500">Excel (.xlsx, .xls) or CSV files</p>
                     </div>
                   </div>
                   <div className="mt-6">
@@ -928,12 +983,11 @@ useEffect(() => {
                   </div>
 
                   <div className="mt-6 flex flex-col sm:flex-row items-center justify-between gap-4">
-                    <div className="text-sm text-gray-600">Page {currentPage} of {totalPages}</div>
+                    <div className="text-sm text-gray-600">{pageLabel(memberPaging, memberLinks)}</div>
                     <div className="flex gap-2 flex-wrap justify-center">
-                      <button onClick={() => goToPage(1)} disabled={currentPage === 1} className="px-3 py-1 text-sm border rounded hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed">First</button>
-                      <button onClick={() => goToPage(currentPage - 1)} disabled={currentPage === 1} className="px-3 py-1 text-sm border rounded hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed">Prev</button>
-                      <button onClick={() => goToPage(currentPage + 1)} disabled={currentPage === totalPages} className="px-3 py-1 text-sm border rounded hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed">Next</button>
-                      <button onClick={() => goToPage(totalPages)} disabled={currentPage === totalPages} className="px-3 py-1 text-sm border rounded hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed">Last</button>
+                      <button onClick={() => setMemberPaging(FIRST_PAGE)} disabled={memberPaging.page === 1} className="px-3 py-1 text-sm border rounded hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed">First</button>
+                      <button onClick={() => setMemberPaging(prevPage(memberPaging, memberLinks))} disabled={!memberLinks.hasPrev} className="px-3 py-1 text-sm border rounded hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed">Prev</button>
+                      <button onClick={() => setMemberPaging(nextPage(memberPaging, memberLinks))} disabled={!memberLinks.hasNext} className="px-3 py-1 text-sm border rounded hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed">Next</button>
                     </div>
                   </div>
                 </>
@@ -976,10 +1030,10 @@ useEffect(() => {
                 </div>
 
                 <div className="mt-6 flex flex-col sm:flex-row items-center justify-between gap-4">
-                  <div className="text-sm text-gray-600">Page {verificationPage} of {verificationPages}</div>
+                  <div className="text-sm text-gray-600">{pageLabel(verificationPaging, verificationLinks)}</div>
                   <div className="flex gap-2">
-                    <button onClick={() => setVerificationPage(p => Math.max(1, p - 1))} disabled={verificationPage === 1} className="px-3 py-1 text-sm border rounded hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed">Previous</button>
-                    <button onClick={() => setVerificationPage(p => Math.min(verificationPages, p + 1))} disabled={verificationPage === verificationPages} className="px-3 py-1 text-sm border rounded hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed">Next</button>
+                    <button onClick={() => setVerificationPaging(prevPage(verificationPaging, verificationLinks))} disabled={!verificationLinks.hasPrev} className="px-3 py-1 text-sm border rounded hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed">Previous</button>
+                    <button onClick={() => setVerificationPaging(nextPage(verificationPaging, verificationLinks))} disabled={!verificationLinks.hasNext} className="px-3 py-1 text-sm border rounded hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed">Next</button>
                   </div>
                 </div>
               </>
@@ -1003,7 +1057,7 @@ useEffect(() => {
                   value={correctionSearchFilter}
                   onChange={(e) => {
                     setCorrectionSearchFilter(e.target.value);
-                    setCorrectionPage(1);
+                    setCorrectionPaging(FIRST_PAGE);
                   }}
                   className="flex-1 sm:w-64 px-4 py-2 border border-gray-300 rounded-md focus:outline-none focus:ring-2 focus:ring-green-500 text-sm"
                 />
@@ -1013,7 +1067,7 @@ useEffect(() => {
                   value={correctionFilter} 
                   onChange={(e) => {
                     setCorrectionFilter(e.target.value);
-                    setCorrectionPage(1);
+                    setCorrectionPaging(FIRST_PAGE);
                   }}
                   className="px-4 py-2 border border-gray-300 rounded-md focus:outline-none focus:ring-2 focus:ring-green-500 text-sm"
                 >
@@ -1051,7 +1105,7 @@ useEffect(() => {
                 <button
                   onClick={() => {
                     setCorrectionSearchFilter('');
-                    setCorrectionPage(1);
+                    setCorrectionPaging(FIRST_PAGE);
                   }}
                   className="mt-2 text-sm text-blue-600 hover:text-blue-800 underline"
                 >
@@ -1123,10 +1177,10 @@ useEffect(() => {
                 </div>
 
                 <div className="mt-6 flex flex-col sm:flex-row items-center justify-between gap-4">
-                  <div className="text-sm text-gray-600">Page {correctionPage} of {correctionPages}</div>
+                  <div className="text-sm text-gray-600">{pageLabel(correctionPaging, correctionLinks)}</div>
                   <div className="flex gap-2">
-                    <button onClick={() => setCorrectionPage(p => Math.max(1, p - 1))} disabled={correctionPage === 1} className="px-3 py-1 text-sm border rounded hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed">Previous</button>
-                    <button onClick={() => setCorrectionPage(p => Math.min(correctionPages, p + 1))} disabled={correctionPage === correctionPages} className="px-3 py-1 text-sm border rounded hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed">Next</button>
+                    <button onClick={() => setCorrectionPaging(prevPage(correctionPaging, correctionLinks))} disabled={!correctionLinks.hasPrev} className="px-3 py-1 text-sm border rounded hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed">Previous</button>
+                    <button onClick={() => setCorrectionPaging(nextPage(correctionPaging, correctionLinks))} disabled={!correctionLinks.hasNext} className="px-3 py-1 text-sm border rounded hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed">Next</button>
                   </div>
                 </div>
               </>